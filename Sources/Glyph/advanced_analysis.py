@@ -230,6 +230,28 @@ def discover_uncommon_insights(
         if source_id in node_dict and target_id in node_dict:
             G.add_edge(source_id, target_id, weight=edge.get('weight', 1.0))
     
+    # Strongest links between different communities: close, but in separate clusters
+    communities = {
+        node_id: node.get('properties', {}).get('community')
+        for node_id, node in node_dict.items()
+    }
+    bridges = [
+        (u, v, data.get('weight', 1.0)) for u, v, data in G.edges(data=True)
+        if communities.get(u) not in (None, '-1') and communities.get(v) not in (None, '-1')
+        and communities[u] != communities[v]
+    ]
+    if bridges:
+        strongest = max(weight for _, _, weight in bridges)
+        for u, v, weight in sorted(bridges, key=lambda bridge: bridge[2], reverse=True)[:3]:
+            insights.append({
+                "concept_a": node_dict[u].get('label', 'Unknown'),
+                "concept_b": node_dict[v].get('label', 'Unknown'),
+                "relationship": "cross-cluster bridge",
+                "strength": max(0.5, weight / strongest),
+                "novelty": 0.85,
+                "explanation": f"These elements belong to different clusters of the {topic} knowledge graph (communities {communities[u]} and {communities[v]}) yet are directly linked, suggesting an association the clusters alone would not reveal."
+            })
+    
     # Find unexpected connections using shortest paths
     try:
         # Get nodes of different types
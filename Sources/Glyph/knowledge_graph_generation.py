@@ -21,21 +21,36 @@ import gzip
 import hashlib
 import tempfile
 import uuid
-from typing import List, Dict, Any, Optional, Tuple, Set, Callable
+import heapq
+import math
+import random
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing.spawn
+from multiprocessing import shared_memory
+from typing import List, Dict, Any, Optional, Tuple, Set, FrozenSet, Callable
 from datetime import datetime
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, deque
 import re
 
 # Core libraries
 import numpy as np
 try:
-    from scipy.sparse import csr_matrix, save_npz, load_npz
+    from scipy.sparse import csr_matrix, diags, save_npz, load_npz
+    from scipy.sparse.csgraph import connected_components, dijkstra, minimum_spanning_tree
+    from scipy.sparse.linalg import eigsh, ArpackNoConvergence
     SCIPY_AVAILABLE = True
 except ImportError:
     SCIPY_AVAILABLE = False
 
 import networkx as nx
 
+try:
+    import ahocorasick  # type: ignore
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # NLP libraries
 try:
     import nltk
@@ -43,6 +58,7 @@ try:
     from nltk.tokenize import word_tokenize, sent_tokenize
     from nltk.chunk import ne_chunk
     from nltk.tag import pos_tag
+    from nltk.stem import WordNetLemmatizer
     NLTK_AVAILABLE = True
     
     # Download required NLTK data (Python 3.13+ compatibility)
@@ -124,6 +140,12 @@ class TopicRelevanceConfig:
         require_verified_sources: Whether source references must match original source titles.
         enable_deduplication: Whether to deduplicate similar concepts in learning plans.
         deduplication_similarity_threshold: Threshold for fuzzy concept matching (0.0-1.0).
+        filter_before_graph_construction: Whether candidate labels are filtered right after extraction.
+        relevance_scorer: Scorer used to filter the built graph ('embedding', 'graph', 'blend' or 'auto').
+        ppr_alpha: Restart probability of the personalized PageRank topic scorer.
+        ppr_tolerance: Push tolerance of the personalized PageRank topic scorer.
+        ppr_blend_weight: Weight of the graph score when blending it with embedding similarity.
+        max_embedding_nodes: Node count above which 'auto' scoring skips embeddings.
     """
     
     def __init__(
@@ -136,7 +158,13 @@ class TopicRelevanceConfig:
         enable_source_connectivity_filtering: bool = True,
         require_verified_sources: bool = True,
         enable_deduplication: bool = True,
-        deduplication_similarity_threshold: float = 0.75
+        deduplication_similarity_threshold: float = 0.75,
+        filter_before_graph_construction: bool = False,
+        relevance_scorer: str = 'embedding',
+        ppr_alpha: float = 0.15,
+        ppr_tolerance: float = 1e-4,
+        ppr_blend_weight: float = 0.5,
+        max_embedding_nodes: int = 20000
     ) -> None:
         """Initialize topic relevance configuration.
         
@@ -150,6 +178,25 @@ class TopicRelevanceConfig:
             require_verified_sources: Require source references to match original sources.
             enable_deduplication: Whether to deduplicate similar concepts in learning plans.
             deduplication_similarity_threshold: Threshold for fuzzy concept matching (0.0-1.0).
+            filter_before_graph_construction: Score extracted concepts and entities against
+                the topic before co-occurrence counting, so labels below the threshold
+                never reach the expensive graph stages. Not gated by max_nodes_before_filtering.
+            relevance_scorer: How nodes of the built graph are scored against the topic.
+                'embedding' uses sentence-transformer cosine similarity. 'graph' seeds a
+                personalized PageRank from nodes whose labels share words with the topic
+                and scores every node by the mass it receives, with no model calls.
+                'blend' averages both using ppr_blend_weight. 'auto' uses 'graph' when
+                embeddings are unavailable or the graph exceeds max_embedding_nodes,
+                and 'embedding' otherwise. Candidate pre-filtering always uses embeddings,
+                since no graph exists yet at that point.
+            ppr_alpha: Restart probability of the personalized PageRank walk; higher
+                values keep relevance closer to the seed labels.
+            ppr_tolerance: Residual mass per unit of weighted degree below which the
+                local push stops. The work is bounded by about 1 / (ppr_alpha * ppr_tolerance)
+                edge visits regardless of graph size; smaller values reach further.
+            ppr_blend_weight: Weight (0.0-1.0) of the graph score in 'blend' mode.
+            max_embedding_nodes: In 'auto' mode, graphs with more nodes than this are
+                scored with the graph scorer only.
         """
         self.relevance_threshold = relevance_threshold
         self.enable_semantic_filtering = enable_semantic_filtering
@@ -160,234 +207,2796 @@ class TopicRelevanceConfig:
         self.require_verified_sources = require_verified_sources
         self.enable_deduplication = enable_deduplication
         self.deduplication_similarity_threshold = deduplication_similarity_threshold
+        self.filter_before_graph_construction = filter_before_graph_construction
+        self.relevance_scorer = relevance_scorer
+        self.ppr_alpha = ppr_alpha
+        self.ppr_tolerance = ppr_tolerance
+        self.ppr_blend_weight = ppr_blend_weight
+        self.max_embedding_nodes = max_embedding_nodes
 
 
-class KnowledgeGraphBuilder:
-    """Main class for building knowledge graphs from source collections."""
+class GraphBuildConfig:
+    """Configuration for the performance-sensitive stages of knowledge graph construction.
+    
+    This class groups the tuning knobs that control how the builder scales with
+    corpus size, without changing which graph is produced unless stated otherwise.
+    
+    Attributes:
+        cooccurrence_word_boundaries: Whether label matches must start and end on word boundaries.
+        cooccurrence_backend: Co-occurrence counting backend ('sparse' or 'dict').
+        cooccurrence_window: Co-occurrence scope ('document', 'sentence' or 'tokens').
+        cooccurrence_window_tokens: Width of the sliding token window in 'tokens' mode.
+        extraction_workers: Number of processes used for concept and entity extraction.
+        extraction_chunks_per_worker: Number of size-balanced chunks queued per worker.
+        ner_batch_size: Number of text windows sent to the transformer NER model per batch.
+        ner_window_tokens: Maximum number of model tokens per NER window.
+        ner_window_overlap: Number of tokens shared by consecutive NER windows.
+        enable_extraction_cache: Whether to reuse per-source extraction results across runs.
+        extraction_cache_max_mb: Size budget of the extraction cache in megabytes.
+        vectorized_fallback: Whether the non-NLTK fallback counts n-grams corpus-wide with sparse matrices.
+        streaming_topk: Whether concept and entity frequencies use bounded-memory Space-Saving counters.
+        streaming_topk_error: Maximum count overestimate as a fraction of total occurrences.
+        canonicalize_concepts: Whether concept variants are merged into canonical labels before counting.
+        centrality_backend: PageRank and eigenvector centrality backend ('sparse' or 'networkx').
+        betweenness_exact_max_nodes: Largest graph for which betweenness is computed exactly.
+        betweenness_error: Target additive error of sampled (normalized) betweenness scores.
+        betweenness_confidence: Probability with which every sampled score meets the error target.
+        closeness_exact_max_nodes: Largest graph for which closeness/harmonic centrality is computed exactly.
+        closeness_error: Target error of sampled closeness/harmonic scores, relative to the graph diameter.
+        centrality_workers: Number of processes used for centrality computation.
+        prune_core_k: Core order k of the k-core that centrality and the MST run on (0 disables pruning).
+        backbone_alpha: Significance level of the disparity-filter edge backbone (0 disables it).
+        minimal_subgraph_mode: How the minimal subgraph is built ('mst' or 'steiner').
+        steiner_terminals: Number of top-scoring nodes the 'steiner' minimal subgraph connects.
+        detect_communities: Whether every node is assigned a community by label propagation.
+        community_max_iterations: Maximum number of label propagation rounds.
+    """
     
     def __init__(
-        self, 
-        cache_dir: Optional[str] = None,
-        topic_config: Optional[TopicRelevanceConfig] = None
+        self,
+        cooccurrence_word_boundaries: bool = False,
+        cooccurrence_backend: str = 'sparse',
+        cooccurrence_window: str = 'document',
+        cooccurrence_window_tokens: int = 50,
+        extraction_workers: int = 1,
+        extraction_chunks_per_worker: int = 4,
+        ner_batch_size: int = 16,
+        ner_window_tokens: int = 256,
+        ner_window_overlap: int = 32,
+        enable_extraction_cache: bool = True,
+        extraction_cache_max_mb: float = 256.0,
+        vectorized_fallback: bool = True,
+        streaming_topk: bool = False,
+        streaming_topk_error: float = 0.0005,
+        canonicalize_concepts: bool = True,
+        centrality_backend: str = 'sparse',
+        betweenness_exact_max_nodes: int = 5000,
+        betweenness_error: float = 0.05,
+        betweenness_confidence: float = 0.9,
+        closeness_exact_max_nodes: int = 5000,
+        closeness_error: float = 0.1,
+        centrality_workers: int = 1,
+        prune_core_k: int = 0,
+        backbone_alpha: float = 0.0,
+        minimal_subgraph_mode: str = 'mst',
+        steiner_terminals: int = 50,
+        detect_communities: bool = True,
+        community_max_iterations: int = 100
     ) -> None:
-        """Initialize the knowledge graph builder.
+        """Initialize graph build configuration.
         
         Args:
-            cache_dir: Directory for caching models and intermediate results.
-            topic_config: Configuration for topic relevance filtering.
+            cooccurrence_word_boundaries: Only count a label as present in a source when
+                it is not embedded in a longer word. Defaults to False, which reproduces
+                the historical substring semantics and therefore identical edge weights.
+            cooccurrence_backend: 'sparse' derives edge weights from a scipy sparse
+                incidence matrix product; 'dict' uses nested dictionaries. Both produce
+                the same weights, and 'sparse' falls back to 'dict' without scipy.
+            cooccurrence_window: 'document' links every pair of labels found anywhere
+                in a source, which costs O(labels²) per source. 'sentence' only links
+                labels within the same sentence and 'tokens' only labels whose matches
+                start within cooccurrence_window_tokens tokens of each other, bounding
+                the cost to O(matches × window). In every mode an edge's weight is the
+                number of sources in which the pair co-occurs.
+            cooccurrence_window_tokens: Larger windows approach document-level counting.
+            extraction_workers: Values above 1 fan sources out to a process pool of
+                that size. Results are merged in source order, so output is identical
+                to the single-process path. Runs in a single process when Python is
+                embedded and ``sys.executable`` is not a Python interpreter.
+            extraction_chunks_per_worker: More chunks per worker improves load balance
+                at the cost of more inter-process traffic.
+            ner_batch_size: Larger batches improve throughput at the cost of memory.
+            ner_window_tokens: Documents are split into windows of at most this many
+                tokens so that entities anywhere in a document are found. Must stay
+                below the model's maximum sequence length.
+            ner_window_overlap: Overlap keeps entities that straddle a window
+                boundary intact in at least one window.
+            enable_extraction_cache: Cache each source's concepts and entities under
+                the builder's cache directory, keyed by a hash of the source content
+                and the extractor configuration, so unchanged sources skip NLP.
+            extraction_cache_max_mb: Least recently used entries are evicted once
+                the cache grows past this size.
+            vectorized_fallback: When NLTK is unavailable, tokenize the corpus once
+                and count 1-3-grams with sparse matrices instead of building every
+                phrase string per source. Requires scipy.
+            streaming_topk: Keep only a bounded set of candidate concepts and
+                entities (with their source references) instead of every item
+                ever seen. Intended for very large corpora; counts become
+                estimates within streaming_topk_error.
+            streaming_topk_error: Smaller values use more counters; the counter
+                table never holds fewer than twice the retained top-k items.
+            canonicalize_concepts: Lemmatize the head word of each concept phrase
+                so that e.g. "neural networks" and "neural network" become one
+                node. Merged variants are listed in the node's aliases.
+            centrality_backend: 'sparse' runs PageRank and eigenvector centrality as
+                vectorized power iterations on the CSR adjacency, falling back to an
+                ARPACK eigensolver when eigenvector iteration does not converge.
+                'networkx' uses the networkx implementations. Scores agree to within
+                the convergence tolerance; 'sparse' falls back to 'networkx' without scipy.
+            betweenness_exact_max_nodes: Exact betweenness costs O(V·E). Above this
+                many nodes it is estimated from shortest paths out of k sampled pivot
+                sources and rescaled by n/k.
+            betweenness_error: Smaller errors need more pivots; k grows with 1/error².
+            betweenness_confidence: Higher confidence needs more pivots; k grows
+                with log(1 / (1 - confidence)).
+            closeness_exact_max_nodes: Exact closeness and harmonic centrality run a
+                shortest-path search from every node. Above this many nodes they are
+                estimated from multi-source Dijkstra runs out of k sampled sources
+                over the CSR adjacency. Requires scipy.
+            closeness_error: Sampling uses k = ln(n) / error² sources, which keeps
+                the estimate within error × diameter with high probability.
+            centrality_workers: Values above 1 place the CSR adjacency in shared
+                memory and run PageRank/eigenvector, and chunks of betweenness and
+                closeness sources, as separate tasks on a process pool of that size.
+                Partial results are reduced in the parent; scores match the
+                single-process path up to floating-point summation order. Requires
+                scipy, and runs in a single process under embedded Python as above.
+            prune_core_k: When positive, nodes outside the k-core (e.g. isolated
+                nodes and leaves for k=2) skip the centrality algorithms and the
+                MST. They stay in the output, flagged as pruned, with scores
+                derived from their core neighbours in one cheap pass.
+            backbone_alpha: When positive, every edge is tested against the disparity
+                filter's null model of uniformly random weight shares at both of its
+                endpoints, and only edges significant at this level for at least one
+                endpoint are kept. Unlike a global weight threshold this preserves
+                strong local links of weakly connected nodes while thinning out the
+                near-complete neighbourhoods of hub terms. Runs before pruning,
+                centrality and the MST; nodes are kept even if they lose every edge.
+                Typical values are 0.01-0.1; smaller values keep fewer edges.
+            minimal_subgraph_mode: 'mst' spans every core node with a minimum spanning
+                forest, so the minimal subgraph grows with the graph. 'steiner' only
+                connects the steiner_terminals nodes with the highest combined
+                centrality, through an approximate Steiner tree (the metric-closure
+                MST built from one multi-source Dijkstra, within twice the optimal
+                cost), so its size is bounded by the terminal count and their path
+                lengths. Requires scipy; falls back to 'mst' without it.
+            steiner_terminals: Node budget of the 'steiner' mode; the subgraph holds
+                these nodes plus the intermediate nodes needed to connect them.
+            detect_communities: Runs weighted label propagation on the full graph,
+                including pruned nodes, and exports each node's cluster as its
+                'community' property. Each round is one sort over the adjacency
+                entries, so it stays near-linear in the number of edges.
+            community_max_iterations: Later rounds only revisit nodes whose
+                neighbors just moved, so they are cheap; the cap bounds the cost
+                on graphs where labels never fully settle.
+                
+        Raises:
+            ValueError: If betweenness_error is not positive or
+                betweenness_confidence is not strictly between 0 and 1.
         """
-        if cache_dir is None:
-            # Debug environment variable detection
-            app_bundle_mode = os.getenv('APP_BUNDLE_MODE')
-            print(f"🔍 Environment check: APP_BUNDLE_MODE = {app_bundle_mode}")
-            
-            # Use appropriate cache directory for macOS app bundles
-            if app_bundle_mode == '1':
-                # Running in app bundle - use user cache directory
-                home_dir = os.path.expanduser("~")
-                self.cache_dir = os.path.join(home_dir, "Library", "Caches", "com.glyph.knowledge-graph-explorer")
-                print(f"📁 App bundle mode detected - using cache directory: {self.cache_dir}")
+        if not betweenness_error > 0:
+            raise ValueError(f"betweenness_error must be positive, got {betweenness_error}")
+        if not 0 < betweenness_confidence < 1:
+            raise ValueError(f"betweenness_confidence must be between 0 and 1, got {betweenness_confidence}")
+        
+        self.cooccurrence_word_boundaries = cooccurrence_word_boundaries
+        self.cooccurrence_backend = cooccurrence_backend
+        self.cooccurrence_window = cooccurrence_window
+        self.cooccurrence_window_tokens = cooccurrence_window_tokens
+        self.extraction_workers = extraction_workers
+        self.extraction_chunks_per_worker = extraction_chunks_per_worker
+        self.ner_batch_size = ner_batch_size
+        self.ner_window_tokens = ner_window_tokens
+        self.ner_window_overlap = ner_window_overlap
+        self.enable_extraction_cache = enable_extraction_cache
+        self.extraction_cache_max_mb = extraction_cache_max_mb
+        self.vectorized_fallback = vectorized_fallback
+        self.streaming_topk = streaming_topk
+        self.streaming_topk_error = streaming_topk_error
+        self.canonicalize_concepts = canonicalize_concepts
+        self.centrality_backend = centrality_backend
+        self.betweenness_exact_max_nodes = betweenness_exact_max_nodes
+        self.betweenness_error = betweenness_error
+        self.betweenness_confidence = betweenness_confidence
+        self.closeness_exact_max_nodes = closeness_exact_max_nodes
+        self.closeness_error = closeness_error
+        self.centrality_workers = centrality_workers
+        self.prune_core_k = prune_core_k
+        self.backbone_alpha = backbone_alpha
+        self.minimal_subgraph_mode = minimal_subgraph_mode
+        self.steiner_terminals = steiner_terminals
+        self.detect_communities = detect_communities
+        self.community_max_iterations = community_max_iterations
+
+
+class LabelMatcher:
+    """Multi-pattern label scanner based on the Aho-Corasick automaton.
+    
+    All node labels are compiled into a single automaton so that every label
+    occurring in a document is found in one linear pass over the text, instead
+    of one substring search per label. Overlapping matches are reported, so the
+    result is identical to testing ``label in text`` for each label (or for any
+    of its extra spellings).
+    
+    Uses the C ``pyahocorasick`` extension when installed and a pure-Python
+    automaton otherwise.
+    
+    Example:
+        >>> matcher = LabelMatcher(["neural network", "network"])
+        >>> sorted(matcher.find_labels("a neural network model"))
+        [0, 1]
+    """
+    
+    def __init__(
+        self,
+        labels: List[str],
+        word_boundaries: bool = False,
+        spellings: Optional[Dict[int, List[str]]] = None
+    ) -> None:
+        """Compile labels into the automaton.
+        
+        Args:
+            labels: Patterns to search for. Matching is case-sensitive, so callers
+                should pass lowercased labels when scanning lowercased text.
+            word_boundaries: Reject matches that are preceded or followed by a word character.
+            spellings: Optional extra patterns per label index (e.g. the surface
+                variants merged into a canonical concept); a match of any of
+                them reports that label.
+        """
+        self.word_boundaries = word_boundaries
+        self.label_count = len(labels)
+        
+        # Identical patterns (e.g. a concept and an entity sharing a label) map to several indices
+        self._pattern_indices: Dict[str, List[int]] = defaultdict(list)
+        self._always_present: List[int] = []
+        for index, label in enumerate(labels):
+            if label:
+                self._pattern_indices[label].append(index)
             else:
-                # Development mode - use local cache
-                self.cache_dir = "./graph_cache"
-                print(f"📁 Development mode - using cache directory: {self.cache_dir}")
+                # The empty string is a substring of every document
+                self._always_present.append(index)
+        for index, extra in (spellings or {}).items():
+            for pattern in extra:
+                if pattern and index not in self._pattern_indices[pattern]:
+                    self._pattern_indices[pattern].append(index)
+        
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self._pattern_indices:
+            self._automaton = ahocorasick.Automaton()
+            for pattern, indices in self._pattern_indices.items():
+                self._automaton.add_word(pattern, (len(pattern), indices))
+            self._automaton.make_automaton()
         else:
-            self.cache_dir = cache_dir
-            print(f"📁 Custom cache directory: {self.cache_dir}")
-            
-        # Create cache directory with proper error handling
-        try:
-            os.makedirs(self.cache_dir, exist_ok=True)
-            print(f"✅ Cache directory ready: {self.cache_dir}")
-        except OSError as e:
-            print(f"⚠️ Failed to create cache directory {self.cache_dir}: {e}")
-            # Fallback to temp directory with clear reason
-            self.cache_dir = tempfile.mkdtemp(prefix="glyph_cache_")
-            print(f"🔄 FALLBACK: Using temporary cache directory due to permissions issue: {self.cache_dir}")
-            print(f"   Reason: Could not create/access intended cache directory")
-        
-        # Status file for Swift communication
-        self.status_file = os.path.join(self.cache_dir, "kg_status.json")
-        self.run_id = str(uuid.uuid4())[:8]  # Short run ID for this session
-        
-        # Initialize NLP components
-        self.sentence_transformer = None
-        self.ner_pipeline = None
-        self.stopwords_set = set()
-        
-        # Graph storage
-        self.graph = nx.DiGraph()
-        self.node_embeddings = {}
-        self.edge_weights = {}
+            self._build_automaton()
+    
+    def _build_automaton(self) -> None:
+        """Build the pure-Python goto/fail/output tables."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._outputs: List[List[Tuple[int, List[int]]]] = [[]]
+        
+        for pattern, indices in self._pattern_indices.items():
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append((len(pattern), indices))
+        
+        # Breadth-first pass computes failure links and merges suffix outputs
+        self._fail: List[int] = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+    
+    def _iter_matches(self, text: str):
+        """Yield ``(end_index, pattern_length, label_indices)`` for every match in text."""
+        if self._automaton is not None:
+            for end, (length, indices) in self._automaton.iter(text):
+                yield end, length, indices
+            return
         
-        # Analysis results
-        self.centrality_scores = {}
-        self.minimal_subgraph = None
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                for length, indices in outputs[state]:
+                    yield position, length, indices
+    
+    def find_labels(self, text: str) -> Set[int]:
+        """Find which labels occur in text.
         
-        # Progress tracking
-        self.progress_callback = None
-        self.current_progress = 0.0
+        Args:
+            text: Document text to scan.
+            
+        Returns:
+            Set of indices (into the labels passed at construction) of labels found in text.
+        """
+        found: Set[int] = set(self._always_present)
+        if not self._pattern_indices:
+            return found
         
-        # Topic relevance configuration
-        self.topic_config = topic_config or TopicRelevanceConfig()
+        for end, length, indices in self._iter_matches(text):
+            # Several spellings can report the same label, so skip patterns that add nothing
+            if found.issuperset(indices):
+                continue
+            if self.word_boundaries and not self._on_word_boundaries(text, end, length):
+                continue
+            found.update(indices)
+            if len(found) == self.label_count:
+                # Every label has been seen; the rest of the document cannot add anything
+                break
         
-        self._initialize_nlp_components()
+        return found
     
-    def _initialize_nlp_components(self):
-        """Initialize NLP components with fallbacks."""
-        print("🧠 Initializing NLP components...")
+    def find_label_positions(self, text: str) -> List[Tuple[int, int]]:
+        """Find every occurrence of every label in text.
         
-        # Initialize sentence transformer for embeddings
-        if SENTENCE_TRANSFORMERS_AVAILABLE:
-            try:
-                model_path = os.path.join(self.cache_dir, "sentence_transformer")
-                if os.path.exists(model_path):
-                    self.sentence_transformer = SentenceTransformer(model_path)
-                else:
-                    # Use a lightweight model for fast initialization
-                    self.sentence_transformer = SentenceTransformer('all-MiniLM-L6-v2')
-                    self.sentence_transformer.save(model_path)
-                print("✅ Sentence transformer loaded")
-            except Exception as e:
-                print(f"⚠️ Sentence transformer failed: {e}")
+        Empty labels have no position and are not reported.
         
-        # Initialize NER pipeline
-        if TRANSFORMERS_AVAILABLE:
-            try:
-                # Use a simpler approach for NER pipeline initialization
-                self.ner_pipeline = pipeline("ner", aggregation_strategy="simple")  # type: ignore
-                print("✅ NER pipeline loaded")
-            except Exception as e:
-                print(f"⚠️ NER pipeline failed: {e}")
+        Args:
+            text: Document text to scan.
+            
+        Returns:
+            List of ``(start_offset, label_index)`` pairs ordered by match end.
+        """
+        positions: List[Tuple[int, int]] = []
+        if not self._pattern_indices:
+            return positions
         
-        # Initialize stopwords
-        if NLTK_AVAILABLE:
-            try:
-                self.stopwords_set = set(stopwords.words('english'))
-                print("✅ Stopwords loaded")
-            except:
-                pass
+        for end, length, indices in self._iter_matches(text):
+            if self.word_boundaries and not self._on_word_boundaries(text, end, length):
+                continue
+            start = end - length + 1
+            positions.extend((start, index) for index in indices)
         
-        # Fallback stopwords
-        if not self.stopwords_set:
-            self.stopwords_set = {
-                'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-                'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-                'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-                'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'
-            }
+        return positions
     
-    def set_progress_callback(self, callback):
-        """Set callback function for progress updates."""
-        self.progress_callback = callback
+    def _on_word_boundaries(self, text: str, end: int, length: int) -> bool:
+        """Return True if the match ending at ``end`` is not embedded in a longer word."""
+        start = end - length + 1
+        if start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if end + 1 < len(text) and _is_word_char(text[end + 1]):
+            return False
+        return True
+
+
+def _is_word_char(char: str) -> bool:
+    """Return True if char would be matched by the regex ``\\w`` class."""
+    return char.isalnum() or char == '_'
+
+
+# Bump whenever extraction code changes what is produced for a given source
+EXTRACTION_CACHE_VERSION = "3"
+
+
+class ExtractionCache:
+    """Persistent, content-addressed cache of per-source extraction results.
     
-    def _update_progress(self, progress: float, message: str = ""):
-        """Update progress and call callback if set."""
-        self.current_progress = progress
-        if self.progress_callback:
-            self.progress_callback(progress, message)
-        if message:
-            print(f"📊 {progress:.1%}: {message}")
-        
-        # Write status checkpoint for Swift to read
-        self._write_status_checkpoint(progress, message)
+    Entries map a hash of a source's content, title and extractor signature to
+    the concepts and entities extracted from it, so re-runs over overlapping
+    source collections only run NLP on new or changed documents. Entries live
+    in a SQLite database under the builder's cache directory and are evicted
+    least recently used first once the payload exceeds the size budget.
     
-    def _write_status_checkpoint(self, progress: float, message: str, error: Optional[str] = None):
-        """Write status checkpoint to file for Swift communication."""
-        try:
-            status = {
-                "run_id": self.run_id,
-                "timestamp": datetime.now().isoformat(),
-                "progress": progress,
-                "message": message,
-                "current_step": message.split(":")[1].strip() if ":" in message else message,
-                "completed": progress >= 1.0,
-                "error": error,
-                "nodes_count": self.graph.number_of_nodes() if hasattr(self, 'graph') else 0,
-                "edges_count": self.graph.number_of_edges() if hasattr(self, 'graph') else 0
-            }
-            
-            with open(self.status_file, 'w') as f:
-                json.dump(status, f)
-            
-            # Debug: Confirm file was written
-            if progress in [0.0, 0.3, 0.7, 1.0]:  # Log key milestones
-                print(f"📝 Status written to {self.status_file}: {progress:.1%} - {message}")
-                
-        except Exception as e:
-            # Don't let status writing break the main process
-            print(f"⚠️ Failed to write status checkpoint to {self.status_file}: {e}")
-            print(f"   Cache dir exists: {os.path.exists(self.cache_dir)}")
-            print(f"   Cache dir writable: {os.access(self.cache_dir, os.W_OK) if os.path.exists(self.cache_dir) else 'N/A'}")
+    The cache never raises: any storage error disables it for the rest of the
+    session and extraction proceeds uncached.
     
-    def _clear_status_file(self):
-        """Clear status file at start of process."""
+    Attributes:
+        path: Location of the SQLite database.
+        max_bytes: Size budget for stored payloads.
+        hits: Number of lookups served from the cache.
+        misses: Number of lookups that required extraction.
+        evictions: Number of entries evicted to stay within budget.
+    """
+    
+    def __init__(self, path: str, max_bytes: int) -> None:
+        """Open (or create) the cache database.
+        
+        Args:
+            path: Location of the SQLite database file.
+            max_bytes: Size budget for stored payloads.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        
         try:
-            if os.path.exists(self.status_file):
-                os.remove(self.status_file)
-        except Exception as e:
-            print(f"⚠️ Failed to clear status file: {e}")
+            self._connection = sqlite3.connect(path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                "key TEXT PRIMARY KEY, payload BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS extractions_last_access ON extractions (last_access)"
+            )
+            self._connection.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Extraction cache unavailable at {path}: {e}")
+            self._connection = None
     
-    @traceable(name="build_knowledge_graph")
-    def build_graph_from_sources(
-        self, 
-        sources: List[Dict[str, Any]], 
-        topic: str = ""
-    ) -> Dict[str, Any]:
-        """Build knowledge graph from collected sources with topic relevance filtering.
+    @staticmethod
+    def make_key(content: str, title: str, signature: str) -> str:
+        """Compute the content address of a source for a given extractor signature.
         
         Args:
-            sources: List of source documents to process.
-            topic: Main topic/subject for relevance filtering.
+            content: Source body text.
+            title: Source title.
+            signature: Extractor signature (code version, models and options).
             
         Returns:
-            Dictionary containing the generated knowledge graph data.
+            Hex SHA-256 digest.
         """
-        print(f"🏗️ Building knowledge graph from {len(sources)} sources...")
-        if topic.strip():
-            print(f"🎯 Topic focus: '{topic}' (filtering enabled)")
-        else:
-            print("🎯 No specific topic focus (filtering disabled)")
+        digest = hashlib.sha256()
+        for part in (signature, title, content):
+            digest.update(part.encode('utf-8', 'surrogatepass'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[List[str], List[str]]]:
+        """Look up extraction results and mark found entries as recently used.
         
-        # Clear status file from any previous runs
-        self._clear_status_file()
+        Args:
+            keys: Cache keys, one per source (duplicates allowed).
+            
+        Returns:
+            Mapping from found keys to their ``(concepts, entities)``.
+        """
+        found: Dict[str, Tuple[List[str], List[str]]] = {}
+        if self._connection is None:
+            self.misses += len(keys)
+            return found
         
-        self._update_progress(0.0, "Starting knowledge graph construction")
+        unique_keys = list(dict.fromkeys(keys))
+        try:
+            for offset in range(0, len(unique_keys), 500):
+                batch = unique_keys[offset:offset + 500]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT key, payload FROM extractions WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, payload in rows:
+                    concepts, entities = json.loads(gzip.decompress(payload))
+                    found[key] = (concepts, entities)
+            
+            now = datetime.now().timestamp()
+            self._connection.executemany(
+                "UPDATE extractions SET last_access = ? WHERE key = ?",
+                [(now, key) for key in found]
+            )
+            self._connection.commit()
+        except (sqlite3.Error, OSError, ValueError) as e:
+            print(f"⚠️ Extraction cache read failed - disabling cache: {e}")
+            self._connection = None
+            found = {}
+        
+        hit_count = sum(1 for key in keys if key in found)
+        self.hits += hit_count
+        self.misses += len(keys) - hit_count
+        return found
+    
+    def put_many(self, entries: Dict[str, Tuple[List[str], List[str]]]) -> None:
+        """Store extraction results and evict old entries if over budget.
         
-        # Clear previous data
-        self.graph.clear()
-        self.node_embeddings.clear()
-        self.edge_weights.clear()
-        self.centrality_scores.clear()
+        Args:
+            entries: Mapping from cache key to ``(concepts, entities)``.
+        """
+        if self._connection is None or not entries:
+            return
+        
+        now = datetime.now().timestamp()
+        rows = []
+        for key, (concepts, entities) in entries.items():
+            payload = gzip.compress(json.dumps([concepts, entities]).encode('utf-8'))
+            rows.append((key, payload, len(payload), now))
         
         try:
-            # Step 1: Extract concepts and entities (25%)
-            self._update_progress(0.1, "Extracting concepts and entities")
-            concepts, entities = self._extract_concepts_and_entities(sources)
-            
-            # Step 2: Build initial graph (40%)
-            self._update_progress(0.25, "Building initial graph structure")
-            self._build_graph_structure(concepts, entities, sources)
-            
-            # Step 3: Filter by topic relevance (50%) - NEW STEP
-            if topic.strip():
-                self._update_progress(0.4, "Filtering nodes by topic relevance")
-                self._filter_nodes_by_topic_relevance(topic, sources)
-            
-            # Step 4: Calculate centrality metrics (65%)
-            self._update_progress(0.5, "Calculating centrality metrics")
-            self._calculate_centrality_metrics()
-            
-            # Step 5: Find minimal subgraph (80%)
-            self._update_progress(0.65, "Finding minimal subgraph")
-            self._find_minimal_subgraph()
-            
-            # Step 6: Generate embeddings (90%)
-            self._update_progress(0.8, "Generating node embeddings")
-            self._generate_node_embeddings()
-            
-            # Step 7: Finalize results (100%)
-            self._update_progress(0.9, "Finalizing results")
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO extractions (key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._connection.commit()
+            self._evict()
+        except sqlite3.Error as e:
+            print(f"⚠️ Extraction cache write failed - disabling cache: {e}")
+            self._connection = None
+    
+    def _evict(self) -> None:
+        """Delete least recently used entries until the payload fits the budget."""
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        excess = total - self.max_bytes
+        evicted_keys = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM extractions ORDER BY last_access ASC"
+        ):
+            evicted_keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        
+        self._connection.executemany("DELETE FROM extractions WHERE key = ?", evicted_keys)
+        self._connection.commit()
+        self.evictions += len(evicted_keys)
+        print(f"🧹 Evicted {len(evicted_keys)} extraction cache entries to stay within budget")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for reporting in graph metadata."""
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self._connection is not None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions
+        }
+
+
+class SpaceSavingCounter:
+    """Bounded-memory top-k frequency counter using the Space-Saving algorithm.
+    
+    At most ``capacity`` items are monitored. When a new item arrives and the
+    table is full, the item with the smallest count is replaced and the new
+    item inherits that count plus one. Every reported count overestimates the
+    true count by at most ``total / capacity``, and any item whose true count
+    exceeds that bound is guaranteed to be monitored.
+    
+    Source references are only kept for monitored items, capped per item.
+    
+    Attributes:
+        capacity: Maximum number of monitored items.
+        total: Number of occurrences added.
+        references: Source references of each monitored item.
+    """
+    
+    def __init__(self, capacity: int, max_references: int = 5) -> None:
+        """Create an empty counter.
+        
+        Args:
+            capacity: Maximum number of monitored items.
+            max_references: Maximum number of distinct references kept per item.
+        """
+        self.capacity = max(1, capacity)
+        self.max_references = max_references
+        self.total = 0
+        self.references: Dict[str, List[Dict[str, str]]] = {}
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._first_seen: Dict[str, int] = {}
+        self._sequence = 0
+        # Min-heap of (count, first_seen, item); entries go stale when counts change
+        self._heap: List[Tuple[int, int, str]] = []
+    
+    def add(self, item: str, reference: Optional[Dict[str, str]] = None) -> None:
+        """Count one occurrence of item.
+        
+        Args:
+            item: Concept or entity label.
+            reference: Source reference to record if the item is monitored.
+        """
+        self.total += 1
+        if item in self._counts:
+            self._counts[item] += 1
+            heapq.heappush(self._heap, (self._counts[item], self._first_seen[item], item))
+        else:
+            inherited = 0
+            if len(self._counts) >= self.capacity:
+                inherited = self._evict_minimum()
+            self._sequence += 1
+            self._counts[item] = inherited + 1
+            self._errors[item] = inherited
+            self._first_seen[item] = self._sequence
+            self.references[item] = []
+            heapq.heappush(self._heap, (self._counts[item], self._sequence, item))
+        
+        if reference is not None:
+            item_references = self.references[item]
+            if len(item_references) < self.max_references and reference not in item_references:
+                item_references.append(reference)
+        
+        # Stale heap entries accumulate on increments; rebuild before they dominate memory
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, self._first_seen[key], key) for key, count in self._counts.items()]
+            heapq.heapify(self._heap)
+    
+    def _evict_minimum(self) -> int:
+        """Remove the monitored item with the smallest count and return that count."""
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            if self._counts.get(item) == count:
+                del self._counts[item]
+                del self._errors[item]
+                del self._first_seen[item]
+                del self.references[item]
+                return count
+    
+    def most_common(self, limit: int) -> List[Tuple[str, int]]:
+        """Return up to limit ``(item, estimated_count)`` pairs, highest first, by item on ties."""
+        ranked = sorted(self._counts, key=lambda key: (-self._counts[key], key))
+        return [(key, self._counts[key]) for key in ranked[:limit]]
+    
+    def error_bound(self) -> float:
+        """Return the guaranteed maximum overestimate of any reported count."""
+        return self.total / self.capacity
+    
+    def max_observed_error(self) -> int:
+        """Return the largest count inherited by a currently monitored item."""
+        return max(self._errors.values(), default=0)
+
+
+class ConceptCanonicalizer:
+    """Memoized normalization of concept phrases to canonical labels.
+    
+    Variants such as "neural network" and "neural networks" are mapped to one
+    canonical label before counting, so the graph is built over canonical
+    concepts instead of merging duplicates after every expensive stage. The
+    head (last) word of a phrase is lemmatized with WordNet when its data is
+    installed and with conservative plural rules otherwise. Surface forms are
+    recorded in an alias table for display.
+    
+    Example:
+        >>> canonicalizer = ConceptCanonicalizer()
+        >>> canonicalizer.canonicalize("Neural  Networks")
+        'neural network'
+    """
+    
+    # Plurals the suffix rules would get wrong
+    IRREGULAR_PLURALS = {
+        'analyses': 'analysis', 'bases': 'basis', 'children': 'child', 'criteria': 'criterion',
+        'diagnoses': 'diagnosis', 'hypotheses': 'hypothesis', 'indices': 'index',
+        'matrices': 'matrix', 'men': 'man', 'mice': 'mouse', 'people': 'person',
+        'phenomena': 'phenomenon', 'theses': 'thesis', 'vertices': 'vertex', 'women': 'woman'
+    }
+    
+    # Words ending in "s" that are already singular
+    INVARIANT_WORDS = {
+        'data', 'news', 'series', 'species', 'means', 'physics', 'mathematics', 'economics',
+        'statistics', 'ethics', 'linguistics', 'genetics', 'robotics', 'analytics', 'politics'
+    }
+    
+    def __init__(self, max_cache_size: int = 100000) -> None:
+        """Create a canonicalizer with empty caches.
+        
+        Args:
+            max_cache_size: Memoized phrases kept before the cache is reset.
+        """
+        self.max_cache_size = max_cache_size
+        self.alias_counts: Dict[str, Counter] = defaultdict(Counter)
+        self._phrase_cache: Dict[str, str] = {}
+        self._word_cache: Dict[str, str] = {}
+        self._wordnet = None
+        if NLTK_AVAILABLE:
+            try:
+                lemmatizer = WordNetLemmatizer()
+                lemmatizer.lemmatize('tests')
+                self._wordnet = lemmatizer
+            except LookupError:
+                self._wordnet = None
+    
+    def lemmatize_word(self, word: str) -> str:
+        """Return the singular noun form of a lowercased word.
+        
+        Args:
+            word: Lowercased word.
+            
+        Returns:
+            Lemma of the word.
+        """
+        lemma = self._word_cache.get(word)
+        if lemma is not None:
+            return lemma
+        
+        if word in self.IRREGULAR_PLURALS:
+            lemma = self.IRREGULAR_PLURALS[word]
+        elif self._wordnet is not None:
+            lemma = self._wordnet.lemmatize(word, 'n')
+        elif len(word) <= 3 or word in self.INVARIANT_WORDS or word.endswith(('ss', 'us', 'is', 'ics')):
+            lemma = word
+        elif word.endswith('ies') and len(word) > 4:
+            lemma = word[:-3] + 'y'
+        elif word.endswith(('sses', 'ches', 'shes', 'xes', 'zzes')):
+            lemma = word[:-2]
+        elif word.endswith('s'):
+            lemma = word[:-1]
+        else:
+            lemma = word
+        
+        self._word_cache[word] = lemma
+        return lemma
+    
+    def canonicalize(self, phrase: str) -> str:
+        """Map a concept phrase to its canonical label.
+        
+        Args:
+            phrase: Concept phrase as extracted.
+            
+        Returns:
+            Lowercased, whitespace-normalized phrase with a lemmatized head word.
+        """
+        canonical = self._phrase_cache.get(phrase)
+        if canonical is not None:
+            return canonical
+        
+        words = phrase.lower().split()
+        if words:
+            words[-1] = self.lemmatize_word(words[-1])
+        canonical = ' '.join(words)
+        
+        if len(self._phrase_cache) >= self.max_cache_size:
+            self._phrase_cache.clear()
+        self._phrase_cache[phrase] = canonical
+        return canonical
+    
+    def canonicalize_all(self, phrases: List[str]) -> List[str]:
+        """Canonicalize one source's phrases, recording aliases.
+        
+        Args:
+            phrases: Distinct concept phrases from one source.
+            
+        Returns:
+            Distinct canonical labels, in first-seen order.
+        """
+        canonical_phrases = {}
+        for phrase in phrases:
+            canonical = self.canonicalize(phrase)
+            canonical_phrases.setdefault(canonical, None)
+            if canonical != phrase:
+                self.alias_counts[canonical][phrase] += 1
+        return list(canonical_phrases)
+    
+    def record_alias(self, canonical: str, surface: str, count: int) -> None:
+        """Add count occurrences of surface to the alias table of canonical."""
+        if canonical != surface:
+            self.alias_counts[canonical][surface] += count
+    
+    def surface_forms(self, phrases: List[str]) -> List[str]:
+        """Return the phrases that ``canonicalize_all`` records as aliases."""
+        return [phrase for phrase in phrases if self.canonicalize(phrase) != phrase]
+    
+    def forget_aliases(self, surfaces: List[str]) -> None:
+        """Subtract one source's recorded surface forms from the alias table.
+        
+        Args:
+            surfaces: The source's ``surface_forms``.
+        """
+        for surface in surfaces:
+            canonical = self.canonicalize(surface)
+            counts = self.alias_counts.get(canonical)
+            if counts is None or surface not in counts:
+                continue
+            counts[surface] -= 1
+            if counts[surface] <= 0:
+                del counts[surface]
+                if not counts:
+                    del self.alias_counts[canonical]
+    
+    def aliases(self, canonical: str, limit: int = 5) -> List[str]:
+        """Return the most frequent surface forms that were merged into canonical."""
+        if canonical not in self.alias_counts:
+            return []
+        return [surface for surface, _ in self.alias_counts[canonical].most_common(limit)]
+    
+    def spellings(self, canonical: str) -> List[str]:
+        """Return every recorded surface form of canonical, lowercased, for text matching."""
+        counts = self.alias_counts.get(canonical)
+        if not counts:
+            return []
+        return sorted({surface.lower() for surface in counts} - {canonical.lower()})
+
+
+# MARK: - Source Extraction Helpers
+#
+# Module-level so they can run inside ProcessPoolExecutor workers.
+
+def _source_reference(index: int, source: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Build the ``(title, url, type)`` reference recorded for a source's concepts.
+    
+    Args:
+        index: Position of the source in the input list, used for untitled sources.
+        source: Source document.
+        
+    Returns:
+        Tuple of display title, URL and source type.
+    """
+    title = source.get('title', '')
+    return (title if title else f"Source {index+1}", source.get('url', ''), source.get('source_type', 'web'))
+
+
+class DocumentAnalysis:
+    """Tokens and part-of-speech tags for one document, computed once and shared.
+    
+    POS tagging is the most expensive NLTK step, and both the concept and the
+    entity extractor need it. This object tags the case-preserving text once,
+    when a view is first used, and serves two views of the result: the
+    original tokens for NE chunking, and a lowercased, punctuation-free view
+    for noun-phrase concept extraction.
+    
+    Deriving the concept view from case-preserving tags differs from tagging
+    the lowercased text on its own: contractions follow the tokenizer
+    (``don't`` becomes ``do``/``n``/``t`` rather than ``don``/``t``), and
+    capitalized words keep the proper-noun tags the tagger gives them.
+    
+    Attributes:
+        text: The analyzed text.
+    """
+    
+    def __init__(self, text: str) -> None:
+        """Wrap text for analysis; no NLTK work happens until a view is used.
+        
+        Args:
+            text: Raw document text.
+        """
+        self.text = text
+        self._tagged_tokens: Optional[List[Tuple[str, str]]] = None
+        self._lowercase_tagged_tokens: Optional[List[Tuple[str, str]]] = None
+    
+    @property
+    def tagged_tokens(self) -> List[Tuple[str, str]]:
+        """Case-preserving ``(token, pos)`` pairs for NE chunking."""
+        if self._tagged_tokens is None:
+            self._tagged_tokens = pos_tag(word_tokenize(self.text)) if self.text.strip() else []
+        return self._tagged_tokens
+    
+    @property
+    def lowercase_tagged_tokens(self) -> List[Tuple[str, str]]:
+        """Lowercased ``(token, pos)`` pairs with punctuation removed.
+        
+        Mirrors the cleaning the concept extractor applies to raw text, where
+        every non-word character becomes whitespace: punctuation-only tokens
+        are dropped, and tokens such as ``state-of-the-art`` are split into
+        parts that keep the tag of the original token.
+        """
+        if self._lowercase_tagged_tokens is None:
+            view = []
+            for token, pos in self.tagged_tokens:
+                for part in re.split(r'[^\w]+', token.lower()):
+                    if part:
+                        view.append((part, pos))
+            self._lowercase_tagged_tokens = view
+        return self._lowercase_tagged_tokens
+
+
+def _concepts_from_tagged_tokens(tagged_tokens: List[Tuple[str, str]], stopwords_set: Set[str]) -> List[str]:
+    """Collect runs of up to three nouns as concept phrases.
+    
+    Args:
+        tagged_tokens: Lowercased ``(token, pos)`` pairs.
+        stopwords_set: Words that can never be part of a concept.
+        
+    Returns:
+        Deduplicated list of concept phrases.
+    """
+    concepts = []
+    
+    # Extract nouns and noun phrases as concepts
+    current_phrase = []
+    for word, pos in tagged_tokens:
+        if pos.startswith('NN') and word not in stopwords_set and len(word) > 2:
+            current_phrase.append(word)
+        else:
+            if current_phrase:
+                phrase = ' '.join(current_phrase)
+                if len(phrase.split()) <= 3:  # Limit phrase length
+                    concepts.append(phrase)
+                current_phrase = []
+    
+    # Add final phrase if exists
+    if current_phrase:
+        phrase = ' '.join(current_phrase)
+        if len(phrase.split()) <= 3:
+            concepts.append(phrase)
+    
+    return sorted(set(concepts))  # Remove duplicates, independent of the hash seed
+
+
+def _entities_from_analysis(analysis: DocumentAnalysis) -> List[str]:
+    """Extract named entities by NE-chunking the case-preserving view of a document.
+    
+    Args:
+        analysis: Analysis of the raw document text.
+        
+    Returns:
+        Deduplicated list of entity strings.
+    """
+    entities = []
+    
+    try:
+        chunks = ne_chunk(analysis.tagged_tokens)
+        
+        for chunk in chunks:
+            if hasattr(chunk, 'label') and callable(getattr(chunk, 'label', None)):  # type: ignore
+                entity = ' '.join([token for token, pos in chunk])
+                entities.append(entity)
+    except Exception as e:
+        print(f"⚠️ NLTK NER failed: {e}")
+    
+    return sorted(set(entities))  # Remove duplicates, independent of the hash seed
+
+
+def _most_common(counts: Any, limit: int) -> List[Tuple[str, int]]:
+    """Return the limit most frequent ``(item, count)`` pairs of an exact or streaming counter.
+    
+    Ties are broken by item, so the selection does not depend on the order in
+    which sources were processed or items were merged.
+    """
+    if isinstance(counts, SpaceSavingCounter):
+        return counts.most_common(limit)
+    return heapq.nsmallest(limit, counts.items(), key=lambda entry: (-entry[1], entry[0]))
+
+
+def _record_occurrences(
+    items: List[str],
+    reference: Dict[str, str],
+    counts: Any,
+    references: Dict[str, List[Dict[str, str]]]
+) -> None:
+    """Count one source's concepts or entities in an exact or streaming counter.
+    
+    Args:
+        items: Distinct concepts or entities found in the source.
+        reference: Reference to the source.
+        counts: A ``Counter`` or a ``SpaceSavingCounter``.
+        references: Per-item reference lists (owned by the counter in streaming mode).
+    """
+    if isinstance(counts, SpaceSavingCounter):
+        for item in items:
+            counts.add(item, reference)
+        return
+    
+    for item in items:
+        counts[item] += 1
+        references[item].append(reference)
+
+
+def _extract_text_concepts(
+    text: str,
+    stopwords_set: Set[str],
+    analyses: Optional[List[DocumentAnalysis]] = None
+) -> List[str]:
+    """Extract key concepts (short noun phrases) from text using NLP.
+    
+    Args:
+        text: Raw text to analyze.
+        stopwords_set: Words that can never be part of a concept.
+        analyses: Analyses of consecutive parts of text, reused instead of
+            tagging text again; defaults to a new analysis of the whole text.
+        
+    Returns:
+        Deduplicated list of lowercased concept phrases.
+    """
+    if not text.strip():
+        return []
+    
+    if NLTK_AVAILABLE:
+        try:
+            # Use NLTK for better tokenization and POS tagging
+            if analyses is None:
+                analyses = [DocumentAnalysis(text)]
+            tagged_tokens = [pair for analysis in analyses for pair in analysis.lowercase_tagged_tokens]
+            return _concepts_from_tagged_tokens(tagged_tokens, stopwords_set)
+        except Exception as e:
+            print(f"⚠️ NLTK processing failed: {e}")
+    
+    # Fallback to simple extraction on cleaned text
+    cleaned_text = re.sub(r'[^\w\s]', ' ', text.lower())
+    return sorted(set(_simple_concept_extraction(cleaned_text, stopwords_set)))  # Remove duplicates
+
+
+def _simple_concept_extraction(text: str, stopwords_set: Set[str]) -> List[str]:
+    """Simple concept extraction fallback producing all 1-3 word non-stopword phrases.
+    
+    Args:
+        text: Cleaned, lowercased text.
+        stopwords_set: Words that can never be part of a concept.
+        
+    Returns:
+        List of candidate phrases (may contain duplicates).
+    """
+    words = text.split()
+    concepts = []
+    
+    # Extract 1-3 word phrases that aren't stopwords
+    for i in range(len(words)):
+        for phrase_len in [1, 2, 3]:
+            if i + phrase_len <= len(words):
+                phrase_words = words[i:i + phrase_len]
+                if all(word not in stopwords_set and len(word) > 2 for word in phrase_words):
+                    concepts.append(' '.join(phrase_words))
+    
+    return concepts
+
+
+class NGramMembership:
+    """Sparse source × n-gram membership produced by corpus-level fallback extraction.
+    
+    N-grams are stored as rows of word IDs into a shared vocabulary, so label
+    strings are only built for the n-grams that are actually kept.
+    
+    Attributes:
+        matrix: Binary CSR matrix, one row per source and one column per n-gram.
+        grams: Array of shape (n_grams, 3) of vocabulary IDs, padded with -1.
+        vocabulary: Words indexed by vocabulary ID.
+        document_frequency: Number of sources containing each n-gram.
+    """
+    
+    def __init__(
+        self,
+        matrix: Any,
+        grams: np.ndarray,
+        vocabulary: List[str]
+    ) -> None:
+        """Wrap the membership matrix and n-gram table.
+        
+        Args:
+            matrix: Binary CSR matrix of shape (n_sources, n_grams).
+            grams: Vocabulary IDs of each n-gram, padded with -1.
+            vocabulary: Words indexed by vocabulary ID.
+        """
+        self.matrix = matrix
+        self.grams = grams
+        self.vocabulary = vocabulary
+        self.document_frequency = np.asarray(matrix.sum(axis=0)).ravel()
+    
+    def label(self, column: int) -> str:
+        """Build the phrase string for an n-gram column."""
+        return ' '.join(self.vocabulary[word_id] for word_id in self.grams[column] if word_id >= 0)
+    
+    def row_labels(self) -> List[List[str]]:
+        """Return the phrases of every source row, building all label strings once."""
+        labels = [self.label(column) for column in range(len(self.grams))]
+        indptr, indices = self.matrix.indptr, self.matrix.indices
+        return [
+            [labels[column] for column in indices[indptr[row]:indptr[row + 1]].tolist()]
+            for row in range(self.matrix.shape[0])
+        ]
+
+    def top_columns(self, limit: int) -> np.ndarray:
+        """Return up to limit columns ordered by source count, then by label.
+        
+        Labels are compared through the sort rank of their words, without
+        building strings: words contain no character that sorts below the
+        joining space, so word-by-word order equals the order of the joined
+        labels, with shorter prefixes first.
+        """
+        word_ranks = np.empty(len(self.vocabulary), dtype=np.int64)
+        word_ranks[sorted(range(len(self.vocabulary)), key=self.vocabulary.__getitem__)] = np.arange(len(self.vocabulary))
+        gram_ranks = np.where(self.grams >= 0, word_ranks[self.grams], -1)
+        keys = [gram_ranks[:, position] for position in reversed(range(gram_ranks.shape[1]))]
+        order = np.lexsort(keys + [-self.document_frequency])
+        return order[:limit]
+    
+    def canonicalized(self, canonicalizer: 'ConceptCanonicalizer') -> Tuple['NGramMembership', np.ndarray]:
+        """Merge n-gram columns that share a canonical label.
+        
+        Lemmatizes only the head word of each n-gram, at the vocabulary level,
+        so no per-occurrence strings are built. Merged columns are the union of
+        their sources.
+        
+        Args:
+            canonicalizer: Canonicalizer providing head-word lemmas.
+            
+        Returns:
+            Tuple of the canonical membership and, for each original column,
+            the index of the canonical column it was merged into.
+        """
+        if len(self.grams) == 0:
+            return self, np.zeros(0, dtype=np.int64)
+        
+        vocabulary = list(self.vocabulary)
+        vocabulary_index = {word: word_id for word_id, word in enumerate(vocabulary)}
+        head_positions = (self.grams >= 0).sum(axis=1) - 1
+        rows = np.arange(len(self.grams))
+        heads = self.grams[rows, head_positions]
+        
+        lemma_ids = {}
+        for word_id in np.unique(heads).tolist():
+            lemma = canonicalizer.lemmatize_word(vocabulary[word_id])
+            lemma_ids[word_id] = vocabulary_index.setdefault(lemma, len(vocabulary_index))
+            if lemma_ids[word_id] == len(vocabulary):
+                vocabulary.append(lemma)
+        
+        canonical_grams = self.grams.copy()
+        canonical_grams[rows, head_positions] = np.fromiter(
+            (lemma_ids[word_id] for word_id in heads.tolist()), dtype=np.int64, count=len(heads)
+        )
+        grams, merged_into = np.unique(canonical_grams, axis=0, return_inverse=True)
+        merged_into = merged_into.ravel()
+        
+        merge = csr_matrix(
+            (np.ones(len(merged_into), dtype=np.int32), (rows, merged_into)),
+            shape=(len(self.grams), len(grams))
+        )
+        matrix = (self.matrix @ merge).tocsr()
+        matrix.data[:] = 1
+        return NGramMembership(matrix, grams, vocabulary), merged_into
+
+
+def _vectorized_ngram_membership(texts: List[str], stopwords_set: Set[str], max_n: int = 3) -> NGramMembership:
+    """Count 1..max_n-grams of non-stopword words across a corpus with array operations.
+    
+    Applies the same rules as ``_simple_concept_extraction``: text is lowercased
+    with punctuation turned into whitespace, and an n-gram qualifies only if
+    every word is longer than two characters and not a stopword. The corpus is
+    tokenized once into integer word IDs; candidate n-grams are then found,
+    deduplicated per source and counted with NumPy and scipy.sparse.
+    
+    Args:
+        texts: One text per source.
+        stopwords_set: Words that can never be part of a concept.
+        max_n: Longest n-gram length.
+        
+    Returns:
+        NGramMembership for the corpus.
+    """
+    # Tokenize the corpus once into integer word IDs
+    vocabulary_index: Dict[str, int] = {}
+    token_ids: List[int] = []
+    lengths = np.zeros(len(texts), dtype=np.int64)
+    for doc_index, text in enumerate(texts):
+        words = re.sub(r'[^\w\s]', ' ', text.lower()).split()
+        lengths[doc_index] = len(words)
+        token_ids.extend(vocabulary_index.setdefault(word, len(vocabulary_index)) for word in words)
+    vocabulary = list(vocabulary_index)
+    
+    word_ids = np.asarray(token_ids, dtype=np.int64)
+    doc_ids = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+    valid_words = np.fromiter(
+        (word not in stopwords_set and len(word) > 2 for word in vocabulary),
+        dtype=bool,
+        count=len(vocabulary)
+    )
+    token_valid = valid_words[word_ids] if len(word_ids) else np.zeros(0, dtype=bool)
+    
+    # Collect every qualifying n-gram occurrence as (doc, w1, w2, w3) with -1 padding
+    gram_blocks = []
+    doc_blocks = []
+    token_count = len(word_ids)
+    for n in range(1, max_n + 1):
+        if token_count < n:
+            break
+        starts = np.arange(token_count - n + 1)
+        qualifies = doc_ids[starts] == doc_ids[starts + n - 1]
+        for offset in range(n):
+            qualifies &= token_valid[starts + offset]
+        starts = starts[qualifies]
+        block = np.full((len(starts), max_n), -1, dtype=np.int64)
+        for offset in range(n):
+            block[:, offset] = word_ids[starts + offset]
+        gram_blocks.append(block)
+        doc_blocks.append(doc_ids[starts])
+    
+    if not gram_blocks or sum(len(block) for block in gram_blocks) == 0:
+        empty = csr_matrix((len(texts), 0), dtype=np.int32)
+        return NGramMembership(empty, np.zeros((0, max_n), dtype=np.int64), vocabulary)
+    
+    occurrences = np.concatenate(gram_blocks)
+    occurrence_docs = np.concatenate(doc_blocks)
+    grams, gram_columns = np.unique(occurrences, axis=0, return_inverse=True)
+    gram_columns = gram_columns.ravel()
+    
+    # Binary membership: duplicate (doc, gram) entries collapse to a single 1
+    matrix = csr_matrix(
+        (np.ones(len(gram_columns), dtype=np.int32), (occurrence_docs, gram_columns)),
+        shape=(len(texts), len(grams))
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    
+    return NGramMembership(matrix, grams, vocabulary)
+
+
+def _extract_nltk_entities(text: str) -> List[str]:
+    """Extract named entities with the NLTK chunker.
+    
+    Args:
+        text: Raw, case-preserving text.
+        
+    Returns:
+        Deduplicated list of entity strings.
+    """
+    return _entities_from_analysis(DocumentAnalysis(text))
+
+
+def _extract_source_features(
+    content: str,
+    title: str,
+    stopwords_set: Set[str],
+    extract_entities: bool
+) -> Tuple[List[str], List[str]]:
+    """Extract concepts (from content and title) and entities (from content) for one source.
+    
+    With NLTK available, the content is tokenized and tagged exactly once and the
+    same analysis feeds both the concept and the entity extractor.
+    
+    Args:
+        content: Source body text.
+        title: Source title.
+        stopwords_set: Words that can never be part of a concept.
+        extract_entities: Whether to run NLTK NE chunking.
+        
+    Returns:
+        Tuple of (concepts, entities) for the source.
+    """
+    content_analysis = DocumentAnalysis(content)
+    concepts = _extract_text_concepts(
+        content + ' ' + title, stopwords_set, [content_analysis, DocumentAnalysis(title)]
+    )
+    
+    entities = []
+    if extract_entities and NLTK_AVAILABLE and content.strip():
+        entities = _entities_from_analysis(content_analysis)
+    
+    return concepts, entities
+
+
+def _token_windows(
+    text: str,
+    tokenizer: Any,
+    window_tokens: int,
+    overlap_tokens: int
+) -> List[str]:
+    """Split text into overlapping windows of at most window_tokens model tokens.
+    
+    Window boundaries are moved back to the nearest whitespace so words are not
+    cut in half. Without a fast tokenizer providing offsets, whitespace-separated
+    words are used as an approximation of tokens.
+    
+    Args:
+        text: Document text.
+        tokenizer: Hugging Face tokenizer of the NER model, or None.
+        window_tokens: Maximum number of tokens per window.
+        overlap_tokens: Number of tokens shared by consecutive windows.
+        
+    Returns:
+        List of window texts covering the whole document.
+    """
+    offsets: List[Tuple[int, int]] = []
+    if tokenizer is not None:
+        try:
+            encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+            offsets = [tuple(offset) for offset in encoding['offset_mapping']]
+        except Exception:
+            offsets = []
+    if not offsets:
+        # Words are typically split into more than one subword token
+        offsets = [match.span() for match in re.finditer(r'\S+', text)]
+        window_tokens = max(1, int(window_tokens * 0.75))
+        overlap_tokens = int(overlap_tokens * 0.75)
+    
+    if len(offsets) <= window_tokens:
+        return [text]
+    
+    def continues_word(token_index: int) -> bool:
+        return offsets[token_index][0] == offsets[token_index - 1][1]
+    
+    windows = []
+    start = 0
+    while True:
+        end = min(start + window_tokens, len(offsets))
+        if end < len(offsets):
+            # Back off so the window ends on a word boundary
+            boundary = end
+            while boundary > start + 1 and continues_word(boundary):
+                boundary -= 1
+            if boundary > start + 1:
+                end = boundary
+        windows.append(text[offsets[start][0]:offsets[end - 1][1]])
+        if end >= len(offsets):
+            break
+        
+        # Start the next window overlap_tokens back, also on a word boundary
+        next_start = max(start + 1, end - overlap_tokens)
+        candidate = next_start
+        while candidate > start + 1 and continues_word(candidate):
+            candidate -= 1
+        if continues_word(candidate):
+            # No boundary inside the overlap; skip forward to the next word instead
+            candidate = next_start
+            while candidate < end and continues_word(candidate):
+                candidate += 1
+        start = candidate
+    
+    return windows
+
+
+def _extract_source_chunk(
+    chunk: List[Tuple[int, str, str, Tuple[str, str, str]]],
+    stopwords_set: Set[str],
+    extract_entities: bool
+) -> List[Tuple[int, List[str], List[str], Tuple[str, str, str]]]:
+    """Process-pool worker that extracts concepts and entities for a chunk of sources.
+    
+    Args:
+        chunk: ``(source_index, content, title, source_reference)`` tuples.
+        stopwords_set: Words that can never be part of a concept.
+        extract_entities: Whether to run NLTK NER in the worker.
+        
+    Returns:
+        ``(source_index, concepts, entities, source_reference)`` tuples for the chunk.
+    """
+    results = []
+    for index, content, title, reference in chunk:
+        text_concepts, text_entities = _extract_source_features(content, title, stopwords_set, extract_entities)
+        results.append((index, text_concepts, text_entities, reference))
+    return results
+
+
+def _require_worker_processes() -> None:
+    """Raise RuntimeError if this interpreter cannot start process pool workers.
+    
+    Workers are started by running the multiprocessing executable, which
+    defaults to ``sys.executable``. When Python is embedded in a host
+    application (the Swift app loads it through PythonKit) that is the host
+    binary, or empty, unless PYTHONEXECUTABLE or ``multiprocessing.set_executable``
+    names a Python interpreter, and a pool would launch copies of the host.
+    Callers fall back to their single-process path.
+    """
+    executable = os.fsdecode(multiprocessing.spawn.get_executable() or '')
+    if not os.path.basename(executable).lower().startswith(('python', 'pypy')):
+        raise RuntimeError(f"'{executable}' is not a Python interpreter")
+
+
+def _size_balanced_chunks(sizes: List[int], chunk_count: int) -> List[List[int]]:
+    """Pack item indices into chunks of roughly equal total size.
+    
+    Uses longest-processing-time-first greedy packing: items are visited from
+    largest to smallest and each goes to the currently lightest chunk. Chunks
+    are returned heaviest first so the pool schedules the slowest work early.
+    
+    Args:
+        sizes: Cost estimate for each item (e.g. character count).
+        chunk_count: Maximum number of chunks to produce.
+        
+    Returns:
+        List of non-empty chunks, each a list of item indices.
+    """
+    chunk_count = max(1, min(chunk_count, len(sizes)))
+    heap = [(0, chunk_index) for chunk_index in range(chunk_count)]
+    chunks: List[List[int]] = [[] for _ in range(chunk_count)]
+    loads = [0] * chunk_count
+    
+    for index in sorted(range(len(sizes)), key=lambda i: sizes[i], reverse=True):
+        load, chunk_index = heapq.heappop(heap)
+        chunks[chunk_index].append(index)
+        loads[chunk_index] = load + sizes[index]
+        heapq.heappush(heap, (loads[chunk_index], chunk_index))
+    
+    order = sorted(range(chunk_count), key=lambda c: loads[c], reverse=True)
+    return [chunks[c] for c in order if chunks[c]]
+
+
+# MARK: - Graph Storage
+
+class NodeTable:
+    """Interned node table with dense integer IDs and columnar attributes.
+    
+    Each distinct ``(type, label)`` pair is interned to a dense ID (0, 1, 2, ...)
+    that the graph and all analysis stages use. Numeric attributes live in
+    NumPy columns indexed by that ID instead of a per-node attribute dict.
+    String node IDs for Swift are only derived in ``string_id`` at the output
+    boundary, from a stable 64-bit hash of the label.
+    
+    Attributes:
+        labels: Node labels indexed by node ID.
+        types: Node type codes (index into ``NODE_TYPES``).
+        frequency: Number of sources mentioning each node.
+        importance: Frequency-based importance in [0, 1].
+        topic_relevance: Topic relevance score, 0.0 until scored.
+        source_references: Up to five source references per node.
+        aliases: Surface variants merged into each node's label.
+    """
+    
+    NODE_TYPES = ('concept', 'entity')
+    
+    def __init__(self) -> None:
+        """Create an empty table."""
+        self.labels: List[str] = []
+        self.types = np.zeros(0, dtype=np.int8)
+        self.frequency = np.zeros(0, dtype=np.int32)
+        self.importance = np.zeros(0, dtype=np.float64)
+        self.topic_relevance = np.zeros(0, dtype=np.float64)
+        self.source_references: List[List[str]] = []
+        self.aliases: List[List[str]] = []
+        self._index: Dict[Tuple[int, str], int] = {}
+    
+    def __len__(self) -> int:
+        """Return the number of interned nodes."""
+        return len(self.labels)
+    
+    def add_nodes(self, nodes: List[Dict[str, Any]]) -> np.ndarray:
+        """Intern extracted nodes and store their attributes.
+        
+        A node whose type and label are already interned keeps its ID and has
+        its attributes overwritten by the later dictionary.
+        
+        Args:
+            nodes: Node dictionaries with ``label``, ``type``, ``frequency``,
+                ``importance`` and optional ``source_references`` and ``aliases``.
+                
+        Returns:
+            int32 array with the ID of each input node.
+        """
+        start = len(self.labels)
+        ids = np.empty(len(nodes), dtype=np.int32)
+        updates = []
+        for position, node in enumerate(nodes):
+            key = (self.NODE_TYPES.index(node['type']), node['label'])
+            node_id = self._index.get(key)
+            if node_id is None:
+                node_id = len(self.labels)
+                self._index[key] = node_id
+                self.labels.append(node['label'])
+                self.source_references.append([])
+                self.aliases.append([])
+            ids[position] = node_id
+            updates.append((node_id, key[0], node))
+        
+        added = len(self.labels) - start
+        self.types = np.concatenate([self.types, np.zeros(added, dtype=np.int8)])
+        self.frequency = np.concatenate([self.frequency, np.zeros(added, dtype=np.int32)])
+        self.importance = np.concatenate([self.importance, np.zeros(added, dtype=np.float64)])
+        self.topic_relevance = np.concatenate([self.topic_relevance, np.zeros(added, dtype=np.float64)])
+        
+        for node_id, type_code, node in updates:
+            self.types[node_id] = type_code
+            self.frequency[node_id] = node['frequency']
+            self.importance[node_id] = node['importance']
+            self.source_references[node_id] = node.get('source_references', [])
+            self.aliases[node_id] = node.get('aliases', [])
+        
+        return ids
+    
+    def lookup(self, label: str, node_type: str) -> Optional[int]:
+        """Return the ID of an interned node, or None."""
+        return self._index.get((self.NODE_TYPES.index(node_type), label))
+    
+    def node_type(self, node_id: int) -> str:
+        """Return the type name of a node."""
+        return self.NODE_TYPES[self.types[node_id]]
+    
+    def string_id(self, node_id: int) -> str:
+        """Return the external string ID of a node.
+        
+        Uses a 64-bit BLAKE2b digest of the label, which is stable across runs
+        and far less collision-prone than a 32-bit hash prefix.
+        """
+        digest = hashlib.blake2b(self.labels[node_id].encode('utf-8'), digest_size=8).hexdigest()
+        return f"{self.node_type(node_id)}_{digest}"
+
+
+class GraphStore:
+    """Undirected weighted graph over NodeTable IDs, stored as symmetric CSR arrays.
+    
+    Co-occurrence is symmetric, so every relationship is held once as a
+    weighted adjacency entry per endpoint in flat ``indptr``/``indices``/``weights``
+    arrays rather than as two mirrored networkx edge dicts. Rows and columns are
+    positions into ``node_ids``; neighbor lists are sorted by position.
+    Algorithms that still need networkx get a view from ``to_networkx``.
+    
+    Derived views (networkx graph, SciPy matrix, degree arrays, component
+    labels) are memoized and dropped whenever the arrays are replaced, so every
+    analysis stage shares one copy. They are read-only: cached arrays are not
+    writeable and the networkx view is frozen.
+    
+    Attributes:
+        node_ids: NodeTable IDs of the graph's nodes, in insertion order.
+        indptr: CSR row pointer, length ``number_of_nodes() + 1``.
+        indices: Neighbor positions for each row.
+        weights: Edge weight for each adjacency entry.
+    """
+    
+    def __init__(
+        self,
+        node_ids: Optional[List[int]] = None,
+        rows: Optional[List[int]] = None,
+        cols: Optional[List[int]] = None,
+        weights: Optional[List[float]] = None
+    ) -> None:
+        """Build the store from node IDs and positional adjacency entries.
+        
+        Args:
+            node_ids: NodeTable IDs; their order defines node positions.
+            rows: Source position of each adjacency entry.
+            cols: Target position of each adjacency entry.
+            weights: Weight of each adjacency entry. Entries must already be
+                symmetric, i.e. contain both ``(i, j)`` and ``(j, i)``.
+        """
+        self.node_ids = np.asarray(node_ids if node_ids is not None else [], dtype=np.int32)
+        self._positions = {node_id: position for position, node_id in enumerate(self.node_ids.tolist())}
+        
+        rows = np.asarray(rows if rows is not None else [], dtype=np.int64)
+        cols = np.asarray(cols if cols is not None else [], dtype=np.int32)
+        weights = np.asarray(weights if weights is not None else [])
+        order = np.lexsort((cols, rows))
+        self._set_entries(rows[order], cols[order], weights[order])
+    
+    def _set_entries(self, rows: np.ndarray, cols: np.ndarray, weights: np.ndarray) -> None:
+        """Store row-sorted adjacency entries as CSR arrays."""
+        counts = np.bincount(rows, minlength=len(self.node_ids)) if len(rows) else np.zeros(len(self.node_ids), dtype=np.int64)
+        self.indptr = np.zeros(len(self.node_ids) + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(counts)
+        self.indices = cols.astype(np.int32, copy=False)
+        self.weights = weights
+        self._views: Dict[str, Any] = {}
+    
+    def _view(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Return the memoized derived view ``name``, building it on first use."""
+        if name not in self._views:
+            view = factory()
+            if isinstance(view, np.ndarray):
+                view.setflags(write=False)
+            self._views[name] = view
+        return self._views[name]
+    
+    def number_of_nodes(self) -> int:
+        """Return the number of nodes."""
+        return len(self.node_ids)
+    
+    def number_of_edges(self) -> int:
+        """Return the number of undirected edges."""
+        return len(self.indices) // 2
+    
+    def nodes(self) -> List[int]:
+        """Return node IDs in insertion order."""
+        return self.node_ids.tolist()
+    
+    def __contains__(self, node_id: int) -> bool:
+        """Return whether a node ID is in the graph."""
+        return node_id in self._positions
+    
+    def positions(self, node_ids: List[int]) -> np.ndarray:
+        """Return the position of each node ID, or -1 for IDs not in the graph."""
+        return np.fromiter(
+            (self._positions.get(node_id, -1) for node_id in node_ids), dtype=np.int64, count=len(node_ids)
+        )
+    
+    def has_edge(self, u: int, v: int) -> bool:
+        """Return whether nodes ``u`` and ``v`` are adjacent."""
+        if u not in self._positions or v not in self._positions:
+            return False
+        row = self._positions[u]
+        neighbors = self.indices[self.indptr[row]:self.indptr[row + 1]]
+        index = np.searchsorted(neighbors, self._positions[v])
+        return bool(index < len(neighbors) and neighbors[index] == self._positions[v])
+    
+    def _entry_rows(self) -> np.ndarray:
+        """Return the row position of every adjacency entry."""
+        return self._view(
+            'entry_rows', lambda: np.repeat(np.arange(len(self.node_ids), dtype=np.int64), np.diff(self.indptr))
+        )
+    
+    def entry_weights(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Return the weights of existing edges given by the positions of their endpoints."""
+        # Entries are sorted by (row, col), so their keys can be binary searched
+        node_count = len(self.node_ids)
+        entry_keys = self._entry_rows() * node_count + self.indices
+        return self.weights[np.searchsorted(entry_keys, np.asarray(rows, dtype=np.int64) * node_count + cols)]
+    
+    def edges(self) -> List[Tuple[int, int, Any]]:
+        """Return each undirected edge once as ``(u, v, weight)`` node IDs."""
+        rows = self._entry_rows()
+        upper = rows < self.indices
+        return list(zip(
+            self.node_ids[rows[upper]].tolist(),
+            self.node_ids[self.indices[upper]].tolist(),
+            self.weights[upper].tolist()
+        ))
+    
+    def directed_edges(self) -> List[Tuple[int, int, Any]]:
+        """Return every edge in both directions as ``(u, v, weight)`` node IDs."""
+        return list(zip(
+            self.node_ids[self._entry_rows()].tolist(),
+            self.node_ids[self.indices].tolist(),
+            self.weights.tolist()
+        ))
+    
+    def remove_nodes(self, node_ids: List[int]) -> None:
+        """Remove nodes and their incident edges, compacting the arrays."""
+        keep = np.ones(len(self.node_ids), dtype=bool)
+        for node_id in node_ids:
+            position = self._positions.get(node_id)
+            if position is not None:
+                keep[position] = False
+        if keep.all():
+            return
+        
+        node_ids, rows, cols, weights = self._compact(keep)
+        self.node_ids = node_ids
+        self._positions = {node_id: position for position, node_id in enumerate(self.node_ids.tolist())}
+        self._set_entries(rows, cols, weights)
+    
+    def subgraph(self, keep: np.ndarray) -> 'GraphStore':
+        """Return a new store induced by the node positions where ``keep`` is True."""
+        return GraphStore(*self._compact(keep))
+    
+    def _compact(self, keep: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return node IDs and row-sorted adjacency entries restricted to kept positions."""
+        rows = self._entry_rows()
+        kept_entries = keep[rows] & keep[self.indices]
+        new_positions = np.cumsum(keep) - 1
+        return (
+            self.node_ids[keep],
+            new_positions[rows[kept_entries]],
+            new_positions[self.indices[kept_entries]],
+            self.weights[kept_entries]
+        )
+    
+    def degrees(self) -> np.ndarray:
+        """Return the number of neighbors of each node position."""
+        return self._view('degrees', lambda: np.diff(self.indptr))
+    
+    def weighted_degrees(self) -> np.ndarray:
+        """Return the total incident edge weight of each node position."""
+        return self._view(
+            'weighted_degrees',
+            lambda: np.bincount(self._entry_rows(), weights=self.weights, minlength=len(self.node_ids))
+        )
+    
+    def k_core_mask(self, k: int) -> np.ndarray:
+        """Return which node positions belong to the k-core.
+        
+        Peels every node with fewer than ``k`` remaining neighbors, round by
+        round, until no such node is left. Each round is vectorized over the
+        CSR arrays.
+        
+        Args:
+            k: Minimum number of neighbors within the core.
+            
+        Returns:
+            Boolean mask over node positions.
+        """
+        rows = self._entry_rows()
+        remaining_degree = self.degrees().astype(np.int64)
+        in_core = np.ones(len(self.node_ids), dtype=bool)
+        while True:
+            peeled = in_core & (remaining_degree < k)
+            if not peeled.any():
+                return in_core
+            in_core &= ~peeled
+            # Every entry from a peeled node removes one neighbor from the other endpoint
+            peeled_entries = peeled[rows]
+            np.subtract.at(remaining_degree, self.indices[peeled_entries], 1)
+    
+    def matvec(self, vector: np.ndarray) -> np.ndarray:
+        """Return the weighted adjacency matrix times a vector over node positions."""
+        rows = self._entry_rows()
+        return np.bincount(rows, weights=self.weights * vector[self.indices], minlength=len(self.node_ids))
+    
+    def personalized_pagerank(
+        self,
+        seeds: Dict[int, float],
+        alpha: float = 0.15,
+        tolerance: float = 1e-4
+    ) -> Dict[int, float]:
+        """Approximate personalized PageRank around seed nodes by local forward push.
+        
+        Residual mass is pushed out of a node only while it exceeds ``tolerance``
+        times the node's weighted degree, so the work is bounded by about
+        ``1 / (alpha * tolerance)`` edge visits and only the neighborhood the
+        walk actually reaches is touched. Each estimate undershoots the exact
+        value by at most ``tolerance`` times the node's weighted degree.
+        
+        Args:
+            seeds: Restart weight per seed node ID; normalized to sum to one.
+            alpha: Restart probability of the walk.
+            tolerance: Residual per unit of weighted degree below which a node is not pushed.
+            
+        Returns:
+            Estimated PageRank mass per reached node ID.
+        """
+        degrees = self.weighted_degrees()
+        total = sum(weight for node_id, weight in seeds.items() if node_id in self._positions and weight > 0)
+        if total <= 0:
+            return {}
+        residual: Dict[int, float] = {}
+        for node_id, weight in seeds.items():
+            if node_id in self._positions and weight > 0:
+                residual[self._positions[node_id]] = weight / total
+        
+        estimate: Dict[int, float] = defaultdict(float)
+        queue = deque(residual)
+        queued = set(queue)
+        while queue:
+            position = queue.popleft()
+            queued.discard(position)
+            mass = residual.pop(position)
+            start, end = self.indptr[position], self.indptr[position + 1]
+            if start == end:
+                # An isolated node keeps the whole walk
+                estimate[position] += mass
+                continue
+            estimate[position] += alpha * mass
+            
+            neighbors = self.indices[start:end]
+            shares = ((1.0 - alpha) * mass / degrees[position]) * self.weights[start:end]
+            limits = tolerance * degrees[neighbors]
+            for neighbor, share, limit in zip(neighbors.tolist(), shares.tolist(), limits.tolist()):
+                updated = residual.get(neighbor, 0.0) + share
+                residual[neighbor] = updated
+                if updated > limit and neighbor not in queued:
+                    queue.append(neighbor)
+                    queued.add(neighbor)
+        
+        return {int(self.node_ids[position]): value for position, value in estimate.items()}
+    
+    def disparity_filter(self, alpha: float) -> 'GraphStore':
+        """Return the backbone of edges that the disparity filter finds significant.
+        
+        Under the null model, the weight of a node with ``k`` neighbors and
+        strength ``s`` is split uniformly at random among its edges, so an edge
+        of weight ``w`` has p-value ``(1 - w/s)^(k-1)`` at that node. An edge is
+        kept when its p-value is below ``alpha`` at either endpoint. Nodes with
+        a single neighbor carry no information and do not test their edge.
+        
+        Args:
+            alpha: Significance level.
+            
+        Returns:
+            New store with the same nodes and only the significant edges.
+        """
+        rows = self._entry_rows()
+        degrees = self.degrees()[rows]
+        shares = self.weights / self.weighted_degrees()[rows]
+        significant = (degrees > 1) & (np.power(1.0 - shares, degrees - 1) < alpha)
+        
+        # An edge survives when either of its two entries is significant
+        edge_keys = np.minimum(rows, self.indices) * len(self.node_ids) + np.maximum(rows, self.indices)
+        _, edge_of_entry = np.unique(edge_keys, return_inverse=True)
+        kept_edges = np.bincount(edge_of_entry.ravel(), weights=significant) > 0
+        keep = kept_edges[edge_of_entry.ravel()]
+        return GraphStore(self.node_ids, rows[keep], self.indices[keep], self.weights[keep])
+    
+    def label_propagation(self, max_iterations: int = 100, seed: int = 42) -> Tuple[np.ndarray, int]:
+        """Detect communities by weighted label propagation over the CSR arrays.
+        
+        Every node starts in its own community and repeatedly adopts the label
+        carrying the most edge weight among its neighbors, keeping its current
+        label on ties. Each round aggregates the ``(node, neighbor label)``
+        weights of every node whose neighborhood changed with one sort over
+        their adjacency entries, so rounds cost at most O(E log E) and get
+        cheaper as labels settle. A random half of the changing nodes moves per
+        round, which avoids the label oscillation of fully synchronous updates.
+        
+        Args:
+            max_iterations: Maximum number of propagation rounds.
+            seed: Seed for choosing which nodes move in each round.
+            
+        Returns:
+            Tuple of the community of each node position, numbered from the
+            largest community down, and the number of rounds run.
+        """
+        node_count = len(self.node_ids)
+        labels = np.arange(node_count, dtype=np.int64)
+        rows = self._entry_rows()
+        # Only nodes with a neighbor that moved in the last round can change label
+        active = np.diff(self.indptr) > 0
+        rng = np.random.default_rng(seed)
+        
+        rounds = 0
+        for rounds in range(1, max_iterations + 1):
+            entries = active[rows]
+            if not entries.any():
+                rounds -= 1
+                break
+            keys, inverse = np.unique(rows[entries] * node_count + labels[self.indices[entries]], return_inverse=True)
+            totals = np.bincount(inverse.ravel(), weights=self.weights[entries])
+            key_rows = keys // node_count
+            key_labels = keys % node_count
+            
+            # Keys are sorted by row, so each row's candidate labels form one segment
+            new_segment = np.r_[True, key_rows[1:] != key_rows[:-1]]
+            segment = np.cumsum(new_segment) - 1
+            heaviest = totals >= np.maximum.reduceat(totals, np.flatnonzero(new_segment))[segment]
+            # Heaviest label per row, preferring the current label and then the smallest one
+            heaviest_entries = np.flatnonzero(heaviest)
+            first = heaviest_entries[np.r_[True, np.diff(segment[heaviest_entries]) > 0]]
+            best = labels.copy()
+            best[key_rows[first]] = key_labels[first]
+            keeps_current = heaviest & (key_labels == labels[key_rows])
+            best[key_rows[keeps_current]] = labels[key_rows[keeps_current]]
+            
+            changed = best != labels
+            moving = changed & (rng.random(node_count) < 0.5)
+            labels[moving] = best[moving]
+            active = changed & ~moving
+            active[rows[moving[self.indices]]] = True
+        
+        _, first_positions, dense, sizes = np.unique(labels, return_index=True, return_inverse=True, return_counts=True)
+        rank = np.empty(len(sizes), dtype=np.int64)
+        rank[np.lexsort((first_positions, -sizes))] = np.arange(len(sizes))
+        return rank[dense.ravel()], rounds
+    
+    def modularity(self, communities: np.ndarray) -> float:
+        """Return the weighted modularity of a community assignment over node positions."""
+        total_weight = float(self.weights.sum())
+        if total_weight == 0:
+            return 0.0
+        rows = self._entry_rows()
+        internal = np.bincount(communities[rows], weights=self.weights * (communities[rows] == communities[self.indices]))
+        strength = np.bincount(communities, weights=self.weighted_degrees())
+        return float(internal.sum() / total_weight - np.square(strength / total_weight).sum())
+    
+    def density(self) -> float:
+        """Return the edge density, as ``networkx.density`` would."""
+        node_count = len(self.node_ids)
+        if node_count <= 1:
+            return 0.0
+        return len(self.indices) / (node_count * (node_count - 1))
+    
+    def component_labels(self) -> np.ndarray:
+        """Return the connected-component label of each node position.
+        
+        The labelling is computed once and reused until the graph is modified.
+        """
+        return self._view('component_labels', self._label_components)
+    
+    def _label_components(self) -> np.ndarray:
+        """Label connected components, numbered in order of their first node position."""
+        if SCIPY_AVAILABLE:
+            _, labels = connected_components(self.to_scipy(), directed=False)
+            return labels
+        labels = np.zeros(len(self.node_ids), dtype=np.int32)
+        for label, component in enumerate(nx.connected_components(self.to_networkx())):
+            labels[[self._positions[node_id] for node_id in component]] = label
+        return labels
+    
+    def components(self) -> List[FrozenSet[int]]:
+        """Return the node IDs of each connected component, in label order (shared, do not modify)."""
+        return self._view('components', self._group_components)
+    
+    def _group_components(self) -> List[FrozenSet[int]]:
+        """Group node IDs by connected-component label."""
+        labels = self.component_labels()
+        order = np.argsort(labels, kind='stable')
+        boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+        return [frozenset(self.node_ids[group].tolist()) for group in np.split(order, boundaries) if len(group)]
+    
+    def number_connected_components(self) -> int:
+        """Return the number of connected components."""
+        if len(self.node_ids) == 0:
+            return 0
+        return int(self.component_labels().max()) + 1
+    
+    def to_scipy(self) -> 'csr_matrix':
+        """Return the float64 adjacency as a SciPy CSR matrix over node positions (shared, do not modify)."""
+        node_count = len(self.node_ids)
+        return self._view('scipy', lambda: csr_matrix(
+            (self.weights.astype(np.float64), self.indices, self.indptr), shape=(node_count, node_count)
+        ))
+    
+    def to_networkx(self, nodes: Optional[List[int]] = None, directed: bool = False) -> nx.Graph:
+        """Build a networkx view of the graph for algorithms not ported to CSR.
+        
+        The full undirected view is memoized and frozen; restricted or directed
+        views are built fresh and may be modified.
+        
+        Args:
+            nodes: Optional node IDs to restrict the view to.
+            directed: Return a DiGraph with each edge in both directions.
+            
+        Returns:
+            Graph whose nodes are NodeTable IDs and edges carry ``weight``.
+        """
+        if nodes is None and not directed:
+            return self._view('networkx', lambda: nx.freeze(self._build_networkx(None, False)))
+        return self._build_networkx(nodes, directed)
+    
+    def _build_networkx(self, nodes: Optional[List[int]], directed: bool) -> nx.Graph:
+        """Build a new networkx graph of the whole store or of the given nodes."""
+        graph = nx.DiGraph() if directed else nx.Graph()
+        if nodes is None:
+            graph.add_nodes_from(self.nodes())
+            graph.add_weighted_edges_from(self.directed_edges() if directed else self.edges())
+        else:
+            selected = set(nodes)
+            graph.add_nodes_from(node for node in self.nodes() if node in selected)
+            edges = self.directed_edges() if directed else self.edges()
+            graph.add_weighted_edges_from(
+                (u, v, weight) for u, v, weight in edges if u in selected and v in selected
+            )
+        return graph
+
+
+class SharedCSRGraph:
+    """CSR adjacency copied into shared memory for centrality worker processes.
+    
+    Workers attach to the blocks by name instead of receiving a pickled copy of
+    the graph with every task. Use as a context manager so the blocks are
+    released when the pool is done.
+    
+    Attributes:
+        descriptor: Picklable description of the blocks, passed to ``attach``.
+    """
+    
+    def __init__(self, adjacency: 'csr_matrix') -> None:
+        """Copy the adjacency's CSR arrays into new shared memory blocks.
+        
+        Args:
+            adjacency: Square CSR adjacency matrix.
+        """
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.descriptor: Dict[str, Any] = {'shape': adjacency.shape, 'arrays': {}}
+        try:
+            for name in ('data', 'indices', 'indptr'):
+                array = np.ascontiguousarray(getattr(adjacency, name))
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                self._blocks.append(block)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+                self.descriptor['arrays'][name] = (block.name, array.shape, array.dtype.str)
+        except Exception:
+            self.close()
+            raise
+    
+    def __enter__(self) -> 'SharedCSRGraph':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Release and unlink the shared memory blocks."""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+    
+    @staticmethod
+    def attach(descriptor: Dict[str, Any]) -> Tuple['csr_matrix', List[shared_memory.SharedMemory]]:
+        """Map the shared blocks into a CSR matrix without copying.
+        
+        Args:
+            descriptor: ``SharedCSRGraph.descriptor`` from the parent process.
+            
+        Returns:
+            Tuple of the adjacency matrix and the attached blocks, which the
+            caller must close once it no longer uses the matrix.
+        """
+        blocks = []
+        arrays = {}
+        for name, (block_name, shape, dtype) in descriptor['arrays'].items():
+            # The parent owns the blocks; attaching must not register them for cleanup.
+            # Before Python 3.13 attaching always registers, but pool workers share the
+            # parent's resource tracker, so the duplicate registration is harmless.
+            if sys.version_info >= (3, 13):
+                block = shared_memory.SharedMemory(name=block_name, track=False)
+            else:
+                block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        adjacency = csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']), shape=descriptor['shape'], copy=False)
+        return adjacency, blocks
+
+
+# MARK: - Incremental Updates
+
+def _source_key(source: Dict[str, Any]) -> str:
+    """Return a content key identifying a source document for ``remove_sources``."""
+    digest = hashlib.sha256()
+    for part in (source.get('url', ''), source.get('title', ''), source.get('content', '')):
+        digest.update(part.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class IncrementalState:
+    """Per-source bookkeeping that lets the builder add and remove sources without a rebuild.
+
+    Every source keeps what it contributed: its extracted concepts and
+    entities, and its label matches. ``cooccurrence`` holds the unthresholded
+    pair counts over all sources, restricted to the labels in ``scanned``, so a
+    source's contribution can be subtracted again exactly. The invariant is
+    ``cooccurrence == Σ contribution(source)`` for the current ``scanned`` mask.
+
+    Attributes:
+        sources: Current source documents, in insertion order.
+        keys: ``_source_key`` of each source.
+        references: ``{'title', 'url', 'type'}`` reference recorded for each source.
+        items: Canonical ``(concepts, entities)`` extracted from each source, or
+            None until materialized from the vectorized fallback's membership.
+        aliases: Concept surface forms each source added to the canonicalizer's
+            alias table, or None until materialized.
+        matches: Per source, the NodeTable IDs of scanned labels found in it
+            ('document' window) or the keys of its co-occurring pairs
+            ('sentence' and 'tokens' windows).
+        window: Co-occurrence window the matches were recorded for.
+        concept_counts: Exact number of sources mentioning each concept.
+        entity_counts: Exact number of sources mentioning each entity.
+        concept_sources: Source references of each concept.
+        entity_sources: Source references of each entity.
+        scanned: Boolean mask over NodeTable IDs of labels every source was scanned for.
+        spellings: Patterns each scanned (or previously scanned) label was last matched with.
+        rejected: Node IDs dropped by topic filtering, which are never re-scored.
+        cooccurrence: CSR matrix over NodeTable IDs of pair counts, or None until seeded.
+    """
+
+    def __init__(self, sources: List[Dict[str, Any]], window: str) -> None:
+        """Start bookkeeping for a full build over ``sources``.
+
+        Args:
+            sources: Source documents of the build.
+            window: Configured co-occurrence window.
+        """
+        self.sources: List[Dict[str, Any]] = []
+        self.keys: List[str] = []
+        self.references: List[Dict[str, str]] = []
+        self.items: List[Optional[Tuple[List[str], List[str]]]] = []
+        self.aliases: List[Optional[List[str]]] = []
+        self.matches: List[Optional[np.ndarray]] = []
+        self.window = window
+        self.concept_counts: Counter = Counter()
+        self.entity_counts: Counter = Counter()
+        self.concept_sources: Dict[str, List[Dict[str, str]]] = defaultdict(list)
+        self.entity_sources: Dict[str, List[Dict[str, str]]] = defaultdict(list)
+        self.scanned = np.zeros(0, dtype=bool)
+        self.spellings: Dict[int, Tuple[str, ...]] = {}
+        self.rejected: Set[int] = set()
+        self.cooccurrence: Optional['csr_matrix'] = None
+        self.append_sources(sources)
+
+    def __len__(self) -> int:
+        """Return the number of current sources."""
+        return len(self.sources)
+
+    def append_sources(self, sources: List[Dict[str, Any]]) -> None:
+        """Register new sources with empty items and matches."""
+        for source in sources:
+            title, url, source_type = _source_reference(len(self.sources), source)
+            self.sources.append(source)
+            self.keys.append(_source_key(source))
+            self.references.append({'title': title, 'url': url, 'type': source_type})
+            self.items.append(None)
+            self.aliases.append(None)
+            self.matches.append(None)
+
+    def delete_sources(self, positions: List[int]) -> None:
+        """Drop the sources at the given positions from every per-source list."""
+        removed = set(positions)
+        for name in ('sources', 'keys', 'references', 'items', 'aliases', 'matches'):
+            values = getattr(self, name)
+            setattr(self, name, [value for position, value in enumerate(values) if position not in removed])
+
+    def text(self, position: int) -> str:
+        """Return the lowercased text that labels are matched against."""
+        source = self.sources[position]
+        return (source.get('content', '') + ' ' + source.get('title', '')).lower()
+
+    def resize(self, node_count: int) -> None:
+        """Grow the scanned mask and co-occurrence matrix to ``node_count`` NodeTable IDs."""
+        if len(self.scanned) < node_count:
+            self.scanned = np.concatenate([self.scanned, np.zeros(node_count - len(self.scanned), dtype=bool)])
+        if self.cooccurrence is not None and self.cooccurrence.shape[0] < node_count:
+            self.cooccurrence.resize((node_count, node_count))
+
+    def record_items(self, position: int, concepts: List[str], entities: List[str]) -> None:
+        """Store a source's items and add them to the exact counts."""
+        self.items[position] = (concepts, entities)
+        reference = self.references[position]
+        _record_occurrences(concepts, reference, self.concept_counts, self.concept_sources)
+        _record_occurrences(entities, reference, self.entity_counts, self.entity_sources)
+
+    def forget_items(self, position: int) -> None:
+        """Subtract a source's items from the exact counts."""
+        concepts, entities = self.items[position]
+        reference = self.references[position]
+        for items, counts, references in (
+            (concepts, self.concept_counts, self.concept_sources),
+            (entities, self.entity_counts, self.entity_sources)
+        ):
+            for item in items:
+                counts[item] -= 1
+                if counts[item] <= 0:
+                    del counts[item]
+                    references.pop(item, None)
+                elif reference in references[item]:
+                    references[item].remove(reference)
+
+    @staticmethod
+    def pair_keys(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """Encode unordered node ID pairs as int64 keys (smaller ID in the high bits)."""
+        low = np.minimum(first, second).astype(np.int64)
+        high = np.maximum(first, second).astype(np.int64)
+        return (low << 32) | high
+
+    def affected_nodes(self, positions: List[int]) -> Set[int]:
+        """Return the scanned node IDs whose co-occurrence counts depend on the given sources."""
+        affected: Set[int] = set()
+        for position in positions:
+            matches = self.matches[position]
+            if matches is None or len(matches) == 0:
+                continue
+            if self.window == 'document':
+                node_ids = matches
+            else:
+                node_ids = np.concatenate([matches >> 32, matches & 0xFFFFFFFF])
+            node_ids = node_ids[self.scanned[node_ids]]
+            affected.update(node_ids.tolist())
+        return affected
+
+    def contribution(self, positions: List[int]) -> 'csr_matrix':
+        """Return the summed pair counts of the given sources over scanned labels.
+
+        Args:
+            positions: Source positions.
+
+        Returns:
+            Symmetric CSR matrix over NodeTable IDs with a zero diagonal.
+        """
+        node_count = len(self.scanned)
+        recorded = [self.matches[position] for position in positions if self.matches[position] is not None]
+        if self.window == 'document':
+            rows = [matches[self.scanned[matches]] for matches in recorded]
+            indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(row) for row in rows])
+            indices = np.concatenate(rows).astype(np.int32) if rows else np.zeros(0, dtype=np.int32)
+            incidence = csr_matrix(
+                (np.ones(len(indices), dtype=np.int64), indices, indptr),
+                shape=(len(rows), node_count)
+            )
+            counts = (incidence.T @ incidence).tocsr()
+            counts.setdiag(0)
+        else:
+            keys = np.concatenate(recorded) if recorded else np.zeros(0, dtype=np.int64)
+            first = keys >> 32
+            second = keys & 0xFFFFFFFF
+            keep = self.scanned[first] & self.scanned[second]
+            first, second = first[keep], second[keep]
+            counts = csr_matrix(
+                (np.ones(2 * len(first), dtype=np.int64), (np.concatenate([first, second]), np.concatenate([second, first]))),
+                shape=(node_count, node_count)
+            )
+        counts.eliminate_zeros()
+        return counts
+
+
+# MARK: - Graph Algorithms
+
+def _starting_vector(node_count: int, initial: Optional[np.ndarray]) -> np.ndarray:
+    """Return a power-iteration start: ``initial`` scaled to sum to one, else uniform."""
+    if initial is not None:
+        initial = np.asarray(initial, dtype=np.float64)
+        total = initial.sum()
+        if len(initial) == node_count and total > 0:
+            return initial / total
+    return np.full(node_count, 1.0 / node_count)
+
+
+def _sparse_pagerank(
+    adjacency: 'csr_matrix',
+    alpha: float = 0.85,
+    max_iter: int = 100,
+    tol: float = 1e-6,
+    initial: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Compute PageRank by power iteration on a sparse weighted adjacency.
+    
+    Follows the same formulation as ``networkx.pagerank``: rows are normalized
+    by their weight sums, dangling nodes redistribute their rank uniformly, and
+    iteration stops once the L1 change falls below ``n * tol``.
+    
+    Args:
+        adjacency: Square weighted adjacency matrix.
+        alpha: Damping factor.
+        max_iter: Maximum number of iterations.
+        tol: Per-node convergence tolerance.
+        initial: Optional starting vector (like ``nstart``), e.g. the previous
+            scores of a slightly changed graph. Normalized to sum to one.
+        
+    Returns:
+        Tuple of the score vector and convergence diagnostics.
+    """
+    node_count = adjacency.shape[0]
+    out_weight = np.asarray(adjacency.sum(axis=1)).ravel().astype(np.float64)
+    dangling = out_weight == 0
+    inverse_weight = np.divide(1.0, out_weight, out=np.zeros(node_count), where=~dangling)
+    transition = adjacency.multiply(inverse_weight[:, np.newaxis]).tocsr().T.tocsr()
+    
+    scores = _starting_vector(node_count, initial)
+    teleport = np.full(node_count, 1.0 / node_count)
+    residual = float('inf')
+    for iteration in range(1, max_iter + 1):
+        previous = scores
+        scores = alpha * (transition @ previous + previous[dangling].sum() * teleport) + (1 - alpha) * teleport
+        residual = float(np.abs(scores - previous).sum())
+        if residual < node_count * tol:
+            return scores, {'method': 'power_iteration', 'iterations': iteration, 'residual': residual, 'converged': True}
+    
+    return scores, {'method': 'power_iteration', 'iterations': max_iter, 'residual': residual, 'converged': False}
+
+
+def _sparse_eigenvector_centrality(
+    adjacency: 'csr_matrix',
+    max_iter: int = 1000,
+    tol: float = 1e-6,
+    initial: Optional[np.ndarray] = None
+) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+    """Compute eigenvector centrality on a sparse symmetric weighted adjacency.
+    
+    Runs the same shifted power iteration as ``networkx.eigenvector_centrality``
+    (``x ← (A + I)x``, L2-normalized). If it does not converge within
+    ``max_iter`` iterations, the leading eigenvector is computed with ARPACK
+    instead.
+    
+    Args:
+        adjacency: Square, symmetric weighted adjacency matrix.
+        max_iter: Maximum number of power iterations.
+        tol: Per-node convergence tolerance.
+        initial: Optional starting vector (like ``nstart``). Normalized to sum to one.
+        
+    Returns:
+        Tuple of the L2-normalized score vector (None if both solvers fail)
+        and convergence diagnostics.
+    """
+    node_count = adjacency.shape[0]
+    adjacency = adjacency.astype(np.float64, copy=False)
+    
+    scores = _starting_vector(node_count, initial)
+    residual = float('inf')
+    for iteration in range(1, max_iter + 1):
+        previous = scores
+        scores = previous + adjacency @ previous
+        norm = np.linalg.norm(scores)
+        scores = scores / norm if norm > 0 else previous
+        residual = float(np.abs(scores - previous).sum())
+        if residual < node_count * tol:
+            return scores, {'method': 'power_iteration', 'iterations': iteration, 'residual': residual, 'converged': True}
+    
+    diagnostics = {'method': 'power_iteration', 'iterations': max_iter, 'residual': residual, 'converged': False}
+    if node_count < 2:
+        return None, diagnostics
+    
+    try:
+        _, vectors = eigsh(adjacency, k=1, which='LA', maxiter=max_iter * node_count, tol=tol)
+        leading = vectors[:, 0]
+        leading = leading * np.sign(leading.sum()) if leading.sum() != 0 else np.abs(leading)
+        leading = leading / np.linalg.norm(leading)
+        residual = float(np.linalg.norm(adjacency @ leading - leading * (leading @ (adjacency @ leading))))
+        return leading, {'method': 'arpack', 'iterations': max_iter, 'residual': residual, 'converged': True}
+    except (ArpackNoConvergence, ValueError) as e:
+        print(f"⚠️ ARPACK eigenvector solve failed: {e}")
+        return None, diagnostics
+
+
+def _betweenness_pivot_count(node_count: int, error: float, confidence: float) -> int:
+    """Return how many pivot sources bound the betweenness estimation error.
+    
+    Each sampled source contributes a term in [0, 1] to a node's normalized
+    betweenness estimate, so Hoeffding's inequality with a union bound over all
+    nodes gives ``k = ln(2n / δ) / (2ε²)`` for error ``ε`` on every node with
+    probability ``1 - δ``.
+    
+    Args:
+        node_count: Number of nodes in the graph.
+        error: Target additive error ε.
+        confidence: Target probability 1 - δ.
+        
+    Returns:
+        Pivot count, at least 2 (so sampled pivots can be rescaled) and at
+        most ``node_count``.
+    """
+    failure_probability = min(max(1.0 - confidence, 1e-12), 1.0)
+    pivots = math.ceil(math.log(2 * node_count / failure_probability) / (2 * error ** 2))
+    return min(node_count, max(2, pivots))
+
+
+def _closeness_sources(node_count: int, sample_size: int, seed: int = 42) -> np.ndarray:
+    """Return the node positions used as closeness sources (all nodes when not sampling)."""
+    if sample_size >= node_count:
+        return np.arange(node_count)
+    return np.random.default_rng(seed).choice(node_count, size=sample_size, replace=False)
+
+
+def _closeness_partial_sums(
+    adjacency: 'csr_matrix',
+    sources: np.ndarray,
+    harmonic: bool,
+    max_block_bytes: int = 64 * 1024 * 1024
+) -> np.ndarray:
+    """Sum shortest-path distances (or inverse distances) from sources to every node.
+    
+    Runs Dijkstra in blocks of sources to bound the distance matrix held in
+    memory. Edge weights are used as distances, as with ``distance='weight'``
+    in networkx. The adjacency must be symmetric, so distances from the
+    sources equal distances to them. Unreachable nodes contribute nothing.
+    
+    Args:
+        adjacency: Square, symmetric weighted adjacency matrix.
+        sources: Source node positions.
+        harmonic: Sum inverse distances instead of distances.
+        max_block_bytes: Upper bound on the distance block computed at once.
+        
+    Returns:
+        Per-node sums over the given sources.
+    """
+    node_count = adjacency.shape[0]
+    block_size = max(1, max_block_bytes // (8 * max(node_count, 1)))
+    
+    totals = np.zeros(node_count)
+    for start in range(0, len(sources), block_size):
+        distances = dijkstra(adjacency, directed=False, indices=sources[start:start + block_size])
+        reachable = np.isfinite(distances) & (distances > 0)
+        if harmonic:
+            totals += np.divide(1.0, distances, out=np.zeros_like(distances), where=reachable).sum(axis=0)
+        else:
+            totals += np.where(reachable, distances, 0.0).sum(axis=0)
+    return totals
+
+
+def _closeness_from_sums(totals: np.ndarray, sample_size: int, harmonic: bool) -> np.ndarray:
+    """Turn per-node distance sums over ``sample_size`` sources into centrality scores.
+    
+    Sums are scaled by ``n / k`` (Eppstein and Wang), which is exact when every
+    node is a source.
+    """
+    node_count = len(totals)
+    estimates = totals * (node_count / sample_size)
+    if harmonic:
+        return estimates
+    return np.divide(node_count - 1, estimates, out=np.zeros(node_count), where=estimates > 0)
+
+
+def _sampled_closeness(
+    adjacency: 'csr_matrix',
+    sample_size: int,
+    harmonic: bool,
+    seed: int = 42
+) -> np.ndarray:
+    """Estimate closeness or harmonic centrality from sampled shortest-path sources.
+    
+    Args:
+        adjacency: Square, symmetric weighted adjacency matrix.
+        sample_size: Number of sampled sources k.
+        harmonic: Estimate harmonic centrality (sum of inverse distances)
+            instead of closeness ((n - 1) / sum of distances).
+        seed: Seed for the source sample.
+        
+    Returns:
+        Estimated centrality per node position.
+    """
+    sources = _closeness_sources(adjacency.shape[0], sample_size, seed)
+    return _closeness_from_sums(_closeness_partial_sums(adjacency, sources, harmonic), sample_size, harmonic)
+
+
+def _brandes_partial_betweenness(adjacency: 'csr_matrix', sources: List[int]) -> np.ndarray:
+    """Accumulate Brandes dependencies from the given sources on a weighted CSR graph.
+    
+    Shortest paths use edge weights as distances, like ``weight='weight'`` in
+    ``networkx.betweenness_centrality``. The result is unnormalized and, summed
+    over all sources, counts every ordered pair of endpoints.
+    
+    Args:
+        adjacency: Square, symmetric weighted adjacency matrix.
+        sources: Source node positions.
+        
+    Returns:
+        Per-node dependency sums over the given sources.
+    """
+    node_count = adjacency.shape[0]
+    indptr = adjacency.indptr.tolist()
+    indices = adjacency.indices.tolist()
+    weights = adjacency.data.tolist()
+    betweenness = [0.0] * node_count
+    
+    for source in sources:
+        # Dijkstra from source, recording shortest-path counts and predecessors
+        order = []
+        predecessors: Dict[int, List[int]] = {}
+        path_counts = {source: 1.0}
+        settled: Dict[int, float] = {}
+        tentative = {source: 0.0}
+        queue = [(0.0, source)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if node in settled:
+                continue
+            settled[node] = distance
+            order.append(node)
+            for entry in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[entry]
+                if neighbor in settled:
+                    continue
+                candidate = distance + weights[entry]
+                known = tentative.get(neighbor)
+                if known is None or candidate < known:
+                    tentative[neighbor] = candidate
+                    heapq.heappush(queue, (candidate, neighbor))
+                    path_counts[neighbor] = path_counts[node]
+                    predecessors[neighbor] = [node]
+                elif candidate == known:
+                    path_counts[neighbor] += path_counts[node]
+                    predecessors[neighbor].append(node)
+        
+        # Back-propagate dependencies in order of decreasing distance
+        dependency = dict.fromkeys(order, 0.0)
+        for node in reversed(order):
+            coefficient = (1.0 + dependency[node]) / path_counts[node]
+            for predecessor in predecessors.get(node, ()):
+                dependency[predecessor] += path_counts[predecessor] * coefficient
+            if node != source:
+                betweenness[node] += dependency[node]
+    
+    return np.asarray(betweenness)
+
+
+def _rescale_betweenness(totals: np.ndarray, sampled_sources: Optional[List[int]] = None) -> np.ndarray:
+    """Normalize summed Brandes dependencies as ``networkx.betweenness_centrality`` does.
+    
+    Args:
+        totals: Per-node dependency sums from ``_brandes_partial_betweenness``.
+        sampled_sources: Source positions when only a sample was used; sources
+            and non-sources are then scaled separately so estimates stay unbiased.
+            
+    Returns:
+        Normalized betweenness per node position.
+    """
+    pair_count = len(totals) - 1
+    if pair_count < 2:
+        return totals
+    if sampled_sources is None:
+        return totals / (pair_count * (pair_count - 1))
+    
+    sample_size = len(sampled_sources)
+    scales = np.full(len(totals), 1.0 / (sample_size * (pair_count - 1)))
+    if sample_size > 1:
+        # A single pivot gets no dependency from itself and keeps the finite non-source scale
+        scales[np.asarray(sampled_sources, dtype=np.int64)] = 1.0 / ((sample_size - 1) * (pair_count - 1))
+    return totals * scales
+
+
+def _centrality_task(descriptor: Dict[str, Any], task: str, payload: Any) -> Tuple[str, Any]:
+    """Process-pool worker that runs one centrality task on the shared CSR graph.
+    
+    Args:
+        descriptor: ``SharedCSRGraph.descriptor`` of the graph.
+        task: 'spectral' (PageRank and eigenvector), 'betweenness' or 'closeness'.
+        payload: Source positions for 'betweenness'; ``(sources, harmonic)`` for 'closeness'.
+        
+    Returns:
+        Tuple of the task name and its partial result.
+    """
+    adjacency, blocks = SharedCSRGraph.attach(descriptor)
+    try:
+        if task == 'spectral':
+            pagerank, pagerank_diagnostics = _sparse_pagerank(adjacency, max_iter=100, tol=1e-6)
+            eigenvector, eigenvector_diagnostics = _sparse_eigenvector_centrality(adjacency, max_iter=1000, tol=1e-6)
+            result = (pagerank, pagerank_diagnostics, eigenvector, eigenvector_diagnostics)
+        elif task == 'betweenness':
+            result = _brandes_partial_betweenness(adjacency, payload)
+        elif task == 'closeness':
+            sources, harmonic = payload
+            result = _closeness_partial_sums(adjacency, sources, harmonic)
+        else:
+            raise ValueError(f"Unknown centrality task: {task}")
+    finally:
+        del adjacency
+        for block in blocks:
+            block.close()
+    return task, result
+
+
+class KnowledgeGraphBuilder:
+    """Main class for building knowledge graphs from source collections."""
+    
+    def __init__(
+        self, 
+        cache_dir: Optional[str] = None,
+        topic_config: Optional[TopicRelevanceConfig] = None,
+        build_config: Optional[GraphBuildConfig] = None
+    ) -> None:
+        """Initialize the knowledge graph builder.
+        
+        Args:
+            cache_dir: Directory for caching models and intermediate results.
+            topic_config: Configuration for topic relevance filtering.
+            build_config: Configuration for graph construction performance options.
+        """
+        if cache_dir is None:
+            # Debug environment variable detection
+            app_bundle_mode = os.getenv('APP_BUNDLE_MODE')
+            print(f"🔍 Environment check: APP_BUNDLE_MODE = {app_bundle_mode}")
+            
+            # Use appropriate cache directory for macOS app bundles
+            if app_bundle_mode == '1':
+                # Running in app bundle - use user cache directory
+                home_dir = os.path.expanduser("~")
+                self.cache_dir = os.path.join(home_dir, "Library", "Caches", "com.glyph.knowledge-graph-explorer")
+                print(f"📁 App bundle mode detected - using cache directory: {self.cache_dir}")
+            else:
+                # Development mode - use local cache
+                self.cache_dir = "./graph_cache"
+                print(f"📁 Development mode - using cache directory: {self.cache_dir}")
+        else:
+            self.cache_dir = cache_dir
+            print(f"📁 Custom cache directory: {self.cache_dir}")
+            
+        # Create cache directory with proper error handling
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            print(f"✅ Cache directory ready: {self.cache_dir}")
+        except OSError as e:
+            print(f"⚠️ Failed to create cache directory {self.cache_dir}: {e}")
+            # Fallback to temp directory with clear reason
+            self.cache_dir = tempfile.mkdtemp(prefix="glyph_cache_")
+            print(f"🔄 FALLBACK: Using temporary cache directory due to permissions issue: {self.cache_dir}")
+            print(f"   Reason: Could not create/access intended cache directory")
+        
+        # Status file for Swift communication
+        self.status_file = os.path.join(self.cache_dir, "kg_status.json")
+        self.run_id = str(uuid.uuid4())[:8]  # Short run ID for this session
+        
+        # Initialize NLP components
+        self.sentence_transformer = None
+        self.ner_pipeline = None
+        self.stopwords_set = set()
+        
+        # Graph storage (graph nodes are NodeTable IDs)
+        self.nodes = NodeTable()
+        self.graph = GraphStore()
+        
+        # Graph the expensive analysis runs on: the k-core when pruning, else the full graph
+        self.core_graph = self.graph
+        self.pruned_nodes: Set[int] = set()
+        self.pruning_stats = {'enabled': False}
+        self.backbone_stats = {'enabled': False}
+        
+        # Community of each node ID, numbered from the largest community down
+        self.communities: Dict[int, int] = {}
+        self.community_stats = {'enabled': False}
+        self.node_embeddings = {}
+        self.edge_weights = {}
+        
+        # Concept canonicalizer holding the alias table of the current build
+        self.canonicalizer = None
+        
+        # Source × n-gram membership from the vectorized fallback, reused for co-occurrence
+        self.concept_membership = None
+        
+        # Error bounds of the streaming top-k counters (when enabled)
+        self.heavy_hitter_stats = {}
+        
+        # Sources and topic of the current graph, with the bookkeeping for add/remove_sources
+        self.sources: List[Dict[str, Any]] = []
+        self.topic = ""
+        self.incremental_state: Optional[IncrementalState] = None
+        
+        self.update_stats = {'applied': False}
+        
+        # Analysis results
+        self.centrality_scores = {}
+        self.centrality_diagnostics = {}
+        self.minimal_subgraph = None
+        self.minimal_subgraph_components = 0
+        
+        # Progress tracking
+        self.progress_callback = None
+        self.current_progress = 0.0
+        
+        # Topic relevance configuration
+        self.topic_config = topic_config or TopicRelevanceConfig()
+        
+        # Graph construction configuration
+        self.build_config = build_config or GraphBuildConfig()
+        
+        # Persistent per-source extraction cache
+        self.extraction_cache = None
+        if self.build_config.enable_extraction_cache:
+            self.extraction_cache = ExtractionCache(
+                os.path.join(self.cache_dir, "extraction_cache.sqlite3"),
+                max_bytes=int(self.build_config.extraction_cache_max_mb * 1024 * 1024)
+            )
+        
+        self._initialize_nlp_components()
+    
+    def _initialize_nlp_components(self):
+        """Initialize NLP components with fallbacks."""
+        print("🧠 Initializing NLP components...")
+        
+        # Initialize sentence transformer for embeddings
+        if SENTENCE_TRANSFORMERS_AVAILABLE:
+            try:
+                model_path = os.path.join(self.cache_dir, "sentence_transformer")
+                if os.path.exists(model_path):
+                    self.sentence_transformer = SentenceTransformer(model_path)
+                else:
+                    # Use a lightweight model for fast initialization
+                    self.sentence_transformer = SentenceTransformer('all-MiniLM-L6-v2')
+                    self.sentence_transformer.save(model_path)
+                print("✅ Sentence transformer loaded")
+            except Exception as e:
+                print(f"⚠️ Sentence transformer failed: {e}")
+        
+        # Initialize NER pipeline
+        if TRANSFORMERS_AVAILABLE:
+            try:
+                # Use a simpler approach for NER pipeline initialization
+                self.ner_pipeline = pipeline("ner", aggregation_strategy="simple")  # type: ignore
+                print("✅ NER pipeline loaded")
+            except Exception as e:
+                print(f"⚠️ NER pipeline failed: {e}")
+        
+        # Initialize stopwords
+        if NLTK_AVAILABLE:
+            try:
+                self.stopwords_set = set(stopwords.words('english'))
+                print("✅ Stopwords loaded")
+            except:
+                pass
+        
+        # Fallback stopwords
+        if not self.stopwords_set:
+            self.stopwords_set = {
+                'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
+                'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+                'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+                'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'
+            }
+    
+    def set_progress_callback(self, callback):
+        """Set callback function for progress updates."""
+        self.progress_callback = callback
+    
+    def _update_progress(self, progress: float, message: str = ""):
+        """Update progress and call callback if set."""
+        self.current_progress = progress
+        if self.progress_callback:
+            self.progress_callback(progress, message)
+        if message:
+            print(f"📊 {progress:.1%}: {message}")
+        
+        # Write status checkpoint for Swift to read
+        self._write_status_checkpoint(progress, message)
+    
+    def _write_status_checkpoint(self, progress: float, message: str, error: Optional[str] = None):
+        """Write status checkpoint to file for Swift communication."""
+        try:
+            status = {
+                "run_id": self.run_id,
+                "timestamp": datetime.now().isoformat(),
+                "progress": progress,
+                "message": message,
+                "current_step": message.split(":")[1].strip() if ":" in message else message,
+                "completed": progress >= 1.0,
+                "error": error,
+                "nodes_count": self.graph.number_of_nodes() if hasattr(self, 'graph') else 0,
+                "edges_count": self.graph.number_of_edges() if hasattr(self, 'graph') else 0
+            }
+            
+            with open(self.status_file, 'w') as f:
+                json.dump(status, f)
+            
+            # Debug: Confirm file was written
+            if progress in [0.0, 0.3, 0.7, 1.0]:  # Log key milestones
+                print(f"📝 Status written to {self.status_file}: {progress:.1%} - {message}")
+                
+        except Exception as e:
+            # Don't let status writing break the main process
+            print(f"⚠️ Failed to write status checkpoint to {self.status_file}: {e}")
+            print(f"   Cache dir exists: {os.path.exists(self.cache_dir)}")
+            print(f"   Cache dir writable: {os.access(self.cache_dir, os.W_OK) if os.path.exists(self.cache_dir) else 'N/A'}")
+    
+    def _clear_status_file(self):
+        """Clear status file at start of process."""
+        try:
+            if os.path.exists(self.status_file):
+                os.remove(self.status_file)
+        except Exception as e:
+            print(f"⚠️ Failed to clear status file: {e}")
+    
+    @traceable(name="build_knowledge_graph")
+    def build_graph_from_sources(
+        self, 
+        sources: List[Dict[str, Any]], 
+        topic: str = ""
+    ) -> Dict[str, Any]:
+        """Build knowledge graph from collected sources with topic relevance filtering.
+        
+        Args:
+            sources: List of source documents to process.
+            topic: Main topic/subject for relevance filtering.
+            
+        Returns:
+            Dictionary containing the generated knowledge graph data.
+        """
+        print(f"🏗️ Building knowledge graph from {len(sources)} sources...")
+        if topic.strip():
+            print(f"🎯 Topic focus: '{topic}' (filtering enabled)")
+        else:
+            print("🎯 No specific topic focus (filtering disabled)")
+        
+        # Clear status file from any previous runs
+        self._clear_status_file()
+        
+        self._update_progress(0.0, "Starting knowledge graph construction")
+        
+        # Clear previous data
+        self.nodes = NodeTable()
+        self.graph = GraphStore()
+        self.core_graph = self.graph
+        self.pruned_nodes = set()
+        self.pruning_stats = {'enabled': False}
+        self.backbone_stats = {'enabled': False}
+        self.communities = {}
+        self.community_stats = {'enabled': False}
+        self.node_embeddings.clear()
+        self.edge_weights.clear()
+        self.centrality_scores.clear()
+        self.centrality_diagnostics = {}
+        self.sources = list(sources)
+        self.topic = topic
+        self.incremental_state = IncrementalState(self.sources, self.build_config.cooccurrence_window)
+        self.update_stats = {'applied': False}
+        
+        try:
+            # Step 1: Extract concepts and entities (25%)
+            self._update_progress(0.1, "Extracting concepts and entities")
+            concepts, entities = self._extract_concepts_and_entities(sources)
+            
+            # Optionally drop off-topic candidates before any co-occurrence work
+            prefilter = bool(topic.strip()) and self.topic_config.filter_before_graph_construction
+            if prefilter:
+                self._update_progress(0.2, "Filtering candidates by topic relevance")
+                concepts, entities = self._prefilter_candidates_by_topic(topic, concepts, entities)
+            
+            # Step 2: Build initial graph (40%)
+            self._update_progress(0.25, "Building initial graph structure")
+            self._build_graph_structure(concepts, entities, sources)
+            
+            # Step 3: Filter by topic relevance (50%) - NEW STEP
+            if topic.strip() and not prefilter:
+                self._update_progress(0.4, "Filtering nodes by topic relevance")
+                self._filter_nodes_by_topic_relevance(topic, sources)
+            
+            # Step 4: Calculate centrality metrics (65%)
+            self._update_progress(0.5, "Calculating centrality metrics")
+            self._extract_backbone()
+            self._prune_graph()
+            self._calculate_centrality_metrics()
+            self._score_pruned_nodes()
+            self._detect_communities()
+            
+            # Step 5: Find minimal subgraph (80%)
+            self._update_progress(0.65, "Finding minimal subgraph")
+            self._find_minimal_subgraph()
+            
+            # Step 6: Generate embeddings (90%)
+            self._update_progress(0.8, "Generating node embeddings")
+            self._generate_node_embeddings()
+            
+            # Step 7: Finalize results (100%)
+            self._update_progress(0.9, "Finalizing results")
             result = self._finalize_graph_data()
             
             self._update_progress(1.0, "Knowledge graph construction complete")
@@ -396,19 +3005,520 @@ class KnowledgeGraphBuilder:
             return result
             
         except Exception as e:
-            error_msg = f"Graph construction failed: {e}"
-            print(f"❌ {error_msg}")
-            
-            # Write error status for Swift to read
-            self._write_status_checkpoint(0.0, "Error occurred", error=error_msg)
-            
-            return {
-                "success": False,
-                "error": str(e),
-                "nodes": [],
-                "edges": [],
-                "metadata": {}
-            }
+            error_msg = f"Graph construction failed: {e}"
+            print(f"❌ {error_msg}")
+            
+            # Write error status for Swift to read
+            self._write_status_checkpoint(0.0, "Error occurred", error=error_msg)
+            
+            return {
+                "success": False,
+                "error": str(e),
+                "nodes": [],
+                "edges": [],
+                "metadata": {}
+            }
+    
+    @traceable(name="add_sources")
+    def add_sources(self, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add sources to the current graph without rebuilding it from scratch.
+        
+        Only the new sources go through extraction and label scanning. Counts and
+        edge weights are updated in place, PageRank and eigenvector centrality are
+        warm-started from the previous scores, and betweenness, closeness and the
+        minimal subgraph are only recomputed for components that changed.
+        
+        Args:
+            sources: New source documents.
+            
+        Returns:
+            Dictionary containing the updated knowledge graph data, in the same
+            format as ``build_graph_from_sources``.
+        """
+        return self._update_sources(list(sources), [])
+    
+    @traceable(name="remove_sources")
+    def remove_sources(self, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Remove sources from the current graph without rebuilding it from scratch.
+        
+        Sources are matched to previously added ones by URL, title and content.
+        
+        Args:
+            sources: Source documents to remove.
+            
+        Returns:
+            Dictionary containing the updated knowledge graph data, in the same
+            format as ``build_graph_from_sources``.
+        """
+        return self._update_sources([], list(sources))
+    
+    def _update_sources(
+        self,
+        added: List[Dict[str, Any]],
+        removed: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Apply source additions and removals, incrementally when possible.
+        
+        Falls back to a full rebuild over the resulting sources when there is no
+        previous build, when scipy is unavailable, or with streaming top-k
+        counters, whose counts cannot be decremented.
+        
+        Args:
+            added: Sources to add.
+            removed: Sources to remove.
+            
+        Returns:
+            Dictionary containing the updated knowledge graph data.
+        """
+        print(f"🔁 Updating knowledge graph: +{len(added)} / -{len(removed)} sources...")
+        
+        # Match removals to current source positions by content key
+        keys = [_source_key(source) for source in self.sources]
+        removed_positions = []
+        for source in removed:
+            key = _source_key(source)
+            position = next(
+                (i for i, current in enumerate(keys) if current == key and i not in removed_positions), None
+            )
+            if position is None:
+                print(f"⚠️ Source not in graph, cannot remove: {source.get('title', '') or source.get('url', '')}")
+            else:
+                removed_positions.append(position)
+        
+        state = self.incremental_state
+        if state is None or not SCIPY_AVAILABLE or self.build_config.streaming_topk:
+            print("🔄 Incremental update unavailable - rebuilding the graph")
+            remaining = [source for i, source in enumerate(self.sources) if i not in set(removed_positions)]
+            return self.build_graph_from_sources(remaining + added, self.topic)
+        
+        self._clear_status_file()
+        self._update_progress(0.0, "Starting incremental graph update")
+        
+        try:
+            result = self._apply_source_changes(added, removed_positions)
+            self._update_progress(1.0, "Incremental graph update complete")
+            print(f"✅ Graph updated: {self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges")
+            return result
+            
+        except Exception as e:
+            error_msg = f"Incremental graph update failed: {e}"
+            print(f"❌ {error_msg}")
+            
+            # The bookkeeping may be half-updated; the next update rebuilds instead
+            self.incremental_state = None
+            self._write_status_checkpoint(0.0, "Error occurred", error=error_msg)
+            
+            return {
+                "success": False,
+                "error": str(e),
+                "nodes": [],
+                "edges": [],
+                "metadata": {}
+            }
+    
+    def _apply_source_changes(
+        self,
+        added: List[Dict[str, Any]],
+        removed_positions: List[int]
+    ) -> Dict[str, Any]:
+        """Update counts, edges and analysis results for changed sources.
+        
+        Args:
+            added: Sources to add.
+            removed_positions: Positions of the sources to remove.
+            
+        Returns:
+            Dictionary containing the updated knowledge graph data.
+        """
+        step_start = datetime.now()
+        state = self.incremental_state
+        self._update_progress(0.05, "Preparing incremental state")
+        self._seed_incremental_state()
+        
+        previous_graph = self.graph
+        previous_core = self.core_graph
+        previous_scores = {metric: dict(scores) for metric, scores in self.centrality_scores.items()}
+        previous_harmonic = self.centrality_diagnostics.get('closeness', {}).get('measure') == 'harmonic'
+        
+        # Nodes whose edges may have changed
+        touched: Set[int] = set()
+        
+        if removed_positions:
+            touched |= state.affected_nodes(removed_positions)
+            state.cooccurrence = (state.cooccurrence - state.contribution(removed_positions)).tocsr()
+            for position in removed_positions:
+                state.forget_items(position)
+                if self.canonicalizer is not None:
+                    self.canonicalizer.forget_aliases(state.aliases[position])
+            state.delete_sources(removed_positions)
+        
+        first_added = len(state)
+        if added:
+            self._update_progress(0.1, f"Extracting concepts and entities from {len(added)} new sources")
+            state.append_sources(added)
+            for offset, (text_concepts, text_entities, aliases) in enumerate(self._extract_per_source(added)):
+                state.record_items(first_added + offset, text_concepts, text_entities)
+                state.aliases[first_added + offset] = aliases
+        self.sources = list(state.sources)
+        
+        # Re-rank candidates on the updated counts
+        self._update_progress(0.3, "Updating candidate selection")
+        selected = self._select_incremental_candidates()
+        state.resize(len(self.nodes))
+        selected_mask = np.zeros(len(self.nodes), dtype=bool)
+        selected_mask[selected] = True
+        
+        # Deselected labels leave the counts; they are rescanned if they return.
+        # Labels whose alias spellings changed are rescanned like newly selected ones.
+        spellings = {node_id: tuple(self._label_spellings(node_id)) for node_id in selected}
+        stale = state.scanned & ~selected_mask
+        stale[[
+            node_id for node_id in selected
+            if state.scanned[node_id] and state.spellings.get(node_id, ()) != spellings[node_id]
+        ]] = True
+        if stale.any():
+            state.scanned &= ~stale
+            keep = diags(state.scanned.astype(np.int64), dtype=np.int64)
+            state.cooccurrence = (keep @ state.cooccurrence @ keep).tocsr()
+            state.cooccurrence.eliminate_zeros()
+        
+        matcher = self._label_matcher(selected)
+        
+        # Newly selected labels: only existing sources that mention them, under the
+        # current or the previously scanned spellings, are rescanned
+        new_labels = [node_id for node_id in selected if not state.scanned[node_id]]
+        if new_labels:
+            probe = LabelMatcher(
+                [self.nodes.labels[node_id].lower() for node_id in new_labels],
+                word_boundaries=self.build_config.cooccurrence_word_boundaries,
+                spellings={
+                    index: sorted(set(spellings[node_id]) | set(state.spellings.get(node_id, ())))
+                    for index, node_id in enumerate(new_labels)
+                }
+            )
+            refreshed = [position for position in range(first_added) if probe.find_labels(state.text(position))]
+            state.cooccurrence = (state.cooccurrence - state.contribution(refreshed)).tocsr()
+            state.scanned[new_labels] = True
+            state.spellings.update((node_id, spellings[node_id]) for node_id in new_labels)
+            self._scan_sources(refreshed, selected, matcher)
+            state.cooccurrence = (state.cooccurrence + state.contribution(refreshed)).tocsr()
+            touched.update(new_labels)
+        
+        added_positions = list(range(first_added, len(state)))
+        self._scan_sources(added_positions, selected, matcher)
+        state.cooccurrence = (state.cooccurrence + state.contribution(added_positions)).tocsr()
+        touched |= state.affected_nodes(added_positions)
+        
+        self._update_progress(0.45, "Updating edge weights")
+        self.graph = self._graph_from_cooccurrence(previous_graph, selected)
+        self._extract_backbone()
+        removed_nodes = [node_id for node_id in previous_graph.nodes() if not selected_mask[node_id]]
+        for node_id in removed_nodes:
+            self.node_embeddings.pop(node_id, None)
+        
+        self._update_progress(0.5, "Updating centrality metrics")
+        self._prune_graph()
+        reusable = self._unchanged_components(previous_core, touched)
+        self._update_centrality_metrics(previous_scores, previous_core.number_of_nodes(), previous_harmonic, reusable)
+        self._score_pruned_nodes()
+        self._detect_communities()
+        
+        self._update_progress(0.65, "Updating minimal subgraph")
+        self._find_minimal_subgraph(reusable=set(self.core_graph.node_ids[reusable].tolist()))
+        
+        self._update_progress(0.8, "Generating embeddings for new nodes")
+        new_nodes = [node_id for node_id in self.graph.nodes() if node_id not in previous_graph]
+        self._generate_node_embeddings([node_id for node_id in self.graph.nodes() if node_id not in self.node_embeddings])
+        
+        self.update_stats = {
+            'applied': True,
+            'added_sources': len(added),
+            'removed_sources': len(removed_positions),
+            'new_nodes': len(new_nodes),
+            'removed_nodes': len(removed_nodes),
+            'recomputed_nodes': int((~reusable).sum()),
+            'reused_nodes': int(reusable.sum()),
+            'elapsed_seconds': (datetime.now() - step_start).total_seconds()
+        }
+        print(f"♻️ Reused analysis for {self.update_stats['reused_nodes']} nodes in unchanged components; "
+              f"recomputed {self.update_stats['recomputed_nodes']}")
+        
+        self._update_progress(0.9, "Finalizing results")
+        return self._finalize_graph_data()
+    
+    def _seed_incremental_state(self) -> None:
+        """Build exact counts and the unthresholded co-occurrence matrix from the recorded build."""
+        state = self.incremental_state
+        if state.cooccurrence is not None:
+            return
+        
+        # The vectorized fallback only kept the membership matrix; materialize per-source concepts
+        if any(items is None or items[0] is None for items in state.items):
+            concept_rows = self.concept_membership[0].row_labels() if self.concept_membership is not None else None
+            surface_rows = None
+            if self.concept_membership is not None and self.canonicalizer is not None:
+                surface_rows = self.concept_membership[2].row_labels()
+                # The build only recorded aliases of retained concepts; rebuild the table per source
+                self.canonicalizer.alias_counts.clear()
+            for position, items in enumerate(state.items):
+                entities = items[1] if items is not None else []
+                concepts = concept_rows[position] if concept_rows is not None else []
+                state.items[position] = (concepts, entities)
+                state.aliases[position] = []
+                if surface_rows is not None:
+                    state.aliases[position] = self.canonicalizer.surface_forms(surface_rows[position])
+                    self.canonicalizer.canonicalize_all(surface_rows[position])
+        
+        for position, (text_concepts, text_entities) in enumerate(state.items):
+            state.record_items(position, text_concepts, text_entities)
+        
+        # Every graph label was scanned in every source; top candidates missing from the graph were filtered out
+        state.resize(len(self.nodes))
+        state.scanned[self.graph.node_ids] = True
+        state.spellings = {node_id: tuple(self._label_spellings(node_id)) for node_id in self.graph.nodes()}
+        concepts, entities = self._candidate_nodes(
+            state.concept_counts, state.entity_counts, state.concept_sources, state.entity_sources, max(len(state), 1)
+        )
+        for node in concepts + entities:
+            node_id = self.nodes.lookup(node['label'], node['type'])
+            if node_id is not None and node_id not in self.graph:
+                state.rejected.add(node_id)
+        
+        state.cooccurrence = state.contribution(list(range(len(state))))
+    
+    def _select_incremental_candidates(self) -> List[int]:
+        """Re-rank concepts and entities on the updated counts and intern the selection.
+        
+        Node attributes (frequency, importance, references, aliases) are refreshed
+        for every selected node. Candidates that were not in the graph before are
+        scored against the topic, when topic filtering applies, and dropped below
+        the relevance threshold.
+        
+        Returns:
+            Selected node IDs, concepts first, in rank order.
+        """
+        state = self.incremental_state
+        concepts, entities = self._candidate_nodes(
+            state.concept_counts, state.entity_counts, state.concept_sources, state.entity_sources, max(len(state), 1)
+        )
+        node_ids = list(dict.fromkeys(self.nodes.add_nodes(concepts + entities).tolist()))
+        
+        filtering = (
+            bool(self.topic.strip())
+            and self.topic_config.enable_semantic_filtering
+            and (self.topic_config.filter_before_graph_construction
+                 or len(node_ids) >= self.topic_config.max_nodes_before_filtering)
+        )
+        fresh = [node_id for node_id in node_ids if node_id not in self.graph and node_id not in state.rejected]
+        if filtering and fresh:
+            relevance_scores = self._calculate_topic_relevance_scores(self.topic, fresh)
+            for node_id, score in relevance_scores.items():
+                if score < self.topic_config.relevance_threshold:
+                    state.rejected.add(node_id)
+                else:
+                    self.nodes.topic_relevance[node_id] = score
+        
+        return [node_id for node_id in node_ids if node_id not in state.rejected]
+    
+    def _scan_sources(self, positions: List[int], selected: List[int], matcher: LabelMatcher) -> None:
+        """Record which selected labels (or window pairs) each given source contains.
+        
+        Args:
+            positions: Source positions to scan.
+            selected: Node IDs in the matcher's label order.
+            matcher: Matcher over the selected labels.
+        """
+        state = self.incremental_state
+        selected_array = np.asarray(selected, dtype=np.int64)
+        for position in positions:
+            text = state.text(position)
+            if state.window == 'document':
+                found = np.asarray(sorted(matcher.find_labels(text)), dtype=np.int64)
+                state.matches[position] = np.sort(selected_array[found])
+            else:
+                indices = np.array(sorted(self._document_window_pairs(text, matcher)), dtype=np.int64).reshape(-1, 2)
+                state.matches[position] = IncrementalState.pair_keys(
+                    selected_array[indices[:, 0]], selected_array[indices[:, 1]]
+                )
+    
+    def _graph_from_cooccurrence(self, previous_graph: GraphStore, selected: List[int]) -> GraphStore:
+        """Build the edge store over the selected nodes from the unthresholded counts.
+        
+        Nodes that were already in the graph keep their relative order, and new
+        nodes are appended in rank order.
+        
+        Args:
+            previous_graph: Graph before the update.
+            selected: Selected node IDs.
+            
+        Returns:
+            Graph with every pair that co-occurs in at least two sources.
+        """
+        min_weight = 2  # Same threshold as _build_graph_structure
+        selected_set = set(selected)
+        order = [node_id for node_id in previous_graph.nodes() if node_id in selected_set]
+        order += [node_id for node_id in selected if node_id not in previous_graph]
+        
+        ids = np.asarray(order, dtype=np.int64)
+        counts = self.incremental_state.cooccurrence[ids][:, ids].tocoo()
+        keep = counts.data >= min_weight
+        return GraphStore(order, counts.row[keep], counts.col[keep], counts.data[keep])
+    
+    def _unchanged_components(self, previous_core: GraphStore, touched: Set[int]) -> np.ndarray:
+        """Return which core positions lie in components that are identical to before.
+        
+        A component is unchanged when none of its nodes was touched and its
+        node set equals exactly one previous component. Every edge that changed,
+        including edges the backbone filter kept or dropped because an
+        endpoint's strength changed, has a touched endpoint, so its edges and
+        weights are unchanged too.
+        
+        Args:
+            previous_core: Core graph before the update.
+            touched: Node IDs whose incident edges may have changed.
+            
+        Returns:
+            Boolean mask over positions of ``self.core_graph``.
+        """
+        core = self.core_graph
+        node_count = core.number_of_nodes()
+        if node_count == 0 or previous_core.number_of_nodes() == 0:
+            return np.zeros(node_count, dtype=bool)
+        
+        labels = core.component_labels()
+        component_count = int(labels.max()) + 1
+        previous_labels = previous_core.component_labels()
+        previous_positions = previous_core.positions(core.nodes())
+        mapped = np.where(previous_positions >= 0, previous_labels[np.maximum(previous_positions, 0)], -1)
+        
+        changed = (mapped < 0) | np.isin(core.node_ids, np.fromiter(touched, dtype=np.int64, count=len(touched)))
+        changed_count = np.bincount(labels, weights=changed, minlength=component_count)
+        lowest = np.full(component_count, np.iinfo(np.int64).max)
+        highest = np.full(component_count, -1, dtype=np.int64)
+        np.minimum.at(lowest, labels, mapped)
+        np.maximum.at(highest, labels, mapped)
+        sizes = np.bincount(labels, minlength=component_count)
+        previous_sizes = np.bincount(previous_labels)
+        
+        unchanged = (changed_count == 0) & (lowest == highest) & (highest >= 0)
+        unchanged &= previous_sizes[np.maximum(highest, 0)] == sizes
+        return unchanged[labels]
+    
+    def _update_centrality_metrics(
+        self,
+        previous_scores: Dict[str, Dict[int, float]],
+        previous_node_count: int,
+        previous_harmonic: bool,
+        reusable: np.ndarray
+    ) -> None:
+        """Update centrality after a source change, reusing work where possible.
+        
+        PageRank and eigenvector centrality are global and re-run warm-started
+        from the previous scores, which typically converges in a few iterations.
+        Betweenness and harmonic centrality only depend on a node's own component,
+        so they are recomputed for changed components only.
+        
+        Args:
+            previous_scores: Centrality scores before the update.
+            previous_node_count: Core graph size before the update.
+            previous_harmonic: Whether the previous closeness scores are harmonic.
+            reusable: Core positions in unchanged components.
+        """
+        print("📊 Updating centrality metrics incrementally...")
+        if self.core_graph.number_of_nodes() == 0:
+            print("⚠️ Empty graph - skipping centrality calculations")
+            return
+        if not previous_scores:
+            self._calculate_centrality_metrics()
+            return
+        
+        graph = self.core_graph.to_networkx()
+        try:
+            if self.build_config.centrality_backend == 'sparse' and SCIPY_AVAILABLE:
+                self._calculate_spectral_centrality_sparse(graph, warm_start=previous_scores)
+            else:
+                self._calculate_spectral_centrality_networkx(graph, warm_start=previous_scores)
+            for metric in ('pagerank', 'eigenvector'):
+                self.centrality_diagnostics[metric]['warm_start'] = True
+            
+            self._update_path_centrality(graph, previous_scores, previous_node_count, previous_harmonic, reusable)
+            print("✅ Centrality metrics updated successfully")
+        except Exception as e:
+            print(f"⚠️ Incremental centrality update failed ({e}) - recomputing all metrics")
+            self._calculate_centrality_metrics()
+    
+    def _update_path_centrality(
+        self,
+        graph: nx.Graph,
+        previous_scores: Dict[str, Dict[int, float]],
+        previous_node_count: int,
+        previous_harmonic: bool,
+        reusable: np.ndarray
+    ) -> None:
+        """Recompute betweenness and closeness for changed components only.
+        
+        Unchanged components keep their betweenness, rescaled from the previous to
+        the new ``(n - 1)(n - 2)`` normalization, and their harmonic centrality,
+        which is unnormalized. Closeness of a connected graph depends on every
+        node, so it is recomputed in full.
+        
+        Args:
+            graph: networkx view of the core graph.
+            previous_scores: Centrality scores before the update.
+            previous_node_count: Core graph size before the update.
+            previous_harmonic: Whether the previous closeness scores are harmonic.
+            reusable: Core positions in unchanged components.
+        """
+        node_ids = self.core_graph.nodes()
+        node_count = len(node_ids)
+        if node_count <= 2 or previous_node_count <= 2 or not reusable.any():
+            self._calculate_betweenness_centrality(graph)
+            self._calculate_closeness_centrality(graph)
+            return
+        
+        reused_ids = self.core_graph.node_ids[reusable].tolist()
+        changed_ids = self.core_graph.node_ids[~reusable].tolist()
+        # A copy, not a view: filtered subgraph views slow every neighbor lookup down
+        changed = graph.subgraph(changed_ids).copy()
+        changed_count = len(changed_ids)
+        
+        rescale = ((previous_node_count - 1) * (previous_node_count - 2)) / ((node_count - 1) * (node_count - 2))
+        betweenness = {node_id: previous_scores['betweenness'].get(node_id, 0.0) * rescale for node_id in reused_ids}
+        pivots = self._betweenness_sample_size(changed_count)
+        if changed_count:
+            # Unnormalized scores count each pair once; normalize against the whole graph
+            raw = nx.betweenness_centrality(
+                changed,
+                k=pivots if pivots < changed_count else None,
+                weight='weight',
+                normalized=False,
+                seed=42
+            )
+            normalization = 2.0 / ((node_count - 1) * (node_count - 2))
+            betweenness.update((node_id, value * normalization) for node_id, value in raw.items())
+        self.centrality_scores['betweenness'] = betweenness
+        self.centrality_diagnostics['betweenness'] = dict(
+            self._betweenness_diagnostics(pivots, changed_count), recomputed_nodes=changed_count
+        )
+        
+        harmonic = self.core_graph.number_connected_components() != 1
+        if not (harmonic and previous_harmonic):
+            self._calculate_closeness_centrality(graph)
+            return
+        
+        closeness = {node_id: previous_scores['closeness'].get(node_id, 0.0) for node_id in reused_ids}
+        sample_size = self._closeness_sample_size(changed_count)
+        if changed_count:
+            if sample_size >= changed_count:
+                closeness.update(nx.harmonic_centrality(changed, distance='weight'))
+            else:
+                changed_graph = self.core_graph.subgraph(~reusable)
+                estimates = _sampled_closeness(changed_graph.to_scipy(), sample_size, True)
+                closeness.update(zip(changed_graph.nodes(), estimates.tolist()))
+        self.centrality_scores['closeness'] = closeness
+        self.centrality_diagnostics['closeness'] = dict(
+            self._closeness_diagnostics(sample_size, changed_count, True), recomputed_nodes=changed_count
+        )
     
     def _extract_concepts_and_entities(
         self, 
@@ -417,127 +3527,443 @@ class KnowledgeGraphBuilder:
         """Extract concepts and entities from source content."""
         concepts = []
         entities = []
-        concept_counts = Counter()
-        entity_counts = Counter()
-        
-        # Track which sources contributed to each concept/entity
-        concept_sources = defaultdict(list)
-        entity_sources = defaultdict(list)
-        
-        for i, source in enumerate(sources):
-            progress = 0.1 + (i / len(sources)) * 0.2
-            self._update_progress(progress, f"Processing source {i+1}/{len(sources)}")
-            
-            content = source.get('content', '')
-            title = source.get('title', '')
-            url = source.get('url', '')
-            source_title = title if title else f"Source {i+1}"
-            
-            # Extract text concepts
-            text_concepts = self._extract_text_concepts(content + ' ' + title)
-            for concept in text_concepts:
-                concept_counts[concept] += 1
-                concept_sources[concept].append({
-                    'title': source_title,
-                    'url': url,
-                    'type': source.get('source_type', 'web')
-                })
+        
+        if self.build_config.streaming_topk:
+            # Bounded-memory counters that only track references for retained candidates
+            concept_counts = SpaceSavingCounter(self._heavy_hitter_capacity(500))
+            entity_counts = SpaceSavingCounter(self._heavy_hitter_capacity(300))
+            concept_sources = concept_counts.references
+            entity_sources = entity_counts.references
+        else:
+            concept_counts = Counter()
+            entity_counts = Counter()
             
-            # Extract named entities
-            text_entities = self._extract_named_entities(content)
-            for entity in text_entities:
-                entity_counts[entity] += 1
-                entity_sources[entity].append({
-                    'title': source_title,
-                    'url': url,
-                    'type': source.get('source_type', 'web')
-                })
+            # Track which sources contributed to each concept/entity
+            concept_sources = defaultdict(list)
+            entity_sources = defaultdict(list)
+        
+        # Fresh alias table per build; variants are merged before counting
+        self.canonicalizer = ConceptCanonicalizer() if self.build_config.canonicalize_concepts else None
+        
+        self.concept_membership = None
+        if self._use_vectorized_fallback():
+            # Corpus-level n-gram counting replaces per-source concept extraction
+            concepts = self._extract_concepts_vectorized(sources)
+            entity_lists = []
+            if self.ner_pipeline:
+                entity_lists = self._extract_named_entities_batched(
+                    [source.get('content', '') for source in sources]
+                )
+            if self.incremental_state is not None:
+                # Concept lists are materialized from the membership matrix only if needed
+                for i in range(len(sources)):
+                    self.incremental_state.items[i] = (None, entity_lists[i] if entity_lists else [])
+            for i, text_entities in enumerate(entity_lists):
+                source_title, url, source_type = _source_reference(i, sources[i])
+                reference = {'title': source_title, 'url': url, 'type': source_type}
+                _record_occurrences(text_entities, reference, entity_counts, entity_sources)
+        else:
+            self._count_per_source_extractions(
+                sources, concept_counts, entity_counts, concept_sources, entity_sources
+            )
+        
+        # Vectorized fallback concepts are already nodes; the counters then only hold entities
+        counted_concepts, entities = self._candidate_nodes(
+            concept_counts, entity_counts, concept_sources, entity_sources, len(sources)
+        )
+        concepts.extend(counted_concepts)
+        
+        if self.build_config.streaming_topk:
+            self.heavy_hitter_stats = {
+                'concept_capacity': concept_counts.capacity,
+                'concept_error_bound': concept_counts.error_bound(),
+                'concept_max_observed_error': concept_counts.max_observed_error(),
+                'entity_capacity': entity_counts.capacity,
+                'entity_error_bound': entity_counts.error_bound(),
+                'entity_max_observed_error': entity_counts.max_observed_error()
+            }
+            print(f"📉 Streaming top-k: concept counts within ±{concept_counts.error_bound():.1f}, "
+                  f"entity counts within ±{entity_counts.error_bound():.1f}")
+        
+        print(f"📝 Extracted {len(concepts)} concepts and {len(entities)} entities")
+        return concepts, entities
+    
+    def _candidate_nodes(
+        self,
+        concept_counts: Any,
+        entity_counts: Any,
+        concept_sources: Dict[str, List[Dict[str, str]]],
+        entity_sources: Dict[str, List[Dict[str, str]]],
+        source_count: int
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Turn the most frequent concepts and entities into graph node dictionaries.
+        
+        Args:
+            concept_counts: Exact or streaming concept counter.
+            entity_counts: Exact or streaming entity counter.
+            concept_sources: Source references of each concept.
+            entity_sources: Source references of each entity.
+            source_count: Number of sources, which importance is relative to.
+            
+        Returns:
+            Tuple of the top 500 concept and top 300 entity node dictionaries.
+        """
+        concepts = []
+        entities = []
         
         # Convert to graph nodes with frequency-based importance and source references
-        for concept, count in concept_counts.most_common(500):  # Limit to top 500
+        for concept, count in _most_common(concept_counts, 500):  # Limit to top 500
             concepts.append({
-                'id': f"concept_{hashlib.md5(concept.encode()).hexdigest()[:8]}",
                 'label': concept,
                 'type': 'concept',
                 'frequency': count,
-                'importance': min(count / len(sources), 1.0),
-                'source_references': list({
+                'importance': min(count / source_count, 1.0),
+                'source_references': list(dict.fromkeys(
                     f"{ref['title']} ({ref['type']})" for ref in concept_sources[concept]
-                })[:5]  # Limit to top 5 source references
+                ))[:5],  # Limit to top 5 source references
+                'aliases': self._concept_aliases(concept)
             })
         
-        for entity, count in entity_counts.most_common(300):  # Limit to top 300
+        for entity, count in _most_common(entity_counts, 300):  # Limit to top 300
             entities.append({
-                'id': f"entity_{hashlib.md5(entity.encode()).hexdigest()[:8]}",
                 'label': entity,
                 'type': 'entity',
                 'frequency': count,
-                'importance': min(count / len(sources), 1.0),
-                'source_references': list({
+                'importance': min(count / source_count, 1.0),
+                'source_references': list(dict.fromkeys(
                     f"{ref['title']} ({ref['type']})" for ref in entity_sources[entity]
-                })[:5]  # Limit to top 5 source references
+                ))[:5]  # Limit to top 5 source references
             })
         
-        print(f"📝 Extracted {len(concepts)} concepts and {len(entities)} entities")
         return concepts, entities
     
-    def _extract_text_concepts(self, text: str) -> List[str]:
-        """Extract key concepts from text using NLP."""
+    def _concept_aliases(self, concept: str) -> List[str]:
+        """Return the surface variants merged into a canonical concept label."""
+        if self.canonicalizer is None:
+            return []
+        return self.canonicalizer.aliases(concept)
+    
+    def _label_spellings(self, node_id: int) -> List[str]:
+        """Return the recorded surface forms a concept node is matched by besides its label."""
+        if self.canonicalizer is None or self.nodes.node_type(node_id) != 'concept':
+            return []
+        return self.canonicalizer.spellings(self.nodes.labels[node_id])
+    
+    def _label_matcher(self, node_ids: List[int]) -> LabelMatcher:
+        """Compile the lowercased labels of nodes, and their alias spellings, into one matcher.
+        
+        Concepts are counted under their canonical label, which need not occur
+        in the text ("matrices" is counted as "matrix"), so every recorded
+        surface form is matched as well.
+        
+        Args:
+            node_ids: Node IDs in the matcher's label-index order.
+            
+        Returns:
+            Matcher configured with the co-occurrence word-boundary setting.
+        """
+        spellings = {}
+        for index, node_id in enumerate(node_ids):
+            extra = self._label_spellings(node_id)
+            if extra:
+                spellings[index] = extra
+        return LabelMatcher(
+            [self.nodes.labels[node_id].lower() for node_id in node_ids],
+            word_boundaries=self.build_config.cooccurrence_word_boundaries,
+            spellings=spellings
+        )
+    
+    def _heavy_hitter_capacity(self, limit: int) -> int:
+        """Number of Space-Saving counters for a top-limit query under the configured error bound.
+        
+        Args:
+            limit: Number of items that will be retained.
+            
+        Returns:
+            Counter capacity of at least twice the retained count.
+        """
+        return max(2 * limit, int(np.ceil(1.0 / self.build_config.streaming_topk_error)))
+    
+    def _count_per_source_extractions(
+        self,
+        sources: List[Dict[str, Any]],
+        concept_counts: Counter,
+        entity_counts: Counter,
+        concept_sources: Dict[str, List[Dict[str, str]]],
+        entity_sources: Dict[str, List[Dict[str, str]]]
+    ) -> None:
+        """Run per-source extraction (cached, serial or parallel) and accumulate counts.
+        
+        Args:
+            sources: List of source documents to process.
+            concept_counts: Counter updated with the number of sources mentioning each concept.
+            entity_counts: Counter updated with the number of sources mentioning each entity.
+            concept_sources: Updated with the source references of each concept.
+            entity_sources: Updated with the source references of each entity.
+        """
+        # Merge in source order so counts and tie-breaking match the serial path
+        for i, (text_concepts, text_entities, aliases) in enumerate(self._extract_per_source(sources)):
+            if self.incremental_state is not None:
+                self.incremental_state.items[i] = (text_concepts, text_entities)
+                self.incremental_state.aliases[i] = aliases
+            source_title, url, source_type = _source_reference(i, sources[i])
+            reference = {'title': source_title, 'url': url, 'type': source_type}
+            _record_occurrences(text_concepts, reference, concept_counts, concept_sources)
+            _record_occurrences(text_entities, reference, entity_counts, entity_sources)
+    
+    def _extract_per_source(self, sources: List[Dict[str, Any]]) -> List[Tuple[List[str], List[str], List[str]]]:
+        """Run per-source extraction (cached, serial or parallel) and canonicalize concepts.
+        
+        Args:
+            sources: List of source documents to process.
+            
+        Returns:
+            ``(concepts, entities, aliases)`` of each source, in source order,
+            where aliases are the concept surface forms merged into canonical labels.
+        """
+        # Reuse cached results for sources whose content was already processed
+        cache_keys: List[str] = []
+        cached_results: Dict[str, Tuple[List[str], List[str]]] = {}
+        if self.extraction_cache is not None:
+            signature = self._extraction_signature()
+            cache_keys = [
+                ExtractionCache.make_key(source.get('content', ''), source.get('title', ''), signature)
+                for source in sources
+            ]
+            cached_results = self.extraction_cache.get_many(cache_keys)
+            print(f"💾 Extraction cache: {len(cached_results)} hits, {len(sources) - len(cached_results)} misses")
+        
+        pending = [i for i in range(len(sources)) if not cache_keys or cache_keys[i] not in cached_results]
+        workers = self.build_config.extraction_workers
+        if workers > 1 and len(pending) > 1:
+            extracted = self._extract_sources_parallel(sources, pending, workers)
+        else:
+            extracted = self._extract_sources_serial(sources, pending)
+        
+        if self.extraction_cache is not None and pending:
+            self.extraction_cache.put_many({cache_keys[i]: extracted[i] for i in pending})
+        
+        results = []
+        for i in range(len(sources)):
+            if i in extracted:
+                text_concepts, text_entities = extracted[i]
+            else:
+                text_concepts, text_entities = cached_results[cache_keys[i]]
+            
+            aliases = []
+            if self.canonicalizer is not None:
+                aliases = self.canonicalizer.surface_forms(text_concepts)
+                text_concepts = self.canonicalizer.canonicalize_all(text_concepts)
+            results.append((text_concepts, text_entities, aliases))
+        return results
+    
+    def _use_vectorized_fallback(self) -> bool:
+        """Return True if concepts should come from corpus-level n-gram counting."""
+        return not NLTK_AVAILABLE and SCIPY_AVAILABLE and self.build_config.vectorized_fallback
+    
+    def _extract_concepts_vectorized(self, sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Extract fallback concepts for the whole corpus with sparse n-gram counting.
+        
+        Produces the same candidates and source counts as running
+        ``_simple_concept_extraction`` on every source, but only builds label
+        strings for the retained top concepts. The source × n-gram membership
+        matrix is kept in ``self.concept_membership`` for the co-occurrence stage.
+        
+        Args:
+            sources: List of source documents to process.
+            
+        Returns:
+            Concept node dictionaries for the top 500 n-grams by source count.
+        """
+        self._update_progress(0.15, f"Counting n-grams across {len(sources)} sources")
+        membership = _vectorized_ngram_membership(
+            [source.get('content', '') + ' ' + source.get('title', '') for source in sources],
+            self.stopwords_set
+        )
+        
+        surface_membership = membership
+        merged_into = None
+        if self.canonicalizer is not None:
+            membership, merged_into = membership.canonicalized(self.canonicalizer)
+        
         concepts = []
+        label_columns = {}
+        membership_by_column = membership.matrix.tocsc()
+        for column in membership.top_columns(500):  # Limit to top 500
+            concept = membership.label(column)
+            count = int(membership.document_frequency[column])
+            source_indices = membership_by_column.indices[
+                membership_by_column.indptr[column]:membership_by_column.indptr[column + 1]
+            ]
+            references = [_source_reference(int(i), sources[int(i)]) for i in np.sort(source_indices)]
+            label_columns[concept] = int(column)
+            if merged_into is not None:
+                for surface_column in np.flatnonzero(merged_into == column).tolist():
+                    self.canonicalizer.record_alias(
+                        concept,
+                        surface_membership.label(surface_column),
+                        int(surface_membership.document_frequency[surface_column])
+                    )
+            concepts.append({
+                'label': concept,
+                'type': 'concept',
+                'frequency': count,
+                'importance': min(count / len(sources), 1.0),
+                'source_references': list(dict.fromkeys(
+                    f"{title} ({source_type})" for title, _, source_type in references
+                ))[:5],  # Limit to top 5 source references
+                'aliases': self._concept_aliases(concept)
+            })
         
-        if not text.strip():
-            return concepts
+        self.concept_membership = (membership, label_columns, surface_membership)
+        print(f"🧮 Vectorized fallback: {membership.matrix.shape[1]} distinct n-grams in {len(sources)} sources")
+        return concepts
+    
+    def _extract_sources_serial(
+        self,
+        sources: List[Dict[str, Any]],
+        pending: List[int]
+    ) -> Dict[int, Tuple[List[str], List[str]]]:
+        """Extract concepts and entities from selected sources on the current process.
+        
+        Args:
+            sources: List of source documents.
+            pending: Indices of the sources to process.
+            
+        Returns:
+            Mapping from source index to its ``(concepts, entities)``.
+        """
+        results = {}
+        for position, i in enumerate(pending):
+            progress = 0.1 + (position / len(pending)) * 0.2
+            self._update_progress(progress, f"Processing source {position+1}/{len(pending)}")
+            
+            content = sources[i].get('content', '')
+            title = sources[i].get('title', '')
+            
+            # Extract text concepts, and NLTK entities when there is no transformer pipeline
+            results[i] = _extract_source_features(
+                content, title, self.stopwords_set, extract_entities=self.ner_pipeline is None
+            )
         
-        # Clean and tokenize text
-        text = re.sub(r'[^\w\s]', ' ', text.lower())
+        # Transformer NER runs as one batched stage over all pending sources
+        if self.ner_pipeline and pending:
+            batched_entities = self._extract_named_entities_batched(
+                [sources[i].get('content', '') for i in pending]
+            )
+            for i, text_entities in zip(pending, batched_entities):
+                results[i] = (results[i][0], text_entities)
         
-        if NLTK_AVAILABLE:
-            try:
-                # Use NLTK for better tokenization and POS tagging
-                tokens = word_tokenize(text)
-                pos_tags = pos_tag(tokens)
+        return results
+    
+    def _extract_sources_parallel(
+        self,
+        sources: List[Dict[str, Any]],
+        pending: List[int],
+        workers: int
+    ) -> Dict[int, Tuple[List[str], List[str]]]:
+        """Extract concepts and entities by fanning sources out to a process pool.
+        
+        Sources are packed into size-balanced chunks (largest documents first) so
+        that a single huge document occupies its own chunk instead of stalling a
+        worker that still has a queue of small ones. Transformer NER cannot be
+        shipped to worker processes, so when the pipeline is loaded the parent
+        runs it while the workers handle concept extraction.
+        
+        Args:
+            sources: List of source documents.
+            pending: Indices of the sources to process.
+            workers: Number of worker processes.
+            
+        Returns:
+            Mapping from source index to its ``(concepts, entities)``.
+            Falls back to serial extraction if the pool cannot be used.
+        """
+        chunks = _size_balanced_chunks(
+            [len(sources[i].get('content', '')) + len(sources[i].get('title', '')) for i in pending],
+            workers * self.build_config.extraction_chunks_per_worker
+        )
+        workers_extract_entities = self.ner_pipeline is None
+        print(f"⚡ Parallel extraction: {len(pending)} sources in {len(chunks)} chunks across {workers} workers")
+        
+        results = {}
+        try:
+            _require_worker_processes()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _extract_source_chunk,
+                        [
+                            (
+                                pending[position],
+                                sources[pending[position]].get('content', ''),
+                                sources[pending[position]].get('title', ''),
+                                _source_reference(pending[position], sources[pending[position]])
+                            )
+                            for position in chunk
+                        ],
+                        self.stopwords_set,
+                        workers_extract_entities
+                    )
+                    for chunk in chunks
+                ]
                 
-                # Extract nouns and noun phrases as concepts
-                current_phrase = []
-                for word, pos in pos_tags:
-                    if pos.startswith('NN') and word not in self.stopwords_set and len(word) > 2:
-                        current_phrase.append(word)
-                    else:
-                        if current_phrase:
-                            phrase = ' '.join(current_phrase)
-                            if len(phrase.split()) <= 3:  # Limit phrase length
-                                concepts.append(phrase)
-                            current_phrase = []
+                # Run batched transformer NER in the parent while workers extract concepts
+                parent_entities = {}
+                if not workers_extract_entities:
+                    parent_entities = dict(zip(pending, self._extract_named_entities_batched(
+                        [sources[i].get('content', '') for i in pending]
+                    )))
                 
-                # Add final phrase if exists
-                if current_phrase:
-                    phrase = ' '.join(current_phrase)
-                    if len(phrase.split()) <= 3:
-                        concepts.append(phrase)
-                        
-            except Exception as e:
-                print(f"⚠️ NLTK processing failed: {e}")
-                # Fallback to simple extraction
-                concepts = self._simple_concept_extraction(text)
+                for future in as_completed(futures):
+                    for i, text_concepts, text_entities, _ in future.result():
+                        results[i] = (text_concepts, parent_entities.get(i, text_entities))
+                    progress = 0.1 + (len(results) / len(pending)) * 0.2
+                    self._update_progress(progress, f"Processing source {len(results)}/{len(pending)}")
+        except Exception as e:
+            print(f"⚠️ Parallel extraction failed: {e}")
+            print("🔄 Falling back to serial extraction")
+            return self._extract_sources_serial(sources, pending)
+        
+        return results
+    
+    def _extraction_signature(self) -> str:
+        """Describe the extractor configuration that determines per-source results.
+        
+        Cached extraction results are only reused when this signature matches, so
+        it includes the extraction code version, the NLP backends and model names,
+        and the options that change what is extracted.
+        
+        Returns:
+            Signature string mixed into extraction cache keys.
+        """
+        if NLTK_AVAILABLE:
+            concept_backend = f"nltk-{getattr(nltk, '__version__', 'unknown')}"
+        else:
+            concept_backend = "simple"
+        
+        if self.ner_pipeline:
+            model = getattr(self.ner_pipeline, 'model', None)
+            model_name = getattr(model, 'name_or_path', 'unknown')
+            entity_backend = (
+                f"transformers-{model_name}-{self.build_config.ner_window_tokens}"
+                f"-{self.build_config.ner_window_overlap}"
+            )
+        elif NLTK_AVAILABLE:
+            entity_backend = concept_backend
         else:
-            concepts = self._simple_concept_extraction(text)
+            entity_backend = "none"
         
-        return list(set(concepts))  # Remove duplicates
+        stopwords_digest = hashlib.sha256('\n'.join(sorted(self.stopwords_set)).encode()).hexdigest()[:16]
+        return f"v{EXTRACTION_CACHE_VERSION}|{concept_backend}|{entity_backend}|{stopwords_digest}"
+    
+    def _extract_text_concepts(self, text: str) -> List[str]:
+        """Extract key concepts from text using NLP."""
+        return _extract_text_concepts(text, self.stopwords_set)
     
     def _simple_concept_extraction(self, text: str) -> List[str]:
         """Simple concept extraction fallback."""
-        words = text.split()
-        concepts = []
-        
-        # Extract 1-3 word phrases that aren't stopwords
-        for i in range(len(words)):
-            for phrase_len in [1, 2, 3]:
-                if i + phrase_len <= len(words):
-                    phrase_words = words[i:i + phrase_len]
-                    if all(word not in self.stopwords_set and len(word) > 2 for word in phrase_words):
-                        concepts.append(' '.join(phrase_words))
-        
-        return concepts
+        return _simple_concept_extraction(text, self.stopwords_set)
     
     def _extract_named_entities(self, text: str) -> List[str]:
         """Extract named entities from text."""
@@ -547,153 +3973,851 @@ class KnowledgeGraphBuilder:
             return entities
         
         if self.ner_pipeline:
-            try:
-                # Use transformer-based NER
-                ner_results = self.ner_pipeline(text[:1000])  # Limit text length
-                for entity in ner_results:
-                    if entity['score'] > 0.9:  # High confidence only
-                        entities.append(entity['word'].strip('#'))
-            except Exception as e:
-                print(f"⚠️ NER pipeline failed: {e}")
+            # Use transformer-based NER
+            return self._extract_named_entities_batched([text])[0]
         
         elif NLTK_AVAILABLE:
-            try:
-                # Use NLTK NER as fallback
-                tokens = word_tokenize(text)
-                pos_tags = pos_tag(tokens)
-                chunks = ne_chunk(pos_tags)
-                
-                for chunk in chunks:
-                    if hasattr(chunk, 'label') and callable(getattr(chunk, 'label', None)):  # type: ignore
-                        entity = ' '.join([token for token, pos in chunk])
-                        entities.append(entity)
-            except Exception as e:
-                print(f"⚠️ NLTK NER failed: {e}")
+            return _extract_nltk_entities(text)
+        
+        return entities
+    
+    def _extract_named_entities_batched(self, texts: List[str]) -> List[List[str]]:
+        """Extract named entities from many documents with batched transformer NER.
+        
+        Every document is split into overlapping, token-bounded windows and all
+        windows are streamed through the pipeline in batches, so the model sees
+        full-size batches and entities are found regardless of where they occur
+        in a document. Entities are mapped back to the document their window
+        came from.
+        
+        Args:
+            texts: Document texts, one per source.
+            
+        Returns:
+            Per-document deduplicated lists of high-confidence entities.
+        """
+        entities: List[Set[str]] = [set() for _ in texts]
+        if not self.ner_pipeline:
+            return [[] for _ in texts]
+        
+        tokenizer = getattr(self.ner_pipeline, 'tokenizer', None)
+        window_texts = []
+        window_owners = []
+        for index, text in enumerate(texts):
+            if not text.strip():
+                continue
+            for window in _token_windows(
+                text,
+                tokenizer,
+                self.build_config.ner_window_tokens,
+                self.build_config.ner_window_overlap
+            ):
+                window_texts.append(window)
+                window_owners.append(index)
+        
+        if not window_texts:
+            return [[] for _ in texts]
+        
+        print(f"🏷️ Running batched NER on {len(window_texts)} windows from {len(texts)} sources")
+        try:
+            ner_results = self.ner_pipeline(window_texts, batch_size=self.build_config.ner_batch_size)
+            for owner, window_entities in zip(window_owners, ner_results):
+                for entity in window_entities:
+                    if entity['score'] > 0.9:  # High confidence only
+                        entities[owner].add(entity['word'].strip('#'))
+        except Exception as e:
+            print(f"⚠️ NER pipeline failed: {e}")
+        
+        return [sorted(document_entities) for document_entities in entities]
+    
+    def _build_graph_structure(
+        self, 
+        concepts: List[Dict[str, Any]], 
+        entities: List[Dict[str, Any]], 
+        sources: List[Dict[str, Any]]
+    ):
+        """Build the graph structure with nodes and edges."""
+        
+        # Intern nodes and add them to the graph
+        all_nodes = concepts + entities
+        node_ids = self.nodes.add_nodes(all_nodes)
+        
+        # Label index space for co-occurrence: distinct node IDs in insertion order
+        label_node_ids = list(dict.fromkeys(node_ids.tolist()))
+        
+        # Compile every label and alias spelling into one automaton so each source is scanned once
+        matcher = self._label_matcher(label_node_ids)
+        
+        # Count co-occurrences and keep pairs above the minimum threshold
+        min_weight = 2
+        state = self.incremental_state
+        if self.build_config.cooccurrence_window != 'document':
+            texts = [(source.get('content', '') + ' ' + source.get('title', '')).lower() for source in sources]
+            document_pairs = [self._document_window_pairs(text, matcher) for text in texts]
+            if state is not None:
+                label_array = np.asarray(label_node_ids, dtype=np.int64)
+                for i, pairs in enumerate(document_pairs):
+                    indices = np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+                    state.matches[i] = IncrementalState.pair_keys(label_array[indices[:, 0]], label_array[indices[:, 1]])
+            weighted_pairs = self._count_cooccurrence_windowed(document_pairs, min_weight)
+            self.graph = GraphStore(label_node_ids, *self._unzip_pairs(weighted_pairs))
+            print(f"🔗 Added {self.graph.number_of_edges()} weighted edges based on "
+                  f"{self.build_config.cooccurrence_window}-window co-occurrence")
+            return
+        
+        # Word-boundary matches of fallback n-gram concepts are already known from extraction
+        membership_rows = None
+        scan_indices = list(range(len(label_node_ids)))
+        if self.concept_membership is not None and self.build_config.cooccurrence_word_boundaries:
+            membership_rows, scan_indices = self._membership_incidence_rows(label_node_ids)
+            matcher = self._label_matcher([label_node_ids[index] for index in scan_indices])
+        
+        # Find which nodes appear in each source (as label indices, in node insertion order)
+        incidence_rows = []
+        for source_index, source in enumerate(sources):
+            content = (source.get('content', '') + ' ' + source.get('title', '')).lower()
+            found = {scan_indices[index] for index in matcher.find_labels(content)}
+            if membership_rows is not None:
+                found.update(membership_rows[source_index])
+            incidence_rows.append(sorted(found))
+            if state is not None:
+                state.matches[source_index] = np.asarray(
+                    [label_node_ids[index] for index in incidence_rows[-1]], dtype=np.int64
+                )
+        
+        if self.build_config.cooccurrence_backend == 'sparse' and SCIPY_AVAILABLE:
+            weighted_pairs = self._count_cooccurrence_sparse(incidence_rows, len(label_node_ids), min_weight)
+        else:
+            weighted_pairs = self._count_cooccurrence_dict(incidence_rows, min_weight)
+        
+        # Store the symmetric weighted adjacency (label indices are graph positions)
+        self.graph = GraphStore(label_node_ids, *self._unzip_pairs(weighted_pairs))
+        
+        print(f"🔗 Added {self.graph.number_of_edges()} weighted edges based on co-occurrence")
+    
+    def _membership_incidence_rows(
+        self,
+        label_node_ids: List[int]
+    ) -> Tuple[List[List[int]], List[int]]:
+        """Split labels into those answered by the n-gram membership matrix and those to scan.
+        
+        Fallback concepts are n-grams of the cleaned token stream, so their
+        per-source presence on word boundaries is exactly their membership
+        column. Only the remaining labels (entities) need a text scan.
+        
+        Args:
+            label_node_ids: Node IDs in label-index order.
+            
+        Returns:
+            Tuple of per-source label indices found via membership, and the label
+            indices that still have to be scanned for.
+        """
+        membership, label_columns, _ = self.concept_membership
+        
+        known_indices = []
+        known_columns = []
+        scan_indices = []
+        for index, node_id in enumerate(label_node_ids):
+            label = self.nodes.labels[node_id]
+            if self.nodes.node_type(node_id) == 'concept' and label in label_columns:
+                known_indices.append(index)
+                known_columns.append(label_columns[label])
+            else:
+                scan_indices.append(index)
+        
+        rows: List[List[int]] = [[] for _ in range(membership.matrix.shape[0])]
+        if known_columns:
+            known = membership.matrix[:, known_columns].tocsr()
+            known_index_array = np.asarray(known_indices)
+            for row in range(known.shape[0]):
+                rows[row] = known_index_array[known.indices[known.indptr[row]:known.indptr[row + 1]]].tolist()
+        return rows, scan_indices
+    
+    @staticmethod
+    def _unzip_pairs(weighted_pairs: List[Tuple[int, int, int]]) -> Tuple[Tuple, Tuple, Tuple]:
+        """Split ``(index1, index2, weight)`` tuples into rows, columns and weights."""
+        if not weighted_pairs:
+            return (), (), ()
+        rows, cols, weights = zip(*weighted_pairs)
+        return rows, cols, weights
+    
+    def _window_positions(self, text: str, starts: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Map match offsets to window coordinates for the configured window mode.
+        
+        Args:
+            text: Document text the offsets refer to.
+            starts: Character offsets of label matches.
+            
+        Returns:
+            Tuple of per-match positions and the window width: matches co-occur
+            when their positions differ by less than the width.
+        """
+        if self.build_config.cooccurrence_window == 'sentence':
+            sentence_ends = np.fromiter(
+                (match.end() for match in re.finditer(r'[.!?]+(?=\s|$)|\n+', text)),
+                dtype=np.int64
+            )
+            return np.searchsorted(sentence_ends, starts, side='right'), 1
+        
+        if self.build_config.cooccurrence_window == 'tokens':
+            token_starts = np.fromiter((match.start() for match in re.finditer(r'\w+', text)), dtype=np.int64)
+            positions = np.searchsorted(token_starts, starts, side='right')
+            return positions, max(1, self.build_config.cooccurrence_window_tokens)
+        
+        raise ValueError(f"Unknown co-occurrence window: {self.build_config.cooccurrence_window}")
+    
+    def _document_window_pairs(self, text: str, matcher: LabelMatcher) -> Set[Tuple[int, int]]:
+        """Return the label pairs that co-occur within a window somewhere in one document.
+        
+        The document's matches are sorted by window position and every match is
+        paired only with the matches that follow it inside the window, so the
+        cost is O(matches × window) rather than O(labels²).
+        
+        Args:
+            text: Lowercased document text.
+            matcher: Matcher over the lowercased node labels.
+            
+        Returns:
+            Set of ``(label_index1, label_index2)`` pairs with ``label_index1 < label_index2``.
+        """
+        document_pairs = set()
+        matches = matcher.find_label_positions(text)
+        if len(matches) < 2:
+            return document_pairs
+        
+        starts = np.fromiter((start for start, _ in matches), dtype=np.int64, count=len(matches))
+        labels = np.fromiter((index for _, index in matches), dtype=np.int64, count=len(matches))
+        positions, width = self._window_positions(text, starts)
+        order = np.lexsort((labels, positions))
+        positions = positions[order].tolist()
+        labels = labels[order].tolist()
+        
+        for first in range(len(labels)):
+            window_end = positions[first] + width
+            label1 = labels[first]
+            for second in range(first + 1, len(labels)):
+                if positions[second] >= window_end:
+                    break
+                label2 = labels[second]
+                if label1 != label2:
+                    document_pairs.add((label1, label2) if label1 < label2 else (label2, label1))
+        return document_pairs
+    
+    def _count_cooccurrence_windowed(
+        self,
+        document_pairs: List[Set[Tuple[int, int]]],
+        min_weight: int
+    ) -> List[Tuple[int, int, int]]:
+        """Count label co-occurrences within a sliding window over match positions.
+        
+        A pair is counted at most once per document, keeping edge weights
+        comparable to document-level counting.
+        
+        Args:
+            document_pairs: Per-document pairs from ``_document_window_pairs``.
+            min_weight: Minimum co-occurrence count for a pair to be kept.
+            
+        Returns:
+            List of ``(label_index1, label_index2, weight)`` tuples, with both directions
+            of every pair present.
+        """
+        pair_counts = Counter()
+        for pairs in document_pairs:
+            pair_counts.update(pairs)
+        
+        weighted_pairs = []
+        for (label1, label2), weight in pair_counts.items():
+            if weight >= min_weight:
+                weighted_pairs.append((label1, label2, weight))
+                weighted_pairs.append((label2, label1, weight))
+        weighted_pairs.sort()
+        return weighted_pairs
+    
+    def _count_cooccurrence_dict(
+        self,
+        incidence_rows: List[List[int]],
+        min_weight: int
+    ) -> List[Tuple[int, int, int]]:
+        """Count label co-occurrences with nested dictionaries.
+        
+        Args:
+            incidence_rows: Per-source lists of label indices that appear in the source.
+            min_weight: Minimum co-occurrence count for a pair to be kept.
+            
+        Returns:
+            List of ``(label_index1, label_index2, weight)`` tuples, with both directions
+            of every pair present.
+        """
+        cooccurrence = defaultdict(lambda: defaultdict(int))
+        
+        # Create edges between co-occurring nodes
+        for appearing_nodes in incidence_rows:
+            for i, node1 in enumerate(appearing_nodes):
+                for node2 in appearing_nodes[i+1:]:
+                    cooccurrence[node1][node2] += 1
+                    cooccurrence[node2][node1] += 1
+        
+        return [
+            (node1, node2, weight)
+            for node1, connections in cooccurrence.items()
+            for node2, weight in connections.items()
+            if weight >= min_weight  # Minimum co-occurrence threshold
+        ]
+    
+    def _count_cooccurrence_sparse(
+        self,
+        incidence_rows: List[List[int]],
+        label_count: int,
+        min_weight: int
+    ) -> List[Tuple[int, int, int]]:
+        """Count label co-occurrences as a sparse ``XᵀX`` product.
+        
+        Builds a binary source × label incidence matrix ``X`` in CSR form. Entry
+        ``(i, j)`` of ``XᵀX`` is then the number of sources containing both labels,
+        so the whole pair count runs inside scipy's sparse kernels.
+        
+        Args:
+            incidence_rows: Per-source lists of label indices that appear in the source.
+            label_count: Total number of labels (columns of the incidence matrix).
+            min_weight: Minimum co-occurrence count for a pair to be kept.
+            
+        Returns:
+            List of ``(label_index1, label_index2, weight)`` tuples, with both directions
+            of every pair present.
+        """
+        if label_count == 0 or not incidence_rows:
+            return []
+        
+        indptr = np.zeros(len(incidence_rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in incidence_rows])
+        indices = np.fromiter(
+            (index for row in incidence_rows for index in row),
+            dtype=np.int32,
+            count=int(indptr[-1])
+        )
+        incidence = csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, indptr),
+            shape=(len(incidence_rows), label_count)
+        )
+        
+        cooccurrence = (incidence.T @ incidence).tocoo()
+        
+        # Drop self-pairs and apply the threshold on the sparse result
+        keep = (cooccurrence.row != cooccurrence.col) & (cooccurrence.data >= min_weight)
+        rows = cooccurrence.row[keep]
+        cols = cooccurrence.col[keep]
+        weights = cooccurrence.data[keep]
+        
+        order = np.lexsort((cols, rows))
+        return list(zip(rows[order].tolist(), cols[order].tolist(), weights[order].tolist()))
+    
+    def _extract_backbone(self) -> None:
+        """Replace the graph by its disparity-filter backbone, if enabled."""
+        alpha = self.build_config.backbone_alpha
+        if alpha <= 0:
+            self.backbone_stats = {'enabled': False}
+            return
         
-        return list(set(entities))  # Remove duplicates
+        edge_count = self.graph.number_of_edges()
+        self.graph = self.graph.disparity_filter(alpha)
+        retained = self.graph.number_of_edges()
+        print(f"🦴 Backbone (alpha={alpha}) kept {retained} of {edge_count} edges")
+        self.backbone_stats = {
+            'enabled': True,
+            'alpha': alpha,
+            'retained_edges': retained,
+            'removed_edges': edge_count - retained,
+            'isolated_nodes': int((self.graph.degrees() == 0).sum())
+        }
     
-    def _build_graph_structure(
-        self, 
-        concepts: List[Dict[str, Any]], 
-        entities: List[Dict[str, Any]], 
-        sources: List[Dict[str, Any]]
-    ):
-        """Build the graph structure with nodes and edges."""
+    def _prune_graph(self) -> None:
+        """Restrict centrality and MST analysis to the k-core of the graph, if enabled."""
+        self.core_graph = self.graph
+        self.pruned_nodes = set()
+        core_k = self.build_config.prune_core_k
+        if core_k <= 0 or self.graph.number_of_nodes() == 0:
+            self.pruning_stats = {'enabled': False}
+            return
         
-        # Add nodes to graph
-        all_nodes = concepts + entities
-        for node in all_nodes:
-            self.graph.add_node(
-                node['id'], 
-                label=node['label'],
-                type=node['type'],
-                frequency=node['frequency'],
-                importance=node['importance'],
-                source_references=node.get('source_references', [])
-            )
+        in_core = self.graph.k_core_mask(core_k)
+        if not in_core.any():
+            print(f"⚠️ {core_k}-core is empty - analysing the full graph")
+            self.pruning_stats = {'enabled': True, 'k': core_k, 'core_nodes': 0, 'pruned_nodes': 0, 'applied': False}
+            return
         
-        # Create co-occurrence matrix for edge weights
-        node_labels = {node['id']: node['label'] for node in all_nodes}
-        cooccurrence = defaultdict(lambda: defaultdict(int))
+        if not in_core.all():
+            self.core_graph = self.graph.subgraph(in_core)
+            self.pruned_nodes = set(self.graph.node_ids[~in_core].tolist())
+        
+        print(f"✂️ Pruned {len(self.pruned_nodes)} nodes outside the {core_k}-core; "
+              f"{self.core_graph.number_of_nodes()} core nodes remain for centrality and MST")
+        self.pruning_stats = {
+            'enabled': True,
+            'k': core_k,
+            'core_nodes': self.core_graph.number_of_nodes(),
+            'pruned_nodes': len(self.pruned_nodes),
+            'applied': True
+        }
+    
+    def _score_pruned_nodes(self) -> None:
+        """Give pruned nodes cheap centrality scores derived from their core neighbours.
+        
+        - PageRank: core scores are first rescaled by ``n_core/n``, since they
+          were normalized over the core alone. Pruned nodes then get one
+          propagation step, ``t + α Σ PR(u)·w/W(u)``, where the base rank ``t``
+          solves ``t = (1 - α)/n + α·m·t/n`` for the ``m`` isolated nodes that
+          redistribute their rank uniformly, and the vector is renormalized to
+          sum to 1.
+        - Eigenvector: ``Σ w·x(u) / λ``, with λ the core's Rayleigh quotient.
+        - Betweenness: 0, which is exact for leaves and isolated nodes.
+        - Closeness/harmonic: the best core neighbour's score extended by one
+          hop of the connecting edge's length.
+        Nodes without core neighbours get the base PageRank and zero otherwise.
+        """
+        if not self.pruned_nodes or not self.centrality_scores:
+            return
         
-        # Calculate co-occurrence in sources
-        for source in sources:
-            content = (source.get('content', '') + ' ' + source.get('title', '')).lower()
+        alpha = 0.85
+        graph = self.graph
+        node_ids = graph.nodes()
+        node_count = len(node_ids)
+        weighted_degree = graph.weighted_degrees()
+        isolated_count = int((graph.degrees() == 0).sum())
+        base_rank = (1 - alpha) / node_count / (1 - alpha * isolated_count / node_count)
+        pagerank = self.centrality_scores['pagerank']
+        eigenvector = self.centrality_scores['eigenvector']
+        closeness = self.centrality_scores['closeness']
+        harmonic = self.centrality_diagnostics.get('closeness', {}).get('measure') == 'harmonic'
+        core_ids = self.core_graph.nodes()
+        
+        # Core PageRank sums to 1 over the core; put it on the full graph's scale
+        core_share = len(core_ids) / node_count
+        for node_id in core_ids:
+            pagerank[node_id] = pagerank.get(node_id, 0.0) * core_share
+        
+        # Leading eigenvalue of the core adjacency, for the eigenvector equation λx = Ax
+        core_vector = np.array([eigenvector.get(node_id, 0.0) for node_id in core_ids])
+        core_norm = float(core_vector @ core_vector)
+        eigenvalue = float(core_vector @ self.core_graph.matvec(core_vector)) / core_norm if core_norm > 0 else 0.0
+        
+        for position, node_id in enumerate(node_ids):
+            if node_id not in self.pruned_nodes:
+                continue
             
-            # Find which nodes appear in this source
-            appearing_nodes = []
-            for node_id, label in node_labels.items():
-                if label.lower() in content:
-                    appearing_nodes.append(node_id)
+            pagerank_score = base_rank
+            eigenvector_sum = 0.0
+            closeness_score = 0.0
+            for entry in range(graph.indptr[position], graph.indptr[position + 1]):
+                neighbor_position = graph.indices[entry]
+                neighbor = node_ids[neighbor_position]
+                if neighbor in self.pruned_nodes:
+                    continue
+                weight = float(graph.weights[entry])
+                pagerank_score += alpha * pagerank.get(neighbor, 0.0) * weight / weighted_degree[neighbor_position]
+                eigenvector_sum += weight * eigenvector.get(neighbor, 0.0)
+                
+                neighbor_closeness = closeness.get(neighbor, 0.0)
+                if neighbor_closeness > 0:
+                    if harmonic:
+                        # Every reachable node is one more hop of length `weight` away
+                        reach = self.core_graph.number_of_nodes() - 1
+                        extended = 1.0 / weight + reach / (weight + reach / neighbor_closeness)
+                    else:
+                        extended = 1.0 / (weight + 1.0 / neighbor_closeness)
+                    closeness_score = max(closeness_score, extended)
             
-            # Create edges between co-occurring nodes
-            for i, node1 in enumerate(appearing_nodes):
-                for node2 in appearing_nodes[i+1:]:
-                    cooccurrence[node1][node2] += 1
-                    cooccurrence[node2][node1] += 1
-        
-        # Add edges to graph with weights
-        edge_count = 0
-        for node1, connections in cooccurrence.items():
-            for node2, weight in connections.items():
-                if weight >= 2:  # Minimum co-occurrence threshold
-                    self.graph.add_edge(node1, node2, weight=weight)
-                    edge_count += 1
+            pagerank[node_id] = pagerank_score
+            eigenvector[node_id] = eigenvector_sum / eigenvalue if eigenvalue > 0 else 0.0
+            self.centrality_scores['betweenness'][node_id] = 0.0
+            closeness[node_id] = closeness_score
+        
+        # A single propagation step does not conserve rank exactly
+        total_rank = sum(pagerank.values())
+        if total_rank > 0:
+            for node_id in pagerank:
+                pagerank[node_id] /= total_rank
+    
+    def _detect_communities(self) -> None:
+        """Assign every node of the full graph to a community by label propagation, if enabled."""
+        self.communities = {}
+        if not self.build_config.detect_communities or self.graph.number_of_nodes() == 0:
+            self.community_stats = {'enabled': False}
+            return
         
-        print(f"🔗 Added {edge_count} weighted edges based on co-occurrence")
+        print(f"🧩 Detecting communities in {self.graph.number_of_nodes()} nodes...")
+        step_start = datetime.now()
+        labels, rounds = self.graph.label_propagation(self.build_config.community_max_iterations)
+        self.communities = dict(zip(self.graph.nodes(), labels.tolist()))
+        
+        sizes = np.bincount(labels)
+        self.community_stats = {
+            'enabled': True,
+            'method': 'label_propagation',
+            'count': len(sizes),
+            'largest': int(sizes[0]),
+            'singletons': int((sizes == 1).sum()),
+            'modularity': self.graph.modularity(labels),
+            'rounds': rounds,
+            'elapsed_seconds': (datetime.now() - step_start).total_seconds()
+        }
+        print(f"✅ Found {len(sizes)} communities in {rounds} rounds "
+              f"(largest: {sizes[0]} nodes, modularity: {self.community_stats['modularity']:.3f})")
     
     def _calculate_centrality_metrics(self):
         """Calculate various centrality metrics for graph analysis."""
         print("📊 Calculating centrality metrics...")
         
-        if self.graph.number_of_nodes() == 0:
+        if self.core_graph.number_of_nodes() == 0:
             print("⚠️ Empty graph - skipping centrality calculations")
             return
         
-        try:
-            # PageRank (most important for finding core concepts)
-            self.centrality_scores['pagerank'] = nx.pagerank(
-                self.graph, 
-                weight='weight',
-                max_iter=100,
-                tol=1e-6
-            )
-            
-            # Eigenvector centrality (influence in network)
+        # One networkx view serves every metric instead of repeated graph copies
+        graph = self.core_graph.to_networkx()
+        
+        workers = self.build_config.centrality_workers
+        if workers > 1 and SCIPY_AVAILABLE:
             try:
-                self.centrality_scores['eigenvector'] = nx.eigenvector_centrality(
-                    self.graph,
-                    weight='weight',
-                    max_iter=1000,
-                    tol=1e-6
-                )
-            except nx.PowerIterationFailedConvergence:
-                print("⚠️ Eigenvector centrality failed - using degree centrality")
-                self.centrality_scores['eigenvector'] = nx.degree_centrality(self.graph)
+                self._calculate_centrality_parallel(graph, workers)
+                print("✅ Centrality metrics calculated successfully")
+                return
+            except Exception as e:
+                print(f"⚠️ Parallel centrality failed ({e}) - computing in a single process")
+        
+        try:
+            # PageRank (most important for finding core concepts) and eigenvector centrality (influence in network)
+            if self.build_config.centrality_backend == 'sparse' and SCIPY_AVAILABLE:
+                self._calculate_spectral_centrality_sparse(graph)
+            else:
+                self._calculate_spectral_centrality_networkx(graph)
             
             # Betweenness centrality (bridges between concepts)
+            self._calculate_betweenness_centrality(graph)
+            
+            # Closeness centrality (accessibility to other concepts)
+            self._calculate_closeness_centrality(graph)
+            
+            print("✅ Centrality metrics calculated successfully")
+            
+        except Exception as e:
+            print(f"❌ Centrality calculation failed: {e}")
+            # Fallback to degree centrality
+            self.centrality_scores['pagerank'] = nx.degree_centrality(graph)
+            self.centrality_scores['eigenvector'] = nx.degree_centrality(graph)
+            self.centrality_scores['betweenness'] = nx.degree_centrality(graph)
+            self.centrality_scores['closeness'] = nx.degree_centrality(graph)
+    
+    def _calculate_spectral_centrality_sparse(
+        self,
+        graph: nx.Graph,
+        warm_start: Optional[Dict[str, Dict[int, float]]] = None
+    ) -> None:
+        """Compute PageRank and eigenvector centrality on the CSR adjacency.
+        
+        Args:
+            graph: networkx view of the graph, used only for the degree fallback.
+            warm_start: Previous centrality scores to start both iterations from.
+        """
+        adjacency = self.core_graph.to_scipy()
+        node_ids = self.core_graph.nodes()
+        
+        pagerank, diagnostics = _sparse_pagerank(
+            adjacency, max_iter=100, tol=1e-6, initial=self._warm_start_vector(warm_start, 'pagerank', node_ids)
+        )
+        self.centrality_diagnostics['pagerank'] = diagnostics
+        if not diagnostics['converged']:
+            print(f"⚠️ PageRank did not converge in {diagnostics['iterations']} iterations "
+                  f"(residual {diagnostics['residual']:.2e}) - using last iterate")
+        self.centrality_scores['pagerank'] = dict(zip(node_ids, pagerank.tolist()))
+        
+        eigenvector, diagnostics = _sparse_eigenvector_centrality(
+            adjacency, max_iter=1000, tol=1e-6, initial=self._warm_start_vector(warm_start, 'eigenvector', node_ids)
+        )
+        if eigenvector is None:
+            print("⚠️ Eigenvector centrality failed - using degree centrality")
+            diagnostics = dict(diagnostics, method='degree_fallback')
+            self.centrality_scores['eigenvector'] = nx.degree_centrality(graph)
+        else:
+            if diagnostics['method'] == 'arpack':
+                print("🔄 Eigenvector power iteration did not converge - solved with ARPACK")
+            self.centrality_scores['eigenvector'] = dict(zip(node_ids, eigenvector.tolist()))
+        self.centrality_diagnostics['eigenvector'] = diagnostics
+    
+    def _calculate_spectral_centrality_networkx(
+        self,
+        graph: nx.Graph,
+        warm_start: Optional[Dict[str, Dict[int, float]]] = None
+    ) -> None:
+        """Compute PageRank and eigenvector centrality with networkx.
+        
+        Args:
+            graph: networkx view of the graph.
+            warm_start: Previous centrality scores to start both iterations from.
+        """
+        node_ids = list(graph.nodes())
+        pagerank_start = self._warm_start_vector(warm_start, 'pagerank', node_ids)
+        eigenvector_start = self._warm_start_vector(warm_start, 'eigenvector', node_ids)
+        self.centrality_scores['pagerank'] = nx.pagerank(
+            graph, 
+            weight='weight',
+            max_iter=100,
+            tol=1e-6,
+            nstart=dict(zip(node_ids, pagerank_start.tolist())) if pagerank_start is not None else None
+        )
+        self.centrality_diagnostics['pagerank'] = {'method': 'networkx', 'converged': True}
+        
+        try:
+            self.centrality_scores['eigenvector'] = nx.eigenvector_centrality(
+                graph,
+                weight='weight',
+                max_iter=1000,
+                tol=1e-6,
+                nstart=dict(zip(node_ids, eigenvector_start.tolist())) if eigenvector_start is not None else None
+            )
+            self.centrality_diagnostics['eigenvector'] = {'method': 'networkx', 'converged': True}
+        except nx.PowerIterationFailedConvergence:
+            print("⚠️ Eigenvector centrality failed - using degree centrality")
+            self.centrality_scores['eigenvector'] = nx.degree_centrality(graph)
+            self.centrality_diagnostics['eigenvector'] = {'method': 'degree_fallback', 'converged': False}
+    
+    @staticmethod
+    def _warm_start_vector(
+        warm_start: Optional[Dict[str, Dict[int, float]]],
+        metric: str,
+        node_ids: List[int]
+    ) -> Optional[np.ndarray]:
+        """Return previous scores of ``metric`` over ``node_ids`` as a starting vector.
+        
+        Nodes without a previous score start at the mean of the known ones.
+        
+        Returns:
+            Starting vector, or None if there are no usable previous scores.
+        """
+        previous = (warm_start or {}).get(metric)
+        if not previous or not node_ids:
+            return None
+        known = [previous[node_id] for node_id in node_ids if node_id in previous]
+        if not known or sum(known) <= 0:
+            return None
+        fill = sum(known) / len(known)
+        return np.array([previous.get(node_id, fill) for node_id in node_ids], dtype=np.float64)
+    
+    def _calculate_betweenness_centrality(self, graph: nx.Graph) -> None:
+        """Compute betweenness exactly on small graphs and by pivot sampling on large ones.
+        
+        Args:
+            graph: networkx view of the graph.
+        """
+        node_count = graph.number_of_nodes()
+        pivots = self._betweenness_sample_size(node_count)
+        self.centrality_diagnostics['betweenness'] = self._betweenness_diagnostics(pivots, node_count)
+        
+        if pivots >= node_count:
             self.centrality_scores['betweenness'] = nx.betweenness_centrality(
-                self.graph,
+                graph,
                 weight='weight',
                 normalized=True
             )
-            
-            # Closeness centrality (accessibility to other concepts)
-            if nx.is_connected(self.graph.to_undirected()):
-                self.centrality_scores['closeness'] = nx.closeness_centrality(
-                    self.graph,
+            return
+        
+        # A fixed seed keeps repeated builds of the same graph identical
+        self.centrality_scores['betweenness'] = nx.betweenness_centrality(
+            graph,
+            k=pivots,
+            weight='weight',
+            normalized=True,
+            seed=42
+        )
+    
+    def _betweenness_sample_size(self, node_count: int) -> int:
+        """Return the number of betweenness pivots; ``node_count`` means exact computation."""
+        config = self.build_config
+        if node_count <= config.betweenness_exact_max_nodes:
+            return node_count
+        return _betweenness_pivot_count(node_count, config.betweenness_error, config.betweenness_confidence)
+    
+    def _betweenness_diagnostics(self, pivots: int, node_count: int) -> Dict[str, Any]:
+        """Describe how betweenness was computed, announcing sampling when used."""
+        config = self.build_config
+        if pivots >= node_count:
+            return {'method': 'exact', 'k': node_count}
+        
+        print(f"🎲 Estimating betweenness from {pivots} of {node_count} pivot sources "
+              f"(error ≤ {config.betweenness_error} with probability {config.betweenness_confidence})")
+        return {
+            'method': 'sampled',
+            'k': pivots,
+            'error_bound': config.betweenness_error,
+            'confidence': config.betweenness_confidence
+        }
+    
+    def _calculate_closeness_centrality(self, graph: nx.Graph) -> None:
+        """Compute closeness, or harmonic centrality on disconnected graphs, exactly or by sampling.
+        
+        Args:
+            graph: networkx view of the graph.
+        """
+        node_count = self.core_graph.number_of_nodes()
+        # Cached component labelling decides the measure without copying the graph
+        harmonic = self.core_graph.number_connected_components() != 1
+        sample_size = self._closeness_sample_size(node_count)
+        self.centrality_diagnostics['closeness'] = self._closeness_diagnostics(sample_size, node_count, harmonic)
+        
+        if sample_size >= node_count:
+            if harmonic:
+                # For disconnected graphs, use harmonic centrality
+                self.centrality_scores['closeness'] = nx.harmonic_centrality(
+                    graph,
                     distance='weight'
                 )
             else:
-                # For disconnected graphs, use harmonic centrality
-                self.centrality_scores['closeness'] = nx.harmonic_centrality(
-                    self.graph,
+                self.centrality_scores['closeness'] = nx.closeness_centrality(
+                    graph,
                     distance='weight'
                 )
-            
-            print("✅ Centrality metrics calculated successfully")
-            
-        except Exception as e:
-            print(f"❌ Centrality calculation failed: {e}")
-            # Fallback to degree centrality
-            self.centrality_scores['pagerank'] = nx.degree_centrality(self.graph)
-            self.centrality_scores['eigenvector'] = nx.degree_centrality(self.graph)
-            self.centrality_scores['betweenness'] = nx.degree_centrality(self.graph)
-            self.centrality_scores['closeness'] = nx.degree_centrality(self.graph)
-    
-    def _find_minimal_subgraph(self):
-        """Find minimal subgraph using Minimum Spanning Tree algorithm for cyclical graphs."""
-        if not self.centrality_scores or self.graph.number_of_nodes() == 0:
+            return
+        
+        estimates = _sampled_closeness(self.core_graph.to_scipy(), sample_size, harmonic)
+        self.centrality_scores['closeness'] = dict(zip(self.core_graph.nodes(), estimates.tolist()))
+    
+    def _closeness_sample_size(self, node_count: int) -> int:
+        """Return the number of closeness sources; ``node_count`` means exact computation."""
+        if node_count <= self.build_config.closeness_exact_max_nodes or not SCIPY_AVAILABLE:
+            return node_count
+        return min(node_count, math.ceil(math.log(node_count) / self.build_config.closeness_error ** 2))
+    
+    def _closeness_diagnostics(self, sample_size: int, node_count: int, harmonic: bool) -> Dict[str, Any]:
+        """Describe how closeness was computed, announcing sampling when used."""
+        measure = 'harmonic' if harmonic else 'closeness'
+        if sample_size >= node_count:
+            return {'method': 'exact', 'measure': measure, 'k': node_count}
+        
+        print(f"🎲 Estimating {measure} centrality from {sample_size} of {node_count} sampled sources")
+        return {
+            'method': 'sampled',
+            'measure': measure,
+            'k': sample_size,
+            'error_bound': self.build_config.closeness_error
+        }
+    
+    def _calculate_centrality_parallel(self, graph: nx.Graph, workers: int) -> None:
+        """Run all centrality metrics as independent tasks on a process pool.
+        
+        The CSR adjacency is placed in shared memory once. PageRank and
+        eigenvector centrality form one task, and the betweenness and closeness
+        sources are split into chunks that each become a task. Partial sums
+        are reduced here, in the parent.
+        
+        Args:
+            graph: networkx view of the graph, used only for the degree fallback.
+            workers: Number of worker processes.
+        """
+        _require_worker_processes()
+        node_ids = self.core_graph.nodes()
+        node_count = len(node_ids)
+        chunk_count = workers * 4
+        
+        pivots = self._betweenness_sample_size(node_count)
+        self.centrality_diagnostics['betweenness'] = self._betweenness_diagnostics(pivots, node_count)
+        betweenness_sources = None
+        if pivots < node_count:
+            # Same pivots as networkx picks for seed=42, so results match the single-process path
+            positions = {node_id: position for position, node_id in enumerate(node_ids)}
+            betweenness_sources = [positions[node_id] for node_id in random.Random(42).sample(node_ids, pivots)]
+        
+        harmonic = self.core_graph.number_connected_components() != 1
+        closeness_size = self._closeness_sample_size(node_count)
+        self.centrality_diagnostics['closeness'] = self._closeness_diagnostics(closeness_size, node_count, harmonic)
+        closeness_sources = _closeness_sources(node_count, closeness_size)
+        
+        betweenness_totals = np.zeros(node_count)
+        closeness_totals = np.zeros(node_count)
+        spectral = None
+        
+        print(f"⚡ Computing centrality on {workers} processes")
+        with SharedCSRGraph(self.core_graph.to_scipy()) as shared:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_centrality_task, shared.descriptor, 'spectral', None)]
+                for chunk in np.array_split(np.array(betweenness_sources if betweenness_sources is not None else range(node_count)), chunk_count):
+                    if len(chunk):
+                        futures.append(executor.submit(_centrality_task, shared.descriptor, 'betweenness', chunk.tolist()))
+                for chunk in np.array_split(closeness_sources, chunk_count):
+                    if len(chunk):
+                        futures.append(executor.submit(_centrality_task, shared.descriptor, 'closeness', (chunk, harmonic)))
+                
+                for future in as_completed(futures):
+                    task, result = future.result()
+                    if task == 'spectral':
+                        spectral = result
+                    elif task == 'betweenness':
+                        betweenness_totals += result
+                    else:
+                        closeness_totals += result
+        
+        pagerank, pagerank_diagnostics, eigenvector, eigenvector_diagnostics = spectral
+        self.centrality_scores['pagerank'] = dict(zip(node_ids, pagerank.tolist()))
+        self.centrality_diagnostics['pagerank'] = pagerank_diagnostics
+        if eigenvector is None:
+            print("⚠️ Eigenvector centrality failed - using degree centrality")
+            self.centrality_scores['eigenvector'] = nx.degree_centrality(graph)
+            eigenvector_diagnostics = dict(eigenvector_diagnostics, method='degree_fallback')
+        else:
+            self.centrality_scores['eigenvector'] = dict(zip(node_ids, eigenvector.tolist()))
+        self.centrality_diagnostics['eigenvector'] = eigenvector_diagnostics
+        
+        betweenness = _rescale_betweenness(betweenness_totals, betweenness_sources)
+        self.centrality_scores['betweenness'] = dict(zip(node_ids, betweenness.tolist()))
+        closeness = _closeness_from_sums(closeness_totals, closeness_size, harmonic)
+        self.centrality_scores['closeness'] = dict(zip(node_ids, closeness.tolist()))
+    
+    def _algorithm_labels(self) -> List[str]:
+        """Return the algorithm names reported in metadata, annotated with approximation details."""
+        betweenness = self.centrality_diagnostics.get('betweenness', {})
+        if betweenness.get('method') == 'sampled':
+            betweenness_label = f"betweenness (sampled, k={betweenness['k']})"
+        else:
+            betweenness_label = 'betweenness (exact)'
+        closeness = self.centrality_diagnostics.get('closeness', {})
+        if closeness.get('method') == 'sampled':
+            closeness_label = f"closeness (sampled, k={closeness['k']})"
+        else:
+            closeness_label = 'closeness'
+        if self._uses_steiner_tree():
+            subgraph_label = f"steiner_tree (k={self.build_config.steiner_terminals})"
+        else:
+            subgraph_label = 'hybrid_mst'
+        return ['pagerank', 'eigenvector', betweenness_label, closeness_label, subgraph_label, 'topic_relevance']
+    
+    def _uses_steiner_tree(self) -> bool:
+        """Return whether the minimal subgraph is built as a size-targeted Steiner tree."""
+        return self.build_config.minimal_subgraph_mode == 'steiner' and SCIPY_AVAILABLE
+    
+    def _find_minimal_subgraph(self, reusable: Optional[Set[int]] = None):
+        """Find minimal subgraph using Minimum Spanning Tree algorithm for cyclical graphs.
+        
+        In 'steiner' mode only the top-scoring nodes are connected, by an
+        approximate Steiner tree, instead of spanning every node.
+        
+        Args:
+            reusable: Nodes of components that are unchanged since the previous
+                minimal subgraph was built; their spanning trees are copied from
+                it instead of being recomputed. Not used in 'steiner' mode.
+        """
+        if not self.centrality_scores or self.core_graph.number_of_nodes() == 0:
             print("⚠️ No centrality scores available - skipping minimal subgraph")
             return
         
-        print(f"🎯 Finding minimal subgraph using MST for {self.graph.number_of_nodes()} nodes...")
+        steiner = self._uses_steiner_tree()
+        if self.build_config.minimal_subgraph_mode == 'steiner' and not steiner:
+            print("⚠️ Steiner tree mode requires scipy - spanning every node instead")
+        previous = self.minimal_subgraph if reusable and not steiner else None
+        
+        print(f"🎯 Finding minimal subgraph using {'Steiner tree' if steiner else 'MST'} for {self.core_graph.number_of_nodes()} nodes...")
         step_start = datetime.now()
         
         # Step 1: Combine centrality scores to create node importance weights
         print("   📊 Computing node importance scores...")
         combined_scores = {}
-        for node in self.graph.nodes():
+        for node in self.core_graph.nodes():
             # Weighted combination of centrality measures
             score = (
                 0.4 * self.centrality_scores['pagerank'].get(node, 0) +
@@ -704,132 +4828,62 @@ class KnowledgeGraphBuilder:
             combined_scores[node] = score
         print(f"   ✅ Computed importance scores for {len(combined_scores)} nodes")
         
-        # Step 2: Create undirected graph with reciprocal edge weights for MST
-        print("   🔄 Preparing graph for MST with reciprocal weights...")
-        
-        # Convert to undirected graph for MST
-        undirected_graph = self.graph.to_undirected()
-        
-        # Create new graph with reciprocal weights
-        # High importance edges (high weight) become low cost edges (preferred by MST)
-        mst_graph = nx.Graph()
-        for node in undirected_graph.nodes():
-            mst_graph.add_node(node, **undirected_graph.nodes[node])
-        
-        for u, v, data in undirected_graph.edges(data=True):
-            original_weight = data.get('weight', 1.0)
-            # Convert to reciprocal weight (high importance = low cost)
-            # Add small epsilon to avoid division by zero
-            reciprocal_weight = 1.0 / (original_weight + 1e-6)
-            mst_graph.add_edge(u, v, weight=reciprocal_weight, original_weight=original_weight)
-        
-        print(f"   ✅ Created MST graph with {mst_graph.number_of_nodes()} nodes, {mst_graph.number_of_edges()} edges")
-        
-        # Step 3: Handle connected vs disconnected graphs
-        print("   🔍 Analyzing graph connectivity...")
-        components = list(nx.connected_components(mst_graph))
-        print(f"   📊 Found {len(components)} connected component(s)")
-        
-        if len(components) == 1:
-            # Single connected component - standard MST
-            print("   🌲 Computing single Minimum Spanning Tree...")
-            mst_edges = nx.minimum_spanning_tree(mst_graph, weight='weight', algorithm='kruskal')
-            print(f"   ✅ MST computed with {mst_edges.number_of_nodes()} nodes, {mst_edges.number_of_edges()} edges")
+        try:
+            # Step 2: Tree over reciprocal weights, so high-weight edges are preferred
+            core = self.core_graph
+            component_count = core.number_connected_components()
+            print(f"   📊 Found {component_count} connected component(s)")
             
-        else:
-            # Multiple components - hybrid approach
-            print(f"   🔗 Multiple components detected - using hybrid MST approach...")
-            
-            # Step 3a: Create MST for each component
-            component_msts = []
-            for i, component in enumerate(components):
-                if len(component) > 1:  # Skip single-node components
-                    component_graph = mst_graph.subgraph(component)
-                    component_mst = nx.minimum_spanning_tree(component_graph, weight='weight', algorithm='kruskal')
-                    component_msts.append(component_mst)
-                    print(f"      🌲 Component {i+1}: MST with {component_mst.number_of_nodes()} nodes, {component_mst.number_of_edges()} edges")
-                else:
-                    # Single node component - create a graph with just that node
-                    single_node = list(component)[0]
-                    single_mst = nx.Graph()
-                    single_mst.add_node(single_node, **mst_graph.nodes[single_node])
-                    component_msts.append(single_mst)
-                    print(f"      🔸 Component {i+1}: Single node {single_node}")
-            
-            # Step 3b: Connect components using highest centrality nodes
-            print(f"   🔗 Connecting {len(component_msts)} components using degree centrality...")
-            
-            # Create combined graph from all MSTs
-            mst_edges = nx.Graph()
-            for component_mst in component_msts:
-                mst_edges = nx.union(mst_edges, component_mst)
-            
-            # Find highest degree centrality node in each component MST
-            component_connectors = []
-            for i, component_mst in enumerate(component_msts):
-                if component_mst.number_of_nodes() > 0:
-                    # Calculate degree centrality within this component
-                    centrality = nx.degree_centrality(component_mst)
-                    if centrality:
-                        best_node = max(centrality.items(), key=lambda x: x[1])[0]
-                        component_connectors.append((best_node, centrality[best_node], i))
-                        print(f"      🎯 Component {i+1} connector: {best_node} (centrality: {centrality[best_node]:.3f})")
-            
-            # Connect components by adding edges between connectors
-            # Use a minimum spanning tree approach on the connectors themselves
-            if len(component_connectors) > 1:
-                print(f"   🔗 Adding {len(component_connectors)-1} inter-component connections...")
+            if steiner:
+                nodes, tree_u, tree_v, tree_weights, connectors = self._steiner_tree(combined_scores)
+            else:
+                nodes = core.nodes()
+                reused_positions = np.zeros(core.number_of_nodes(), dtype=bool)
+                if previous is not None:
+                    reused_positions = np.isin(core.node_ids, np.fromiter(reusable, dtype=np.int64, count=len(reusable)))
+                print(f"   🌲 Computing minimum spanning forest over {int((~reused_positions).sum())} nodes...")
+                tree_u, tree_v, tree_weights = self._spanning_forest(~reused_positions)
                 
-                # Sort connectors by centrality (highest first)
-                component_connectors.sort(key=lambda x: x[1], reverse=True)
+                if reused_positions.any():
+                    reused_edges = [
+                        (u, v, data.get('weight', 1.0)) for u, v, data in previous.edges(data=True)
+                        if u in reusable and v in reusable
+                        and data.get('connection_type', 'intra_component') == 'intra_component'
+                    ]
+                    print(f"   ♻️ Reused {len(reused_edges)} spanning-tree edges of unchanged components")
+                    tree_u += [u for u, _, _ in reused_edges]
+                    tree_v += [v for _, v, _ in reused_edges]
+                    tree_weights += [weight for _, _, weight in reused_edges]
+                print(f"   ✅ Spanning forest has {len(tree_u)} edges")
                 
-                # Connect each component to the highest centrality component in a star pattern
-                main_connector = component_connectors[0][0]
+                # Step 3: Star-connect components through their best-connected tree node
+                connectors = self._component_connectors(tree_u, tree_v) if component_count > 1 else []
+                if connectors:
+                    print(f"   🔗 Adding {len(connectors) - 1} inter-component connections to {connectors[0]}...")
                 
-                for connector_node, centrality, comp_idx in component_connectors[1:]:
-                    # Add connecting edge with high weight (low reciprocal cost)
-                    connection_weight = 0.1  # High importance connection
-                    mst_edges.add_edge(main_connector, connector_node, 
-                                     weight=connection_weight, 
-                                     original_weight=1.0/connection_weight,  # Very high original weight
-                                     connection_type='inter_component')
-                    print(f"      ➡️  Connected {main_connector} ↔ {connector_node}")
-            
-            print(f"   ✅ Hybrid MST completed: {mst_edges.number_of_nodes()} nodes, {mst_edges.number_of_edges()} edges")
-        
-        try:
-            # Step 4: Convert back to directed graph with original weights
-            print("   🔄 Converting MST back to directed graph...")
+            # Step 4: Directed graph with original weights restored
+            print("   🔄 Converting MST to directed graph...")
             self.minimal_subgraph = nx.DiGraph()
-            
-            # Add all nodes from MST
-            for node in mst_edges.nodes():
-                self.minimal_subgraph.add_node(node, **mst_graph.nodes[node])
-            
-            # Add edges with original weights restored
-            for u, v, data in mst_edges.edges(data=True):
-                original_weight = data.get('original_weight', 1.0)
-                connection_type = data.get('connection_type', 'intra_component')
-                
-                # For directed graph, we need to determine edge direction
-                # Use the original graph to find the correct direction
-                if self.graph.has_edge(u, v):
-                    self.minimal_subgraph.add_edge(u, v, weight=original_weight, connection_type=connection_type)
-                elif self.graph.has_edge(v, u):
-                    self.minimal_subgraph.add_edge(v, u, weight=original_weight, connection_type=connection_type)
-                else:
-                    # For inter-component connections, add both directions
-                    self.minimal_subgraph.add_edge(u, v, weight=original_weight, connection_type=connection_type)
-                    self.minimal_subgraph.add_edge(v, u, weight=original_weight, connection_type=connection_type)
+            self.minimal_subgraph.add_nodes_from(nodes)
+            self.minimal_subgraph.add_edges_from(
+                (u, v, {'weight': weight, 'connection_type': 'intra_component'})
+                for u, v, weight in zip(tree_u, tree_v, tree_weights)
+            )
+            # Connections have no underlying edge, so they are added in both directions
+            connection_weight = 0.1  # Reciprocal cost of a high importance connection
+            for connector in connectors[1:]:
+                for u, v in ((connectors[0], connector), (connector, connectors[0])):
+                    self.minimal_subgraph.add_edge(u, v, weight=1.0 / connection_weight, connection_type='inter_component')
             
             print(f"   ✅ Minimal subgraph created: {self.minimal_subgraph.number_of_nodes()} nodes, {self.minimal_subgraph.number_of_edges()} edges")
             
             # Step 5: Verify the result
             final_components = nx.number_weakly_connected_components(self.minimal_subgraph)
+            self.minimal_subgraph_components = final_components
             print(f"   🔗 Final result has {final_components} connected component(s)")
             
             # Check connectivity
-            is_connected = nx.is_weakly_connected(self.minimal_subgraph)
+            is_connected = final_components == 1
             print(f"   📊 Graph connectivity: {'✅ Connected' if is_connected else '⚠️ Multiple components'}")
             
             # Check if we can now do topological sort
@@ -844,19 +4898,179 @@ class KnowledgeGraphBuilder:
             print("   🔄 Falling back to simple node selection...")
             
             # Fallback: select top nodes by importance
-            total_nodes = self.graph.number_of_nodes()
+            total_nodes = self.core_graph.number_of_nodes()
             target_size = min(50, max(10, int(total_nodes * 0.3)))
             top_nodes = sorted(combined_scores.items(), key=lambda x: x[1], reverse=True)
             selected_nodes = [node for node, score in top_nodes[:target_size]]
             
-            self.minimal_subgraph = self.graph.subgraph(selected_nodes).copy()
+            self.minimal_subgraph = self.core_graph.to_networkx(selected_nodes, directed=True)
+            self.minimal_subgraph_components = nx.number_weakly_connected_components(self.minimal_subgraph)
             print(f"   📋 Fallback subgraph: {self.minimal_subgraph.number_of_nodes()} nodes, {self.minimal_subgraph.number_of_edges()} edges")
         
         elapsed = (datetime.now() - step_start).total_seconds()
         print(f"🎯 Minimal subgraph computation completed in {elapsed:.2f}s")
     
-    def _generate_node_embeddings(self):
-        """Generate embeddings for nodes using sentence transformers."""
+    def _spanning_forest(self, keep: np.ndarray) -> Tuple[List[int], List[int], List[Any]]:
+        """Return the minimum spanning forest of the core graph restricted to kept positions.
+        
+        Edge costs are reciprocal co-occurrence weights, so the forest keeps the
+        strongest links of every connected component.
+        
+        Args:
+            keep: Boolean mask over core graph positions.
+            
+        Returns:
+            Source node IDs, target node IDs and original weights of the forest edges.
+        """
+        graph = self.core_graph if keep.all() else self.core_graph.subgraph(keep)
+        if graph.number_of_edges() == 0:
+            return [], [], []
+        
+        if not SCIPY_AVAILABLE:
+            costs = nx.Graph()
+            costs.add_weighted_edges_from((u, v, 1.0 / (weight + 1e-6)) for u, v, weight in graph.edges())
+            forest = nx.minimum_spanning_tree(costs, weight='weight', algorithm='kruskal')
+            tree_u, tree_v = zip(*forest.edges())
+            positions_u, positions_v = graph.positions(list(tree_u)), graph.positions(list(tree_v))
+        else:
+            forest = minimum_spanning_tree(self._reciprocal_costs(graph)).tocoo()
+            positions_u, positions_v = forest.row.astype(np.int64), forest.col.astype(np.int64)
+        
+        return (
+            graph.node_ids[positions_u].tolist(),
+            graph.node_ids[positions_v].tolist(),
+            graph.entry_weights(positions_u, positions_v).tolist()
+        )
+    
+    @staticmethod
+    def _reciprocal_costs(graph: GraphStore) -> 'csr_matrix':
+        """Return the CSR matrix of reciprocal edge weights over the graph's positions."""
+        node_count = graph.number_of_nodes()
+        return csr_matrix((1.0 / (graph.weights + 1e-6), graph.indices, graph.indptr), shape=(node_count, node_count))
+    
+    def _steiner_tree(
+        self,
+        combined_scores: Dict[int, float]
+    ) -> Tuple[List[int], List[int], List[int], List[Any], List[int]]:
+        """Connect the top-scoring core nodes with an approximate Steiner tree.
+        
+        Follows Mehlhorn's metric-closure construction: one multi-source Dijkstra
+        from the terminals over reciprocal weights assigns every node to its
+        nearest terminal, each edge between two such regions yields a candidate
+        terminal-to-terminal path, and an MST over the cheapest candidate per
+        terminal pair picks the paths to keep. The union of those paths is a tree
+        costing at most twice the optimal Steiner tree, found with a single
+        shortest-path search however many terminals there are.
+        
+        Terminals in different components cannot be joined by paths; as in the
+        spanning forest, each component is star-connected through its
+        highest-scoring terminal.
+        
+        Args:
+            combined_scores: Combined centrality score per core node ID.
+            
+        Returns:
+            Node IDs of the subgraph; source node IDs, target node IDs and
+            original weights of the tree edges; connector node IDs, hub first.
+        """
+        core = self.core_graph
+        node_count = core.number_of_nodes()
+        scores = np.array([combined_scores.get(node_id, 0.0) for node_id in core.nodes()])
+        k = min(max(self.build_config.steiner_terminals, 1), node_count)
+        terminals = np.lexsort((np.arange(node_count), -scores))[:k]
+        print(f"   🌲 Connecting the top {k} of {node_count} nodes with an approximate Steiner tree...")
+        
+        costs = self._reciprocal_costs(core)
+        distances, predecessors, nearest = dijkstra(
+            costs, directed=False, indices=terminals, return_predecessors=True, min_only=True
+        )
+        
+        # Cheapest path through a region boundary for every pair of terminals
+        entries = costs.tocoo()
+        terminal_index = np.full(node_count, -1, dtype=np.int64)
+        terminal_index[terminals] = np.arange(k)
+        region_u = terminal_index[np.maximum(nearest[entries.row], 0)]
+        region_v = terminal_index[np.maximum(nearest[entries.col], 0)]
+        boundary = (nearest[entries.row] >= 0) & (nearest[entries.col] >= 0) & (region_u < region_v)
+        bridge_u, bridge_v = entries.row[boundary], entries.col[boundary]
+        lengths = distances[bridge_u] + entries.data[boundary] + distances[bridge_v]
+        pair_keys = region_u[boundary] * k + region_v[boundary]
+        order = np.lexsort((lengths, pair_keys))
+        cheapest = order[np.r_[True, pair_keys[order][1:] != pair_keys[order][:-1]]] if len(order) else order
+        
+        closure = csr_matrix(
+            (lengths[cheapest], (pair_keys[cheapest] // k, pair_keys[cheapest] % k)), shape=(k, k)
+        )
+        closure_tree = minimum_spanning_tree(closure).tocoo()
+        bridge_of_pair = dict(zip(pair_keys[cheapest].tolist(), cheapest.tolist()))
+        
+        # Expand each kept bridge into its two shortest paths back to their terminals
+        tree_edges = set()
+        for pair_key in (closure_tree.row.astype(np.int64) * k + closure_tree.col).tolist():
+            bridge = bridge_of_pair[pair_key]
+            tree_edges.add((int(bridge_u[bridge]), int(bridge_v[bridge])))
+            for position in (int(bridge_u[bridge]), int(bridge_v[bridge])):
+                while predecessors[position] >= 0:
+                    edge = (int(predecessors[position]), position)
+                    if edge in tree_edges:
+                        break
+                    tree_edges.add(edge)
+                    position = edge[0]
+        
+        tree_u = np.array([u for u, _ in tree_edges], dtype=np.int64)
+        tree_v = np.array([v for _, v in tree_edges], dtype=np.int64)
+        positions = np.unique(np.concatenate([terminals, tree_u, tree_v]))
+        print(f"   ✅ Steiner tree has {len(positions)} nodes ({len(positions) - k} intermediate), {len(tree_edges)} edges")
+        
+        # Terminals are in score order, so each component's first one is its best
+        _, first = np.unique(core.component_labels()[terminals], return_index=True)
+        connectors = core.node_ids[terminals[np.sort(first)]].tolist()
+        if len(connectors) > 1:
+            print(f"   🔗 Adding {len(connectors) - 1} inter-component connections to {connectors[0]}...")
+        
+        return (
+            core.node_ids[positions].tolist(),
+            core.node_ids[tree_u].tolist(),
+            core.node_ids[tree_v].tolist(),
+            core.entry_weights(tree_u, tree_v).tolist(),
+            connectors if len(connectors) > 1 else []
+        )
+    
+    def _component_connectors(self, tree_u: List[int], tree_v: List[int]) -> List[int]:
+        """Pick the node that connects each core component to the others.
+        
+        Each component's connector is its node with the highest degree centrality
+        within the spanning tree (ties go to the earlier node; single nodes count
+        as fully central). Connectors are ordered by that centrality, highest
+        first, and the first one is the hub of the star.
+        
+        Args:
+            tree_u: Source node IDs of the spanning forest edges.
+            tree_v: Target node IDs of the spanning forest edges.
+            
+        Returns:
+            Connector node IDs, one per component, hub first.
+        """
+        core = self.core_graph
+        labels = core.component_labels()
+        endpoints = core.positions(tree_u + tree_v)
+        tree_degrees = np.bincount(endpoints, minlength=core.number_of_nodes())
+        sizes = np.bincount(labels)[labels]
+        centrality = np.divide(tree_degrees, sizes - 1, out=np.ones(len(labels)), where=sizes > 1)
+        
+        # Best node per component, then components by their best centrality
+        positions = np.arange(len(labels))
+        best = np.lexsort((positions, -centrality, labels))
+        best = best[np.r_[True, labels[best][1:] != labels[best][:-1]]]
+        best = best[np.lexsort((labels[best], -centrality[best]))]
+        return core.node_ids[best].tolist()
+    
+    def _generate_node_embeddings(self, node_ids: Optional[List[int]] = None):
+        """Generate embeddings for nodes using sentence transformers.
+        
+        Args:
+            node_ids: Nodes to embed; defaults to every node in the graph.
+        """
         if not self.sentence_transformer:
             print("⚠️ No sentence transformer available - skipping embeddings")
             return
@@ -865,13 +5079,11 @@ class KnowledgeGraphBuilder:
         
         try:
             node_texts = []
-            node_ids = []
+            node_ids = self.graph.nodes() if node_ids is None else list(node_ids)
             
-            for node_id in self.graph.nodes():
-                node_data = self.graph.nodes[node_id]
-                text = f"{node_data.get('label', '')} {node_data.get('type', '')}"
+            for node_id in node_ids:
+                text = f"{self.nodes.labels[node_id]} {self.nodes.node_type(node_id)}"
                 node_texts.append(text)
-                node_ids.append(node_id)
             
             if node_texts:
                 # Generate embeddings in batches to manage memory
@@ -892,7 +5104,7 @@ class KnowledgeGraphBuilder:
         except Exception as e:
             print(f"❌ Embedding generation failed: {e}")
     
-    def _calculate_topic_relevance_scores(self, topic: str) -> Dict[str, float]:
+    def _calculate_topic_relevance_scores(self, topic: str, node_ids: Optional[List[int]] = None) -> Dict[int, float]:
         """Calculate semantic similarity scores between nodes and the main topic.
         
         Uses sentence transformers to compute cosine similarity between node labels
@@ -900,6 +5112,7 @@ class KnowledgeGraphBuilder:
         
         Args:
             topic: The main topic/subject for relevance scoring.
+            node_ids: Nodes to score; defaults to every node in the graph.
             
         Returns:
             Dictionary mapping node IDs to their relevance scores (0.0-1.0).
@@ -913,7 +5126,7 @@ class KnowledgeGraphBuilder:
         
         if not SKLEARN_AVAILABLE:
             print("⚠️ Scikit-learn not available - using fallback relevance scoring")
-            return self._calculate_context_relevance_scores(topic)
+            return self._calculate_context_relevance_scores(topic, node_ids)
         
         print(f"🎯 Calculating topic relevance scores for '{topic}'...")
         
@@ -925,11 +5138,10 @@ class KnowledgeGraphBuilder:
             node_texts = []
             node_ids = []
             
-            for node_id in self.graph.nodes():
-                node_data = self.graph.nodes[node_id]
+            for node_id in (self.graph.nodes() if node_ids is None else node_ids):
                 # Combine label with type for better context
-                label = node_data.get('label', '')
-                node_type = node_data.get('type', '')
+                label = self.nodes.labels[node_id]
+                node_type = self.nodes.node_type(node_id)
                 text = f"{label} {node_type}".strip()
                 node_texts.append(text)
                 node_ids.append(node_id)
@@ -969,9 +5181,9 @@ class KnowledgeGraphBuilder:
         except Exception as e:
             print(f"❌ Topic relevance calculation failed: {e}")
             # Fall back to context-based scoring
-            return self._calculate_context_relevance_scores(topic)
+            return self._calculate_context_relevance_scores(topic, node_ids)
     
-    def _calculate_context_relevance_scores(self, topic: str) -> Dict[str, float]:
+    def _calculate_context_relevance_scores(self, topic: str, node_ids: Optional[List[int]] = None) -> Dict[int, float]:
         """Calculate relevance scores using context analysis when embeddings aren't available.
         
         This method serves as a fallback when semantic similarity cannot be computed,
@@ -979,6 +5191,7 @@ class KnowledgeGraphBuilder:
         
         Args:
             topic: The main topic/subject for relevance scoring.
+            node_ids: Nodes to score; defaults to every node in the graph.
             
         Returns:
             Dictionary mapping node IDs to their relevance scores (0.0-1.0).
@@ -988,9 +5201,8 @@ class KnowledgeGraphBuilder:
         topic_words = set(topic.lower().split())
         relevance_scores = {}
         
-        for node_id in self.graph.nodes():
-            node_data = self.graph.nodes[node_id]
-            node_label = node_data.get('label', '').lower()
+        for node_id in (self.graph.nodes() if node_ids is None else node_ids):
+            node_label = self.nodes.labels[node_id].lower()
             
             # Calculate relevance score based on:
             # 1. Direct word overlap with topic
@@ -998,10 +5210,10 @@ class KnowledgeGraphBuilder:
             word_overlap = len(topic_words & node_words) / max(len(topic_words), 1)
             
             # 2. Frequency-based importance (higher frequency = more relevant)
-            frequency_score = min(node_data.get('frequency', 1) / 10.0, 1.0)
+            frequency_score = min(int(self.nodes.frequency[node_id]) / 10.0, 1.0)
             
             # 3. Node type bonus (concepts generally more relevant than entities)
-            type_bonus = 0.1 if node_data.get('type') == 'concept' else 0.0
+            type_bonus = 0.1 if self.nodes.node_type(node_id) == 'concept' else 0.0
             
             # Combine scores with weights
             final_score = (word_overlap * 0.6) + (frequency_score * 0.3) + type_bonus
@@ -1009,6 +5221,91 @@ class KnowledgeGraphBuilder:
         
         return relevance_scores
     
+    def _calculate_graph_relevance_scores(self, topic: str) -> Dict[int, float]:
+        """Calculate relevance scores by personalized PageRank from topic-matching nodes.
+        
+        Nodes whose labels share words with the topic seed the walk, weighted by
+        their word overlap, and every node is scored by the mass it receives per
+        unit of weighted degree. Scores are log-scaled between the push tolerance
+        (0.0) and the best-scoring node (1.0), so they can share the threshold
+        used for embedding similarity. Seeds score at least their word overlap,
+        since many seeds split the restart mass until none stands out.
+        
+        Args:
+            topic: The main topic/subject for relevance scoring.
+            
+        Returns:
+            Dictionary mapping node IDs to their relevance scores (0.0-1.0).
+        """
+        topic_words = set(topic.lower().split())
+        seeds = {}
+        for node_id in self.graph.nodes():
+            node_words = set(self.nodes.labels[node_id].lower().split())
+            overlap = len(topic_words & node_words) / max(len(topic_words), 1)
+            if overlap > 0:
+                seeds[node_id] = overlap
+        
+        if not seeds:
+            print("⚠️ No node labels match the topic - using context-based relevance scoring")
+            return self._calculate_context_relevance_scores(topic)
+        
+        print(f"🎯 Calculating graph relevance scores for '{topic}' from {len(seeds)} seed nodes...")
+        
+        tolerance = self.topic_config.ppr_tolerance
+        mass = self.graph.personalized_pagerank(seeds, self.topic_config.ppr_alpha, tolerance)
+        reached_ids = list(mass)
+        degrees = self.graph.weighted_degrees()[self.graph.positions(reached_ids)]
+        values = np.fromiter(mass.values(), dtype=np.float64, count=len(mass))
+        
+        # Mass per unit of degree, so hubs are not relevant merely for being well connected
+        density = np.divide(values, degrees, out=np.zeros_like(values), where=degrees > 0)
+        scaled = np.zeros_like(density)
+        peak = density.max(initial=0.0)
+        if peak > tolerance:
+            above = density > tolerance
+            scaled[above] = np.minimum(np.log(density[above] / tolerance) / math.log(peak / tolerance), 1.0)
+        
+        relevance_scores = {node_id: 0.0 for node_id in self.graph.nodes()}
+        relevance_scores.update(zip(reached_ids, scaled.tolist()))
+        for node_id, overlap in seeds.items():
+            relevance_scores[node_id] = max(relevance_scores[node_id], overlap)
+        
+        reached = sum(1 for score in relevance_scores.values() if score > 0)
+        print(f"✅ Graph relevance scores calculated: {reached}/{len(relevance_scores)} nodes reached")
+        
+        return relevance_scores
+    
+    def _score_topic_relevance(self, topic: str) -> Dict[int, float]:
+        """Score every graph node against the topic with the configured scorer.
+        
+        Args:
+            topic: The main topic/subject for relevance scoring.
+            
+        Returns:
+            Dictionary mapping node IDs to their relevance scores (0.0-1.0).
+        """
+        scorer = self.topic_config.relevance_scorer
+        if scorer == 'auto':
+            embeddings_usable = self.sentence_transformer is not None and SKLEARN_AVAILABLE
+            too_large = self.graph.number_of_nodes() > self.topic_config.max_embedding_nodes
+            scorer = 'embedding' if embeddings_usable and not too_large else 'graph'
+            print(f"🔀 Automatic relevance scoring selected '{scorer}'")
+        
+        if scorer == 'graph':
+            return self._calculate_graph_relevance_scores(topic)
+        if scorer != 'blend':
+            return self._calculate_topic_relevance_scores(topic)
+        
+        embedding_scores = self._calculate_topic_relevance_scores(topic)
+        graph_scores = self._calculate_graph_relevance_scores(topic)
+        if not embedding_scores:
+            return graph_scores
+        weight = self.topic_config.ppr_blend_weight
+        return {
+            node_id: (1.0 - weight) * score + weight * graph_scores.get(node_id, 0.0)
+            for node_id, score in embedding_scores.items()
+        }
+    
     def _filter_nodes_by_topic_relevance(self, topic: str, sources: List[Dict[str, Any]]) -> None:
         """Filter out nodes that don't meet the topic relevance threshold.
         
@@ -1041,37 +5338,17 @@ class KnowledgeGraphBuilder:
         
         try:
             # Calculate relevance scores
-            relevance_scores = self._calculate_topic_relevance_scores(topic)
+            relevance_scores = self._score_topic_relevance(topic)
             
             if not relevance_scores:
                 print("⚠️ No relevance scores calculated - keeping all nodes")
                 return
             
-            # Identify nodes to remove
-            nodes_to_remove = []
-            nodes_to_keep = []
-            
-            for node_id, score in relevance_scores.items():
-                if score < self.topic_config.relevance_threshold:
-                    nodes_to_remove.append(node_id)
-                else:
-                    nodes_to_keep.append(node_id)
-            
-            # Ensure we don't remove too many nodes (keep at least 10% of original)
-            min_nodes_to_keep = max(10, int(current_node_count * 0.1))
-            
-            if len(nodes_to_keep) < min_nodes_to_keep:
-                print(f"⚠️ Would remove too many nodes ({len(nodes_to_remove)}/{current_node_count})")
-                print(f"🔄 Keeping top {min_nodes_to_keep} nodes instead")
-                
-                # Keep the highest scoring nodes
-                sorted_nodes = sorted(relevance_scores.items(), key=lambda x: x[1], reverse=True)
-                nodes_to_keep = [node_id for node_id, _ in sorted_nodes[:min_nodes_to_keep]]
-                nodes_to_remove = [node_id for node_id, _ in sorted_nodes[min_nodes_to_keep:]]
+            nodes_to_keep, nodes_to_remove = self._split_by_relevance(relevance_scores, current_node_count)
             
             # Remove irrelevant nodes
             if nodes_to_remove:
-                self.graph.remove_nodes_from(nodes_to_remove)
+                self.graph.remove_nodes(nodes_to_remove)
                 removed_count = len(nodes_to_remove)
                 remaining_count = self.graph.number_of_nodes()
                 
@@ -1080,10 +5357,10 @@ class KnowledgeGraphBuilder:
                 print(f"📊 Remaining: {remaining_count} nodes "
                       f"({remaining_count/current_node_count:.1%} of original)")
                 
-                # Store relevance scores in node properties for later use
+                # Store relevance scores in the node table for later use
                 for node_id in self.graph.nodes():
                     if node_id in relevance_scores:
-                        self.graph.nodes[node_id]['topic_relevance'] = relevance_scores[node_id]
+                        self.nodes.topic_relevance[node_id] = relevance_scores[node_id]
                 
                 # Log some examples of removed vs kept nodes
                 if removed_count > 0:
@@ -1094,12 +5371,12 @@ class KnowledgeGraphBuilder:
                     
                     print("🗑️  Examples of removed nodes:")
                     for node_id, score in removed_examples:
-                        label = self.graph.nodes.get(node_id, {}).get('label', node_id)
+                        label = self.nodes.labels[node_id]
                         print(f"   - {label} (score: {score:.3f})")
                     
                     print("✅ Examples of kept nodes:")
                     for node_id, score in kept_examples:
-                        label = self.graph.nodes[node_id].get('label', node_id)
+                        label = self.nodes.labels[node_id]
                         print(f"   - {label} (score: {score:.3f})")
                         
             else:
@@ -1109,26 +5386,127 @@ class KnowledgeGraphBuilder:
             print(f"❌ Topic relevance filtering failed: {e}")
             print("🔄 Continuing with all nodes")
     
+    def _split_by_relevance(
+        self,
+        relevance_scores: Dict[int, float],
+        total_count: int
+    ) -> Tuple[List[int], List[int]]:
+        """Split scored nodes into kept and removed by the relevance threshold.
+        
+        Never keeps fewer than ``max(10, 10%)`` of ``total_count`` nodes; if the
+        threshold would, the highest scoring nodes are kept instead.
+        
+        Args:
+            relevance_scores: Relevance score per node ID.
+            total_count: Node count the retention minimum is based on.
+            
+        Returns:
+            Tuple of node IDs to keep and node IDs to remove.
+        """
+        nodes_to_remove = []
+        nodes_to_keep = []
+        
+        for node_id, score in relevance_scores.items():
+            if score < self.topic_config.relevance_threshold:
+                nodes_to_remove.append(node_id)
+            else:
+                nodes_to_keep.append(node_id)
+        
+        # Ensure we don't remove too many nodes (keep at least 10% of original)
+        min_nodes_to_keep = max(10, int(total_count * 0.1))
+        
+        if len(nodes_to_keep) < min_nodes_to_keep:
+            print(f"⚠️ Would remove too many nodes ({len(nodes_to_remove)}/{total_count})")
+            print(f"🔄 Keeping top {min_nodes_to_keep} nodes instead")
+            
+            # Keep the highest scoring nodes
+            sorted_nodes = sorted(relevance_scores.items(), key=lambda x: x[1], reverse=True)
+            nodes_to_keep = [node_id for node_id, _ in sorted_nodes[:min_nodes_to_keep]]
+            nodes_to_remove = [node_id for node_id, _ in sorted_nodes[min_nodes_to_keep:]]
+        
+        return nodes_to_keep, nodes_to_remove
+    
+    def _prefilter_candidates_by_topic(
+        self,
+        topic: str,
+        concepts: List[Dict[str, Any]],
+        entities: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Drop extracted candidates that fall below the topic relevance threshold.
+        
+        Runs before co-occurrence counting so that off-topic labels are never
+        scanned for or linked. Uses the same scores and minimum-retention rule
+        as ``_filter_nodes_by_topic_relevance``.
+        
+        Args:
+            topic: The main topic/subject for filtering.
+            concepts: Extracted concept node dictionaries.
+            entities: Extracted entity node dictionaries.
+            
+        Returns:
+            Tuple of the retained concepts and entities, in their original order.
+        """
+        if not self.topic_config.enable_semantic_filtering:
+            print("🔄 Semantic filtering disabled - skipping candidate pre-filtering")
+            return concepts, entities
+        
+        candidate_count = len(concepts) + len(entities)
+        print(f"🔍 Pre-filtering {candidate_count} candidates by topic relevance "
+              f"(threshold: {self.topic_config.relevance_threshold})")
+        
+        try:
+            # Interning is idempotent, so graph construction reuses these IDs
+            concept_ids = self.nodes.add_nodes(concepts).tolist()
+            entity_ids = self.nodes.add_nodes(entities).tolist()
+            relevance_scores = self._calculate_topic_relevance_scores(
+                topic, list(dict.fromkeys(concept_ids + entity_ids))
+            )
+            
+            if not relevance_scores:
+                print("⚠️ No relevance scores calculated - keeping all candidates")
+                return concepts, entities
+            
+            nodes_to_keep, nodes_to_remove = self._split_by_relevance(relevance_scores, len(relevance_scores))
+            kept = set(nodes_to_keep)
+            for node_id in nodes_to_keep:
+                self.nodes.topic_relevance[node_id] = relevance_scores[node_id]
+            
+            concepts = [node for node, node_id in zip(concepts, concept_ids) if node_id in kept]
+            entities = [node for node, node_id in zip(entities, entity_ids) if node_id in kept]
+            print(f"🧹 Pre-filter removed {len(nodes_to_remove)} candidates; "
+                  f"{len(concepts)} concepts and {len(entities)} entities remain")
+            return concepts, entities
+            
+        except Exception as e:
+            print(f"❌ Candidate pre-filtering failed: {e}")
+            print("🔄 Continuing with all candidates")
+            return concepts, entities
+    
     def _finalize_graph_data(self) -> Dict[str, Any]:
         """Finalize and format graph data for Swift consumption."""
         
+        # External string IDs are generated here, at the output boundary only
+        string_ids = {node_id: self.nodes.string_id(node_id) for node_id in self.graph.nodes()}
+        
         # Convert nodes to Swift-compatible format
         nodes = []
         for node_id in self.graph.nodes():
-            node_data = self.graph.nodes[node_id]
             node = {
-                'id': node_id,
-                'label': node_data.get('label', ''),
-                'type': node_data.get('type', 'concept'),
+                'id': string_ids[node_id],
+                'label': self.nodes.labels[node_id],
+                'type': self.nodes.node_type(node_id),
                 'properties': {
-                    'frequency': str(node_data.get('frequency', 0)),
-                    'importance': str(node_data.get('importance', 0.0)),
+                    'frequency': str(int(self.nodes.frequency[node_id])),
+                    'importance': str(float(self.nodes.importance[node_id])),
                     'pagerank': str(self.centrality_scores.get('pagerank', {}).get(node_id, 0.0)),
                     'eigenvector': str(self.centrality_scores.get('eigenvector', {}).get(node_id, 0.0)),
                     'betweenness': str(self.centrality_scores.get('betweenness', {}).get(node_id, 0.0)),
                     'closeness': str(self.centrality_scores.get('closeness', {}).get(node_id, 0.0)),
-                    'topic_relevance': str(node_data.get('topic_relevance', 0.0)),
-                    'source_references': ','.join(node_data.get('source_references', []))
+                    'topic_relevance': str(float(self.nodes.topic_relevance[node_id])),
+                    'source_references': ','.join(self.nodes.source_references[node_id]),
+                    'aliases': ','.join(self.nodes.aliases[node_id]),
+                    'pruned': 'true' if node_id in self.pruned_nodes else 'false',
+                    'community': str(self.communities.get(node_id, -1))
                 },
                 'position': {'x': 0.0, 'y': 0.0}  # Will be set by Swift UI
             }
@@ -1136,12 +5514,13 @@ class KnowledgeGraphBuilder:
         
         # Convert edges to Swift-compatible format
         edges = []
-        for source, target, edge_data in self.graph.edges(data=True):
+        # Co-occurrence is symmetric; Swift expects an entry for each direction
+        for source, target, weight in self.graph.directed_edges():
             edge = {
-                'source_id': source,
-                'target_id': target,
-                'label': edge_data.get('label', ''),
-                'weight': edge_data.get('weight', 1.0),
+                'source_id': string_ids[source],
+                'target_id': string_ids[target],
+                'label': '',
+                'weight': weight,
                 'properties': {}
             }
             edges.append(edge)
@@ -1157,8 +5536,8 @@ class KnowledgeGraphBuilder:
             node_lookup = {node['id']: node for node in nodes}
             
             for node_id in self.minimal_subgraph.nodes():
-                if node_id in node_lookup:
-                    node_copy = node_lookup[node_id].copy()
+                if node_id in string_ids and string_ids[node_id] in node_lookup:
+                    node_copy = node_lookup[string_ids[node_id]].copy()
                     # Add minimal subgraph specific properties
                     node_copy['properties']['in_minimal_subgraph'] = 'true'
                     minimal_nodes.append(node_copy)
@@ -1167,8 +5546,8 @@ class KnowledgeGraphBuilder:
             
             for source, target, edge_data in self.minimal_subgraph.edges(data=True):
                 edge = {
-                    'source_id': source,
-                    'target_id': target,
+                    'source_id': string_ids.get(source, self.nodes.string_id(source)),
+                    'target_id': string_ids.get(target, self.nodes.string_id(target)),
                     'label': edge_data.get('label', ''),
                     'weight': edge_data.get('weight', 1.0),
                     'properties': {
@@ -1187,17 +5566,24 @@ class KnowledgeGraphBuilder:
             'total_edges': len(edges),
             'minimal_nodes': len(minimal_nodes),
             'minimal_edges': len(minimal_edges),
-            'algorithms': ['pagerank', 'eigenvector', 'betweenness', 'closeness', 'hybrid_mst', 'topic_relevance'],
+            'algorithms': self._algorithm_labels(),
             'last_analysis': datetime.now().isoformat(),
             'has_embeddings': len(self.node_embeddings) > 0,
-            'connected_components': nx.number_weakly_connected_components(self.graph),
-            'minimal_connected_components': nx.number_weakly_connected_components(self.minimal_subgraph) if self.minimal_subgraph else 0,
-            'graph_density': nx.density(self.graph),
+            'connected_components': self.graph.number_connected_components(),
+            'minimal_connected_components': self.minimal_subgraph_components if self.minimal_subgraph else 0,
+            'graph_density': self.graph.density(),
             'minimal_graph_created': self.minimal_subgraph is not None and self.minimal_subgraph.number_of_nodes() > 0,
             'topic_relevance_enabled': self.topic_config.enable_semantic_filtering,
             'topic_relevance_threshold': self.topic_config.relevance_threshold,
             'run_id': self.run_id,
-            'cache_directory': self.cache_dir
+            'cache_directory': self.cache_dir,
+            'extraction_cache': self.extraction_cache.stats() if self.extraction_cache is not None else {'enabled': False},
+            'heavy_hitters': self.heavy_hitter_stats,
+            'centrality_diagnostics': self.centrality_diagnostics,
+            'backbone': self.backbone_stats,
+            'pruning': self.pruning_stats,
+            'communities': self.community_stats,
+            'incremental_update': self.update_stats
         }
         
         return {
@@ -1209,7 +5595,10 @@ class KnowledgeGraphBuilder:
                 'edges': minimal_edges
             },
             'metadata': metadata,
-            'embeddings': self.node_embeddings  # For potential future use
+            'embeddings': {  # For potential future use
+                string_ids.get(node_id, self.nodes.string_id(node_id)): embedding
+                for node_id, embedding in self.node_embeddings.items()
+            }
         }
 
 
@@ -1220,7 +5609,8 @@ def generate_knowledge_graph_from_sources(
     sources: List[Dict[str, Any]], 
     topic: str = "",
     progress_callback: Optional[Callable] = None,
-    topic_config: Optional[TopicRelevanceConfig] = None
+    topic_config: Optional[TopicRelevanceConfig] = None,
+    build_config: Optional[GraphBuildConfig] = None
 ) -> Dict[str, Any]:
     """Main function for generating knowledge graph from sources with topic relevance filtering.
     
@@ -1229,6 +5619,7 @@ def generate_knowledge_graph_from_sources(
         topic: Main topic/subject for relevance filtering.
         progress_callback: Optional callback function for progress updates.
         topic_config: Configuration for topic relevance filtering.
+        build_config: Configuration for graph construction performance options.
         
     Returns:
         Dictionary containing the generated knowledge graph data.
@@ -1246,7 +5637,7 @@ def generate_knowledge_graph_from_sources(
         }
     
     try:
-        builder = KnowledgeGraphBuilder(topic_config=topic_config)
+        builder = KnowledgeGraphBuilder(topic_config=topic_config, build_config=build_config)
         if progress_callback:
             builder.set_progress_callback(progress_callback)
         
@@ -1271,7 +5662,8 @@ def create_topic_relevance_config(
     enable_source_connectivity_filtering: bool = True,
     require_verified_sources: bool = True,
     enable_deduplication: bool = True,
-    deduplication_similarity_threshold: float = 0.75
+    deduplication_similarity_threshold: float = 0.75,
+    filter_before_graph_construction: bool = False
 ) -> TopicRelevanceConfig:
     """Create a topic relevance configuration with common settings.
     
@@ -1283,6 +5675,7 @@ def create_topic_relevance_config(
         require_verified_sources: Whether source references must match original sources.
         enable_deduplication: Whether to deduplicate similar concepts in learning plans.
         deduplication_similarity_threshold: Threshold for fuzzy concept matching (0.0-1.0).
+        filter_before_graph_construction: Whether to filter candidate labels before building the graph.
         
     Returns:
         TopicRelevanceConfig instance with specified settings.
@@ -1321,7 +5714,8 @@ def create_topic_relevance_config(
         enable_source_connectivity_filtering=enable_source_connectivity_filtering,
         require_verified_sources=require_verified_sources,
         enable_deduplication=enable_deduplication,
-        deduplication_similarity_threshold=deduplication_similarity_threshold
+        deduplication_similarity_threshold=deduplication_similarity_threshold,
+        filter_before_graph_construction=filter_before_graph_construction
     )
 
 # MARK: - Helper Functions for Enhanced Learning Plan Generation
@@ -0,0 +1,63 @@
+"""Shared fixtures for the knowledge graph builder tests."""
+
+import contextlib
+import io
+import os
+import random
+import sys
+from typing import Any, Dict, List
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Sources', 'Glyph')))
+
+import knowledge_graph_generation as kg  # noqa: E402
+
+
+def phrase_sources(count: int, seed: int, phrases: List[str], per_source: int = 4) -> List[Dict[str, Any]]:
+    """Return sources that each mention a random sample of phrases as sentences."""
+    rng = random.Random(seed)
+    return [
+        {
+            'title': f'Doc {seed}-{i}',
+            'content': '. '.join(rng.sample(phrases, per_source)) + '.',
+            'url': f'https://example.com/{seed}/{i}',
+            'source_type': 'web'
+        }
+        for i in range(count)
+    ]
+
+
+def edge_weights(result: Dict[str, Any]) -> Dict[tuple, Any]:
+    """Return the ``{(source_id, target_id): weight}`` map of a graph result."""
+    return {(edge['source_id'], edge['target_id']): edge['weight'] for edge in result['edges']}
+
+
+def quietly(function, *args, **kwargs):
+    """Call function with its progress output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+@pytest.fixture
+def make_builder(tmp_path):
+    """Return a factory for builders with a private cache and no extraction cache."""
+    def make(**config) -> 'kg.KnowledgeGraphBuilder':
+        config.setdefault('enable_extraction_cache', False)
+        return quietly(
+            kg.KnowledgeGraphBuilder,
+            cache_dir=str(tmp_path / 'cache'),
+            build_config=kg.GraphBuildConfig(**config)
+        )
+    return make
+
+
+@pytest.fixture
+def build_graph(make_builder):
+    """Return a function that builds a graph and returns ``(builder, result)``."""
+    def build(sources: List[Dict[str, Any]], **config):
+        builder = make_builder(**config)
+        result = quietly(builder.build_graph_from_sources, sources)
+        assert result['success'], result.get('error')
+        return builder, result
+    return build
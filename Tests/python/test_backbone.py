@@ -0,0 +1,83 @@
+"""Tests for disparity-filter backbone extraction."""
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from conftest import edge_weights, phrase_sources
+from test_graph_store import store_from_networkx
+
+
+def heavy_tailed_graph(seed):
+    graph = nx.barabasi_albert_graph(120, 3, seed=seed)
+    rng = np.random.default_rng(seed)
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = int(rng.pareto(1.5) * 3) + 1
+    return graph
+
+
+def reference_backbone(graph, alpha):
+    """Serrano et al.: keep an edge if 1 - (k - 1)∫₀^(w/s) (1 - x)^(k - 2) dx < alpha at either endpoint."""
+    def significant(node, weight):
+        degree = graph.degree(node)
+        if degree <= 1:
+            return False
+        share = weight / graph.degree(node, weight='weight')
+        integral, _ = quad(lambda x: (1 - x) ** (degree - 2), 0, share)
+        return 1 - (degree - 1) * integral < alpha
+    
+    return {
+        frozenset((u, v)): weight for u, v, weight in graph.edges(data='weight')
+        if significant(u, weight) or significant(v, weight)
+    }
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('alpha', [0.05, 0.2, 0.5])
+def test_backbone_matches_reference(seed, alpha):
+    graph = heavy_tailed_graph(seed)
+    
+    backbone = store_from_networkx(graph).disparity_filter(alpha)
+    
+    assert {frozenset((u, v)): weight for u, v, weight in backbone.edges()} == reference_backbone(graph, alpha)
+    assert backbone.nodes() == list(graph.nodes())
+    # Both entries of every kept edge survive, so the store stays symmetric
+    assert backbone.number_of_edges() * 2 == len(backbone.indices)
+
+
+def test_stricter_alpha_keeps_a_subset():
+    store = store_from_networkx(heavy_tailed_graph(0))
+    
+    edges = [set(store.disparity_filter(alpha).edges()) for alpha in (0.01, 0.05, 0.2, 1.0)]
+    assert edges[0] <= edges[1] <= edges[2] <= edges[3]
+    assert len(edges[0]) < len(edges[3])
+
+
+def test_leaves_do_not_test_their_edge():
+    star = nx.star_graph(4)
+    nx.set_edge_attributes(star, 1, 'weight')
+    star[0][1]['weight'] = 50
+    
+    # The hub's uniform split (p = 0.75 ** 3) is not significant; leaves cannot vote
+    assert store_from_networkx(nx.star_graph(4)).disparity_filter(0.3).number_of_edges() == 0
+    assert store_from_networkx(star).disparity_filter(0.05).edges() == [(0, 1, 50)]
+
+
+def test_builder_backbone_is_a_subgraph(build_graph):
+    sources = phrase_sources(30, 3, [f'topic{i} area{i % 6}' for i in range(40)], per_source=5)
+    full_builder, full = build_graph(sources)
+    builder, backbone = build_graph(sources, backbone_alpha=0.3)
+    
+    full_edges = edge_weights(full)
+    backbone_edges = edge_weights(backbone)
+    assert backbone_edges and len(backbone_edges) < len(full_edges)
+    assert all(full_edges[pair] == weight for pair, weight in backbone_edges.items())
+    assert len(backbone['nodes']) == len(full['nodes'])
+    
+    stats = backbone['metadata']['backbone']
+    assert stats['enabled'] and stats['alpha'] == 0.3
+    assert stats['retained_edges'] == builder.graph.number_of_edges()
+    assert stats['retained_edges'] + stats['removed_edges'] == full_builder.graph.number_of_edges()
+    assert stats['isolated_nodes'] == int((builder.graph.degrees() == 0).sum())
+    assert full['metadata']['backbone'] == {'enabled': False}
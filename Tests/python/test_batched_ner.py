@@ -0,0 +1,67 @@
+"""Tests for token-bounded NER windows and batched transformer NER."""
+
+import re
+
+from conftest import kg
+
+
+class CharacterTokenizer:
+    """Fast-tokenizer stand-in that splits words into two-character subword tokens."""
+    
+    def __call__(self, text, add_special_tokens=False, return_offsets_mapping=True):
+        offsets = []
+        for match in re.finditer(r'\S+', text):
+            for start in range(match.start(), match.end(), 2):
+                offsets.append((start, min(start + 2, match.end())))
+        return {'offset_mapping': offsets}
+
+
+class KeywordPipeline:
+    """NER pipeline stand-in that tags capitalized words and records its calls."""
+    
+    tokenizer = CharacterTokenizer()
+    
+    def __init__(self):
+        self.calls = []
+    
+    def __call__(self, windows, batch_size):
+        self.calls.append((list(windows), batch_size))
+        return [
+            [{'word': word, 'score': 0.95 if word != 'Maybe' else 0.5} for word in re.findall(r'\b[A-Z]\w+', window)]
+            for window in windows
+        ]
+
+
+def test_windows_cover_the_text_within_the_token_limit():
+    text = ' '.join(f'word{i}' for i in range(200))
+    tokenizer = CharacterTokenizer()
+    windows = kg._token_windows(text, tokenizer, window_tokens=40, overlap_tokens=8)
+    
+    assert len(windows) > 1
+    assert windows[0].startswith('word0 ') and windows[-1].endswith('word199')
+    for window in windows:
+        assert len(tokenizer(window)['offset_mapping']) <= 40
+        assert text.find(window) >= 0  # windows end on word boundaries
+    words = set(text.split())
+    assert set(word for window in windows for word in window.split()) == words
+    # Consecutive windows overlap
+    assert all(set(first.split()) & set(second.split()) for first, second in zip(windows, windows[1:]))
+
+
+def test_short_text_is_a_single_window():
+    assert kg._token_windows('a short text', CharacterTokenizer(), 40, 8) == ['a short text']
+    assert kg._token_windows('a short text', None, 40, 8) == ['a short text']
+
+
+def test_batched_ner_finds_entities_beyond_the_first_window(make_builder):
+    builder = make_builder(ner_window_tokens=30, ner_window_overlap=6, ner_batch_size=4)
+    builder.ner_pipeline = KeywordPipeline()
+    filler = ' '.join(['filler'] * 80)
+    texts = [f'Ada wrote {filler} Turing Maybe', '', 'Hopper']
+    
+    entities = builder._extract_named_entities_batched(texts)
+    
+    assert entities == [['Ada', 'Turing'], [], ['Hopper']]
+    (windows, batch_size), = builder.ner_pipeline.calls
+    assert batch_size == 4
+    assert len(windows) > 2  # one call over the windows of every document
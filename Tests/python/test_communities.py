@@ -0,0 +1,101 @@
+"""Tests for label-propagation community detection on the CSR graph."""
+
+import networkx as nx
+import numpy as np
+import pytest
+from networkx.algorithms.community import modularity
+
+from conftest import kg, phrase_sources
+from test_graph_store import store_from_networkx
+
+
+def grouped(labels, nodes):
+    return {frozenset(np.asarray(nodes)[labels == community].tolist()) for community in range(labels.max() + 1)}
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_planted_partition_is_recovered(seed):
+    graph = nx.planted_partition_graph(8, 30, 0.6, 0.005, seed=seed)
+    store = store_from_networkx(graph)
+    
+    labels, rounds = store.label_propagation()
+    
+    assert 0 < rounds < 100
+    assert grouped(labels, store.nodes()) == {frozenset(block) for block in graph.graph['partition']}
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_sparser_partitions_are_mostly_recovered(seed):
+    graph = nx.planted_partition_graph(8, 30, 0.4, 0.005, seed=seed)
+    store = store_from_networkx(graph)
+    blocks = graph.graph['partition']
+    
+    labels, _ = store.label_propagation()
+    
+    # Label propagation may split or merge a block, but never scrambles the partition
+    communities = grouped(labels, store.nodes())
+    matched = sum(max(len(community & block) for block in blocks) for community in communities)
+    assert matched >= 0.85 * graph.number_of_nodes()
+    assert store.modularity(labels) >= 0.95 * modularity(graph, blocks)
+
+
+def test_communities_are_numbered_by_size():
+    graph = nx.disjoint_union_all([nx.complete_graph(3), nx.complete_graph(6), nx.complete_graph(4)])
+    graph.add_node(13)
+    store = store_from_networkx(graph)
+    
+    labels, _ = store.label_propagation()
+    assert labels.tolist() == [2] * 3 + [0] * 6 + [1] * 4 + [3]
+
+
+def test_propagation_is_seeded_and_bounded():
+    store = store_from_networkx(nx.karate_club_graph())
+    
+    labels, rounds = store.label_propagation(seed=7)
+    again, _ = store.label_propagation(seed=7)
+    assert np.array_equal(labels, again)
+    _, capped = store.label_propagation(max_iterations=1)
+    assert capped == 1 and rounds >= 1
+    assert kg.GraphStore().label_propagation()[1] == 0
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_modularity_matches_networkx(seed):
+    graph = nx.planted_partition_graph(5, 20, 0.3, 0.02, seed=seed)
+    rng = np.random.default_rng(seed)
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = int(rng.integers(1, 5))
+    store = store_from_networkx(graph)
+    
+    labels, _ = store.label_propagation()
+    assert store.modularity(labels) == pytest.approx(modularity(graph, grouped(labels, store.nodes()), weight='weight'))
+    random_labels = rng.integers(0, 5, graph.number_of_nodes())
+    assert store.modularity(random_labels) == pytest.approx(
+        modularity(graph, [set(np.flatnonzero(random_labels == c).tolist()) for c in range(5)], weight='weight')
+    )
+    assert kg.GraphStore([1, 2]).modularity(np.array([0, 1])) == 0.0
+
+
+def test_built_graph_reports_communities(build_graph):
+    first = [f'alpha{i} beta{i % 4}' for i in range(15)]
+    second = [f'gamma{i} delta{i % 4}' for i in range(15)]
+    sources = phrase_sources(20, 1, first) + phrase_sources(20, 2, second)
+    for source in sources:
+        # Shared title words would connect the two topics
+        source['title'] = ''
+    builder, result = build_graph(sources)
+    _, disabled = build_graph(sources, detect_communities=False)
+    
+    communities = {node['label']: int(node['properties']['community']) for node in result['nodes']}
+    assert set(communities) == {node['label'] for node in result['nodes']}
+    # No community mixes the two disjoint topics
+    for community in set(communities.values()):
+        members = ' '.join(label for label, value in communities.items() if value == community)
+        assert not ('alpha' in members and 'gamma' in members)
+    
+    stats = result['metadata']['communities']
+    assert stats['enabled'] and stats['count'] == len(set(communities.values()))
+    labels = np.array([builder.communities[node_id] for node_id in builder.graph.nodes()])
+    assert stats['modularity'] == pytest.approx(builder.graph.modularity(labels))
+    assert disabled['metadata']['communities'] == {'enabled': False}
+    assert {node['properties']['community'] for node in disabled['nodes']} == {'-1'}
@@ -0,0 +1,111 @@
+"""Tests for concept canonicalization and alias-aware label matching."""
+
+import pytest
+
+from conftest import edge_weights, kg, phrase_sources, quietly
+
+SINGULAR = ['quantum matrix', 'neural network', 'graph vertex', 'deep learning',
+            'search engine', 'memory cache', 'token stream']
+PLURAL = ['quantum matrices', 'neural networks', 'graph vertices', 'deep learning',
+          'search engines', 'memory caches', 'token streams']
+
+
+def linked_labels(result):
+    labels = {node['id']: node['label'] for node in result['nodes']}
+    return {labels[edge[key]] for edge in result['edges'] for key in ('source_id', 'target_id')}
+
+
+@pytest.mark.parametrize('phrase, canonical', [
+    ('Neural  Networks', 'neural network'),
+    ('search engines', 'search engine'),
+    ('technologies', 'technology'),
+    ('quantum matrices', 'quantum matrix'),
+    ('graph vertices', 'graph vertex'),
+    ('sparse indexes', 'sparse index'),
+    ('data', 'data'),
+    ('robotics', 'robotics'),
+    ('class', 'class'),
+    ('analysis', 'analysis'),
+    ('gas', 'gas')
+])
+def test_head_word_is_singularized(phrase, canonical):
+    canonicalizer = kg.ConceptCanonicalizer()
+    canonicalizer._wordnet = None  # suffix rules, independent of installed NLTK data
+    assert canonicalizer.canonicalize(phrase) == canonical
+
+
+def test_aliases_are_recorded_per_source_and_can_be_forgotten():
+    canonicalizer = kg.ConceptCanonicalizer()
+    first = ['neural networks', 'neural network', 'graph']
+    second = ['neural networks', 'Neural Networks']
+    
+    assert canonicalizer.canonicalize_all(first) == ['neural network', 'graph']
+    assert canonicalizer.canonicalize_all(second) == ['neural network']
+    assert canonicalizer.aliases('neural network') == ['neural networks', 'Neural Networks']
+    assert canonicalizer.spellings('neural network') == ['neural networks']
+    assert canonicalizer.surface_forms(second) == second
+    
+    canonicalizer.forget_aliases(canonicalizer.surface_forms(second))
+    assert canonicalizer.aliases('neural network') == ['neural networks']
+    canonicalizer.forget_aliases(canonicalizer.surface_forms(first))
+    assert canonicalizer.aliases('neural network') == []
+    assert 'neural network' not in canonicalizer.alias_counts
+
+
+def test_variants_become_one_node_with_aliases(build_graph):
+    sources = phrase_sources(20, 4, SINGULAR) + phrase_sources(20, 5, PLURAL)
+    _, merged = build_graph(sources, vectorized_fallback=False)
+    _, separate = build_graph(sources, vectorized_fallback=False, canonicalize_concepts=False)
+    
+    merged_labels = {node['label']: node for node in merged['nodes']}
+    separate_labels = {node['label'] for node in separate['nodes']}
+    assert 'neural networks' in separate_labels and 'neural network' in separate_labels
+    assert 'neural networks' not in merged_labels
+    assert 'neural networks' in merged_labels['neural network']['properties']['aliases']
+
+
+def test_label_matcher_reports_labels_for_extra_spellings():
+    matcher = kg.LabelMatcher(['matrix', 'network'], spellings={0: ['matrices'], 1: ['networks']})
+    assert matcher.find_labels('quantum matrices and neural networks') == {0, 1}
+    assert sorted(matcher.find_label_positions('two matrices')) == [(4, 0)]
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+@pytest.mark.parametrize('word_boundaries', [False, True])
+@pytest.mark.parametrize('window', ['document', 'sentence'])
+def test_canonical_concept_absent_from_text_still_gets_edges(build_graph, vectorized, word_boundaries, window):
+    sources = phrase_sources(30, 0, PLURAL)
+    assert not any('quantum matrix' in source['content'] for source in sources)
+    
+    _, result = build_graph(
+        sources,
+        vectorized_fallback=vectorized,
+        cooccurrence_word_boundaries=word_boundaries,
+        cooccurrence_window=window
+    )
+    
+    linked = linked_labels(result)
+    assert 'quantum matrix' in linked
+    assert 'neural network' in linked
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+@pytest.mark.parametrize('word_boundaries', [False, True])
+@pytest.mark.parametrize('window', ['document', 'tokens'])
+def test_incremental_update_rescans_new_alias_spellings(build_graph, vectorized, word_boundaries, window):
+    config = dict(
+        vectorized_fallback=vectorized,
+        cooccurrence_word_boundaries=word_boundaries,
+        cooccurrence_window=window
+    )
+    base = phrase_sources(20, 1, SINGULAR)
+    extra = phrase_sources(6, 3, PLURAL)
+    builder, result = build_graph(base, **config)
+    
+    added = quietly(builder.add_sources, extra)
+    _, full = build_graph(base + extra, **config)
+    assert added['metadata']['incremental_update']['applied']
+    assert edge_weights(added) == edge_weights(full)
+    
+    removed = quietly(builder.remove_sources, extra)
+    assert edge_weights(removed) == edge_weights(result)
@@ -0,0 +1,36 @@
+"""Tests for the sparse and dictionary co-occurrence counting backends."""
+
+import random
+
+import pytest
+
+from conftest import edge_weights, phrase_sources
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('min_weight', [1, 2, 3])
+def test_sparse_counts_match_dict_counts(make_builder, seed, min_weight):
+    rng = random.Random(seed)
+    label_count = 40
+    rows = [sorted(rng.sample(range(label_count), rng.randint(0, 12))) for _ in range(60)]
+    builder = make_builder()
+    
+    sparse = builder._count_cooccurrence_sparse(rows, label_count, min_weight)
+    dictionary = builder._count_cooccurrence_dict(rows, min_weight)
+    assert sorted(sparse) == sorted(dictionary)
+    assert sparse == sorted(sparse)  # row-major order
+    assert all(isinstance(weight, int) for _, _, weight in sparse)
+
+
+def test_sparse_counts_handle_empty_input(make_builder):
+    builder = make_builder()
+    assert builder._count_cooccurrence_sparse([], 5, 2) == []
+    assert builder._count_cooccurrence_sparse([[], []], 0, 2) == []
+
+
+def test_backends_build_identical_graphs(build_graph):
+    sources = phrase_sources(30, 0, [f'topic{i} area{i % 7}' for i in range(40)], per_source=5)
+    _, sparse = build_graph(sources, cooccurrence_backend='sparse')
+    _, dictionary = build_graph(sources, cooccurrence_backend='dict')
+    assert edge_weights(sparse) == edge_weights(dictionary)
+    assert sparse['edges']
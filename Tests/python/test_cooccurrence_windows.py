@@ -0,0 +1,105 @@
+"""Tests for the sentence and token sliding-window co-occurrence modes."""
+
+import random
+import re
+from collections import Counter
+
+import pytest
+
+from conftest import edge_weights, kg, phrase_sources
+
+WORDS = ['graph', 'node', 'edge', 'rank', 'path', 'tree', 'cut', 'flow', 'walk', 'core']
+LABELS = ['graph', 'node', 'edge', 'graph node', 'rank', 'path', 'tree', 'flow walk', 'cut', 'ran']
+
+
+def random_document(rng, sentences=6):
+    return ' '.join(
+        ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 9))) + rng.choice(['.', '!', '?', '\n'])
+        for _ in range(sentences)
+    )
+
+
+def reference_pairs(text, labels, window, width, word_boundaries):
+    """Brute force: locate every occurrence by regex and compare window positions pairwise."""
+    sentence_ends = [match.end() for match in re.finditer(r'[.!?]+(?=\s|$)|\n+', text)]
+    token_starts = [match.start() for match in re.finditer(r'\w+', text)]
+    occurrences = []
+    for index, label in enumerate(labels):
+        pattern = rf'(?<!\w){re.escape(label)}(?!\w)' if word_boundaries else re.escape(label)
+        for match in re.finditer(f'(?=({pattern}))', text):
+            start = match.start()
+            if window == 'sentence':
+                position = sum(end <= start for end in sentence_ends)
+            else:
+                position = sum(token <= start for token in token_starts)
+            occurrences.append((position, index))
+    
+    pairs = set()
+    for position1, label1 in occurrences:
+        for position2, label2 in occurrences:
+            if label1 < label2 and abs(position1 - position2) < width:
+                pairs.add((label1, label2))
+    return pairs
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('window, width', [('sentence', 1), ('tokens', 1), ('tokens', 3), ('tokens', 8)])
+@pytest.mark.parametrize('word_boundaries', [False, True])
+def test_window_pairs_match_brute_force(make_builder, seed, window, width, word_boundaries):
+    builder = make_builder(
+        cooccurrence_window=window,
+        cooccurrence_window_tokens=width,
+        cooccurrence_word_boundaries=word_boundaries
+    )
+    matcher = kg.LabelMatcher(LABELS, word_boundaries=word_boundaries)
+    text = random_document(random.Random(seed))
+    
+    expected = reference_pairs(text, LABELS, window, width, word_boundaries)
+    assert builder._document_window_pairs(text, matcher) == expected
+
+
+def test_window_counts_pairs_once_per_document(make_builder):
+    builder = make_builder()
+    document_pairs = [{(0, 1), (1, 2)}, {(0, 1)}, {(0, 1), (1, 2)}, {(2, 3)}]
+    
+    assert builder._count_cooccurrence_windowed(document_pairs, 2) == [(0, 1, 3), (1, 0, 3), (1, 2, 2), (2, 1, 2)]
+
+
+def test_unknown_window_raises(make_builder):
+    builder = make_builder(cooccurrence_window='paragraph')
+    with pytest.raises(ValueError):
+        builder._window_positions('text', [0])
+
+
+def test_wide_token_window_matches_document_mode(build_graph):
+    phrases = [f'topic{i} area{i % 5}' for i in range(30)]
+    sources = phrase_sources(25, 1, phrases, per_source=4)
+    
+    _, document = build_graph(sources)
+    _, tokens = build_graph(sources, cooccurrence_window='tokens', cooccurrence_window_tokens=10_000)
+    assert edge_weights(tokens) == edge_weights(document)
+    assert document['edges']
+
+
+def test_sentence_window_only_links_labels_sharing_a_sentence(build_graph):
+    phrases = [f'topic{i} area{i % 5}' for i in range(30)]
+    sources = phrase_sources(25, 2, phrases, per_source=4)
+    
+    builder, sentence = build_graph(sources, cooccurrence_window='sentence')
+    _, document = build_graph(sources)
+    sentence_edges = edge_weights(sentence)
+    document_edges = edge_weights(document)
+    
+    assert sentence_edges and len(sentence_edges) < len(document_edges)
+    for pair, weight in sentence_edges.items():
+        assert weight <= document_edges[pair]
+    
+    # Every windowed weight is the number of sources with a sentence holding both labels
+    labels = {node['id']: node['label'].lower() for node in sentence['nodes']}
+    counts = Counter()
+    for source in sources:
+        text = (source['content'] + ' ' + source['title']).lower()
+        for source_id, target_id in sentence_edges:
+            if any(labels[source_id] in part and labels[target_id] in part for part in re.split(r'[.!?]', text)):
+                counts[source_id, target_id] += 1
+    assert dict(counts) == sentence_edges
@@ -0,0 +1,106 @@
+"""Tests for k-core pruning ahead of centrality and the MST."""
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.stats import spearmanr
+
+from conftest import kg, phrase_sources, quietly
+
+
+def store_from_networkx(graph):
+    node_ids = list(graph.nodes())
+    position = {node_id: index for index, node_id in enumerate(node_ids)}
+    rows, cols, weights = [], [], []
+    for u, v, weight in graph.edges(data='weight', default=1):
+        rows += [position[u], position[v]]
+        cols += [position[v], position[u]]
+        weights += [weight, weight]
+    return kg.GraphStore(node_ids, rows, cols, weights)
+
+
+def core_with_leaves(seed=1):
+    """Return a dense random core with 25 leaves hanging off it."""
+    rng = np.random.default_rng(seed)
+    graph = nx.Graph(nx.gnp_random_graph(40, 0.2, seed=seed).edges())
+    for leaf in range(40, 65):
+        graph.add_edge(leaf, int(rng.integers(0, 40)))
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = int(rng.integers(1, 4))
+    return graph
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('k', [1, 2, 3, 5])
+def test_k_core_mask_matches_networkx(seed, k):
+    graph = nx.gnp_random_graph(80, 0.05, seed=seed)
+    store = store_from_networkx(graph)
+    
+    mask = store.k_core_mask(k)
+    assert set(np.asarray(store.nodes())[mask].tolist()) == set(nx.k_core(graph, k).nodes())
+
+
+def analysed_builder(make_builder, graph, prune_core_k):
+    builder = make_builder(prune_core_k=prune_core_k)
+    builder.graph = store_from_networkx(graph)
+    quietly(builder._prune_graph)
+    quietly(builder._calculate_centrality_metrics)
+    quietly(builder._score_pruned_nodes)
+    return builder
+
+
+def test_pruned_nodes_get_scores_close_to_the_full_computation(make_builder):
+    graph = core_with_leaves()
+    full = analysed_builder(make_builder, graph, 0)
+    pruned = analysed_builder(make_builder, graph, 2)
+    
+    core = set(nx.k_core(graph, 2).nodes())
+    assert set(pruned.core_graph.nodes()) == core
+    assert pruned.pruned_nodes == set(graph.nodes()) - core
+    assert pruned.pruning_stats == {
+        'enabled': True, 'k': 2, 'core_nodes': len(core), 'pruned_nodes': len(graph) - len(core), 'applied': True
+    }
+    assert full.pruning_stats == {'enabled': False} and full.core_graph is full.graph
+    
+    nodes = list(graph.nodes())
+    for metric in ('pagerank', 'eigenvector', 'betweenness', 'closeness'):
+        assert set(pruned.centrality_scores[metric]) == set(nodes)
+    # Leaves lie on no shortest path, so zero betweenness is exact
+    for node in pruned.pruned_nodes:
+        assert pruned.centrality_scores['betweenness'][node] == 0.0 == full.centrality_scores['betweenness'][node]
+    leaves = [node for node in pruned.pruned_nodes if graph.degree(node) == 1 and next(iter(graph[node])) in core]
+    assert leaves
+    for node in leaves:
+        assert pruned.centrality_scores['eigenvector'][node] == pytest.approx(
+            full.centrality_scores['eigenvector'][node], rel=0.1
+        )
+    # Core and pruned PageRank share one scale, so the vector stays a distribution
+    assert sum(pruned.centrality_scores['pagerank'].values()) == pytest.approx(1.0)
+    assert sum(abs(pruned.centrality_scores['pagerank'][node] - full.centrality_scores['pagerank'][node])
+               for node in nodes) < 0.2
+    for metric in ('pagerank', 'closeness'):
+        correlation = spearmanr(
+            [full.centrality_scores[metric][node] for node in nodes],
+            [pruned.centrality_scores[metric][node] for node in nodes]
+        ).correlation
+        assert correlation > 0.9
+
+
+def test_empty_core_analyses_the_full_graph(make_builder):
+    graph = nx.path_graph(10)
+    builder = analysed_builder(make_builder, graph, 2)
+    
+    assert builder.core_graph is builder.graph and not builder.pruned_nodes
+    assert builder.pruning_stats['applied'] is False
+    assert builder.centrality_scores['pagerank'] == pytest.approx(nx.pagerank(graph, tol=1e-6), abs=1e-5)
+
+
+def test_built_graph_flags_pruned_nodes(build_graph):
+    sources = phrase_sources(30, 10, [f'topic{i} area{i % 6}' for i in range(40)], per_source=5)
+    builder, result = build_graph(sources, prune_core_k=3)
+    
+    assert builder.pruned_nodes
+    assert len(result['nodes']) == builder.graph.number_of_nodes()
+    flagged = {node['label'] for node in result['nodes'] if node['properties']['pruned'] == 'true'}
+    assert flagged == {builder.nodes.labels[node_id] for node_id in builder.pruned_nodes}
+    assert result['metadata']['pruning']['pruned_nodes'] == len(flagged)
@@ -0,0 +1,113 @@
+"""Tests for per-document NLTK analysis shared by concept and entity extraction."""
+
+import re
+
+import pytest
+
+from conftest import kg
+
+
+@pytest.fixture
+def fake_nltk(monkeypatch):
+    """Replace NLTK's tokenizer, tagger and chunker with recording stand-ins."""
+    calls = {'tokenize': [], 'tag': [], 'chunk': []}
+    
+    def word_tokenize(text):
+        calls['tokenize'].append(text)
+        # Like the Treebank tokenizer: split off "n't" and trailing punctuation
+        tokens = []
+        for word in text.split():
+            tokens += [part for part in re.fullmatch(r"(.*?)(n't)?([!.,?]*)", word).groups() if part]
+        return tokens
+    
+    def pos_tag(tokens):
+        calls['tag'].append(list(tokens))
+        # Case-sensitive like the perceptron tagger: capitalized words become proper nouns
+        return [(token, 'NNP' if token[:1].isupper() else ('VB' if token == 'runs' else 'NN')) for token in tokens]
+    
+    def ne_chunk(tagged_tokens):
+        calls['chunk'].append(list(tagged_tokens))
+        return []
+    
+    monkeypatch.setattr(kg, 'NLTK_AVAILABLE', True)
+    monkeypatch.setattr(kg, 'word_tokenize', word_tokenize, raising=False)
+    monkeypatch.setattr(kg, 'pos_tag', pos_tag, raising=False)
+    monkeypatch.setattr(kg, 'ne_chunk', ne_chunk, raising=False)
+    return calls
+
+
+def test_both_views_share_one_lazy_tagging_pass(fake_nltk):
+    analysis = kg.DocumentAnalysis("Graph Search runs fast")
+    assert fake_nltk['tag'] == []
+    
+    analysis.lowercase_tagged_tokens
+    analysis.tagged_tokens
+    analysis.lowercase_tagged_tokens
+    assert fake_nltk['tag'] == [['Graph', 'Search', 'runs', 'fast']]
+    assert analysis.tagged_tokens == [('Graph', 'NNP'), ('Search', 'NNP'), ('runs', 'VB'), ('fast', 'NN')]
+
+
+def test_lowercase_view_splits_tokens_and_keeps_their_tags(fake_nltk):
+    analysis = kg.DocumentAnalysis("Don't index Sparse-Graphs!")
+    assert analysis.lowercase_tagged_tokens == [
+        ('do', 'NNP'), ('n', 'NN'), ('t', 'NN'), ('index', 'NN'), ('sparse', 'NNP'), ('graphs', 'NNP')
+    ]
+
+
+def test_shared_tags_differ_from_tagging_the_lowercased_text(fake_nltk):
+    """Record the known differences to tagging the cleaned, lowercased text on its own."""
+    text = "Don't index Sparse-Graphs!"
+    shared = kg.DocumentAnalysis(text).lowercase_tagged_tokens
+    separate = kg.pos_tag(kg.word_tokenize(re.sub(r'[^\w\s]', ' ', text.lower())))
+    
+    # Contractions follow the tokenizer instead of the punctuation cleaning
+    assert [token for token, _ in separate] == ['don', 't', 'index', 'sparse', 'graphs']
+    assert [token for token, _ in shared] == ['do', 'n', 't', 'index', 'sparse', 'graphs']
+    # Capitalized words keep their proper-noun tags, which still count as nouns
+    assert dict(separate)['sparse'] == 'NN' and dict(shared)['sparse'] == 'NNP'
+    # The contraction no longer leaves a "don" concept behind
+    assert kg._concepts_from_tagged_tokens(separate, set()) == ['don', 'index sparse graphs']
+    assert kg._concepts_from_tagged_tokens(shared, set()) == ['index sparse graphs']
+
+
+def test_source_features_tag_the_content_once(fake_nltk):
+    concepts, entities = kg._extract_source_features(
+        "Sparse Graph runs", "Search Engine", set(), extract_entities=True
+    )
+    
+    assert concepts == ['search engine', 'sparse graph']
+    assert entities == []
+    assert fake_nltk['tag'] == [['Sparse', 'Graph', 'runs'], ['Search', 'Engine']]
+    assert fake_nltk['chunk'] == [[('Sparse', 'NNP'), ('Graph', 'NNP'), ('runs', 'VB')]]
+
+
+def test_source_features_skip_entity_chunking_without_nltk_ner(fake_nltk):
+    kg._extract_source_features("Sparse Graph runs", "", set(), extract_entities=False)
+    assert fake_nltk['tag'] == [['Sparse', 'Graph', 'runs']]
+    assert fake_nltk['chunk'] == []
+
+
+def test_source_features_without_nltk_do_no_tagging(fake_nltk, monkeypatch):
+    monkeypatch.setattr(kg, 'NLTK_AVAILABLE', False)
+    concepts, entities = kg._extract_source_features("Sparse graphs", "", set(), extract_entities=True)
+    
+    assert concepts == sorted(set(kg._simple_concept_extraction("sparse graphs ", set())))
+    assert entities == [] and fake_nltk['tag'] == []
+
+
+def test_entities_are_chunked_from_the_case_preserving_tags(fake_nltk, monkeypatch):
+    class Chunk(list):
+        def label(self):
+            return 'PERSON'
+    
+    monkeypatch.setattr(kg, 'ne_chunk', lambda tagged: [Chunk([('Ada', 'NNP'), ('Lovelace', 'NNP')]), ('wrote', 'VB')])
+    assert kg._extract_nltk_entities("Ada Lovelace wrote") == ['Ada Lovelace']
+
+
+def test_concepts_fall_back_to_simple_extraction_when_tagging_fails(fake_nltk, monkeypatch):
+    def failing_tagger(tokens):
+        raise LookupError('tagger data missing')
+    
+    monkeypatch.setattr(kg, 'pos_tag', failing_tagger)
+    concepts = kg._extract_text_concepts("Sparse graphs, fast!", set())
+    assert concepts == sorted(set(kg._simple_concept_extraction("sparse graphs  fast ", set())))
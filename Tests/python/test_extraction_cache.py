@@ -0,0 +1,53 @@
+"""Tests for the content-addressed per-source extraction cache."""
+
+import os
+
+from conftest import kg, phrase_sources, quietly
+
+PHRASES = ['sparse graph', 'search engine', 'token stream', 'memory cache', 'vector space']
+
+
+def test_round_trip_and_hit_counters(tmp_path):
+    cache = kg.ExtractionCache(str(tmp_path / 'cache.sqlite3'), max_bytes=1 << 20)
+    key = kg.ExtractionCache.make_key('content', 'title', 'sig')
+    
+    assert cache.get_many([key]) == {}
+    cache.put_many({key: (['graph'], ['Ada'])})
+    assert cache.get_many([key, key]) == {key: (['graph'], ['Ada'])}
+    assert cache.stats()['hits'] == 2 and cache.stats()['misses'] == 1
+
+
+def test_keys_depend_on_content_title_and_signature():
+    key = kg.ExtractionCache.make_key('content', 'title', 'sig')
+    assert key != kg.ExtractionCache.make_key('content', 'title', 'other')
+    assert key != kg.ExtractionCache.make_key('content!', 'title', 'sig')
+    # Field separators keep ("ab", "c") and ("a", "bc") apart
+    assert kg.ExtractionCache.make_key('c', 'ab', 's') != kg.ExtractionCache.make_key('bc', 'a', 's')
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = kg.ExtractionCache(str(tmp_path / 'cache.sqlite3'), max_bytes=300)
+    quietly(cache.put_many, {'old': ([os.urandom(16).hex() for _ in range(10)], [])})
+    quietly(cache.put_many, {'new': ([os.urandom(16).hex() for _ in range(10)], [])})
+    
+    assert cache.evictions >= 1
+    assert 'old' not in cache.get_many(['old', 'new'])
+
+
+def test_unusable_database_disables_the_cache(tmp_path):
+    cache = quietly(kg.ExtractionCache, str(tmp_path), max_bytes=1 << 20)  # a directory, not a file
+    quietly(cache.put_many, {'key': (['graph'], [])})
+    assert cache.get_many(['key']) == {}
+    assert not cache.stats()['enabled']
+
+
+def test_second_build_is_served_from_the_cache_with_identical_output(build_graph):
+    sources = phrase_sources(20, 0, PHRASES, per_source=3)
+    builder, first = build_graph(sources, enable_extraction_cache=True, vectorized_fallback=False)
+    assert os.path.exists(builder.extraction_cache.path)
+    
+    _, second = build_graph(sources, enable_extraction_cache=True, vectorized_fallback=False)
+    stats = second['metadata']['extraction_cache']
+    assert stats['hits'] == len(sources) and stats['misses'] == 0
+    assert second['nodes'] == first['nodes']
+    assert second['edges'] == first['edges']
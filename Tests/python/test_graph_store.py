@@ -0,0 +1,172 @@
+"""Tests for the symmetric CSR graph store."""
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from conftest import kg
+
+
+def store_from_networkx(graph):
+    """Build a GraphStore holding the same nodes and weighted edges as ``graph``."""
+    node_ids = list(graph.nodes())
+    position = {node_id: index for index, node_id in enumerate(node_ids)}
+    rows, cols, weights = [], [], []
+    for u, v, weight in graph.edges(data='weight', default=1):
+        rows += [position[u], position[v]]
+        cols += [position[v], position[u]]
+        weights += [weight, weight]
+    return kg.GraphStore(node_ids, rows, cols, weights)
+
+
+def random_graph(node_count=60, probability=0.08, seed=3):
+    graph = nx.gnp_random_graph(node_count, probability, seed=seed)
+    # Non-contiguous node IDs in shuffled order exercise the position mapping
+    ids = np.random.default_rng(seed).permutation(node_count * 3)[:node_count].tolist()
+    graph = nx.relabel_nodes(graph, dict(enumerate(ids)))
+    for index, (u, v) in enumerate(graph.edges()):
+        graph[u][v]['weight'] = 1 + index % 7
+    return graph
+
+
+def test_edges_match_the_networkx_graph():
+    graph = random_graph()
+    store = store_from_networkx(graph)
+    
+    assert store.number_of_nodes() == graph.number_of_nodes()
+    assert store.number_of_edges() == graph.number_of_edges()
+    assert store.nodes() == list(graph.nodes())
+    assert {frozenset((u, v)): w for u, v, w in store.edges()} == {
+        frozenset((u, v)): w for u, v, w in graph.edges(data='weight')
+    }
+    assert len(store.directed_edges()) == 2 * graph.number_of_edges()
+    
+    nodes = list(graph.nodes())
+    for u in nodes[:15]:
+        for v in nodes:
+            assert store.has_edge(u, v) == graph.has_edge(u, v)
+    assert not store.has_edge(nodes[0], -1)
+    assert -1 not in store and nodes[0] in store
+
+
+def test_neighbor_lists_are_sorted_by_position():
+    store = store_from_networkx(random_graph())
+    
+    for row in range(store.number_of_nodes()):
+        neighbors = store.indices[store.indptr[row]:store.indptr[row + 1]]
+        assert np.all(np.diff(neighbors) > 0)
+
+
+def test_degrees_and_entry_weights():
+    graph = random_graph()
+    store = store_from_networkx(graph)
+    
+    assert store.degrees().tolist() == [graph.degree(node) for node in store.nodes()]
+    assert store.weighted_degrees().tolist() == [graph.degree(node, weight='weight') for node in store.nodes()]
+    
+    u, v, weight = store.edges()[5]
+    rows, cols = store.positions([u, v]), store.positions([v, u])
+    assert store.entry_weights(rows, cols).tolist() == [weight, weight]
+    assert store.positions([u, -1]).tolist() == [rows[0], -1]
+    assert store.density() == nx.density(graph)
+
+
+def test_remove_nodes_and_subgraph_match_networkx():
+    graph = random_graph()
+    store = store_from_networkx(graph)
+    removed = list(graph.nodes())[::4]
+    
+    store.remove_nodes(removed + [-1])
+    graph.remove_nodes_from(removed)
+    
+    assert store.nodes() == list(graph.nodes())
+    assert nx.utils.edges_equal(store.edges(), graph.edges(data='weight'))
+    assert all(store.has_edge(u, v) for u, v in graph.edges())
+    
+    keep = store.degrees() >= 2
+    subgraph = store.subgraph(keep)
+    expected = graph.subgraph(np.asarray(store.nodes())[keep].tolist())
+    assert subgraph.nodes() == [node for node in store.nodes() if node in expected]
+    assert nx.utils.graphs_equal(subgraph.to_networkx(), nx.Graph(expected))
+    # The original store is left untouched
+    assert store.number_of_nodes() == graph.number_of_nodes()
+
+
+def test_networkx_and_scipy_views():
+    graph = random_graph()
+    store = store_from_networkx(graph)
+    
+    assert nx.utils.graphs_equal(store.to_networkx(), graph)
+    directed = store.to_networkx(directed=True)
+    assert directed.is_directed() and directed.number_of_edges() == 2 * graph.number_of_edges()
+    selected = list(graph.nodes())[:20]
+    assert nx.utils.graphs_equal(store.to_networkx(nodes=selected), nx.Graph(graph.subgraph(selected)))
+    
+    matrix = store.to_scipy()
+    expected = nx.to_scipy_sparse_array(graph, nodelist=store.nodes(), weight='weight')
+    assert np.array_equal(matrix.toarray(), expected.toarray())
+    vector = np.arange(store.number_of_nodes(), dtype=float)
+    assert np.allclose(store.matvec(vector), expected @ vector)
+
+
+def test_components_match_networkx():
+    graph = random_graph(probability=0.03)
+    store = store_from_networkx(graph)
+    
+    expected = {frozenset(component) for component in nx.connected_components(graph)}
+    assert set(store.components()) == expected
+    assert store.number_connected_components() == len(expected)
+    labels = store.component_labels()
+    # Labels are numbered in order of each component's first node position
+    assert labels[0] == 0 and np.all(np.diff(np.maximum.accumulate(labels)) <= 1)
+
+
+def test_empty_store():
+    store = kg.GraphStore()
+    
+    assert store.number_of_nodes() == 0 and store.number_of_edges() == 0
+    assert store.edges() == [] and store.number_connected_components() == 0
+    assert store.density() == 0.0
+
+
+def test_derived_views_are_memoized_and_read_only():
+    store = store_from_networkx(random_graph())
+    
+    assert store.to_scipy() is store.to_scipy()
+    assert store.to_networkx() is store.to_networkx()
+    assert store.degrees() is store.degrees()
+    assert store.components() is store.components()
+    for array in (store.degrees(), store.weighted_degrees(), store.component_labels()):
+        assert not array.flags.writeable
+        with pytest.raises(ValueError):
+            array[0] = 0
+    with pytest.raises(nx.NetworkXError):
+        store.to_networkx().add_edge(-1, -2)
+    
+    # Restricted and directed views are fresh, mutable copies
+    selected = store.nodes()[:5]
+    assert store.to_networkx(nodes=selected) is not store.to_networkx(nodes=selected)
+    store.to_networkx(directed=True).add_edge(-1, -2)
+
+
+def test_mutation_invalidates_views():
+    graph = random_graph(probability=0.03)
+    store = store_from_networkx(graph)
+    views = (store.to_scipy(), store.to_networkx(), store.degrees(), store.components())
+    removed = [node for component in nx.connected_components(graph) for node in component][:10]
+    
+    store.remove_nodes(removed)
+    graph.remove_nodes_from(removed)
+    
+    assert all(view is not fresh for view, fresh in zip(
+        views, (store.to_scipy(), store.to_networkx(), store.degrees(), store.components())
+    ))
+    assert store.to_scipy().shape == (graph.number_of_nodes(), graph.number_of_nodes())
+    assert nx.utils.graphs_equal(store.to_networkx(), graph)
+    assert store.degrees().tolist() == [graph.degree(node) for node in store.nodes()]
+    assert set(store.components()) == {frozenset(component) for component in nx.connected_components(graph)}
+    
+    # Removing nothing keeps the cached views
+    scipy_view = store.to_scipy()
+    store.remove_nodes([-1])
+    assert store.to_scipy() is scipy_view
@@ -0,0 +1,120 @@
+"""Tests for incremental source updates against full rebuilds."""
+
+import random
+
+import pytest
+
+from conftest import edge_weights, kg, phrase_sources, quietly
+
+VOCABULARY = [f'term{i}' for i in range(900)] + ['neural networks', 'graph vertices', 'search engines']
+
+
+def word_sources(count, seed, words_per_source=12):
+    """Return sources with many count ties around the top-500 candidate cutoff."""
+    rng = random.Random(seed)
+    return [
+        {
+            'title': f'Doc {seed}-{i}',
+            'content': ' '.join(rng.sample(VOCABULARY, words_per_source)),
+            'url': f'https://example.com/{seed}/{i}',
+            'source_type': 'web'
+        }
+        for i in range(count)
+    ]
+
+
+def node_labels(result):
+    return [node['label'] for node in result['nodes']]
+
+
+@pytest.mark.parametrize('canonicalize', [False, True])
+@pytest.mark.parametrize('vectorized', [False, True])
+@pytest.mark.parametrize('window', ['document', 'tokens'])
+def test_add_and_remove_match_full_rebuild(build_graph, canonicalize, vectorized, window):
+    config = dict(
+        canonicalize_concepts=canonicalize,
+        vectorized_fallback=vectorized,
+        cooccurrence_window=window,
+        betweenness_exact_max_nodes=100
+    )
+    base = word_sources(30, 1)
+    extra = word_sources(10, 2)
+    builder, initial = build_graph(base, **config)
+    
+    added = quietly(builder.add_sources, extra)
+    _, full = build_graph(base + extra, **config)
+    assert added['metadata']['incremental_update']['applied']
+    assert sorted(node_labels(added)) == sorted(node_labels(full))
+    assert edge_weights(added) == edge_weights(full)
+    assert {type(weight) for weight in edge_weights(added).values()} == {int}
+    
+    removed = quietly(builder.remove_sources, extra)
+    assert sorted(node_labels(removed)) == sorted(node_labels(initial))
+    assert edge_weights(removed) == edge_weights(initial)
+    assert {type(weight) for weight in edge_weights(removed).values()} == {int}
+
+
+def test_vectorized_and_per_source_extraction_select_the_same_nodes(build_graph):
+    sources = word_sources(30, 4)
+    _, per_source = build_graph(sources, vectorized_fallback=False, betweenness_exact_max_nodes=100)
+    _, vectorized = build_graph(sources, vectorized_fallback=True, betweenness_exact_max_nodes=100)
+    assert node_labels(vectorized) == node_labels(per_source)
+
+
+def test_top_columns_break_ties_by_label():
+    membership = kg._vectorized_ngram_membership(['zeta alpha', 'alpha zeta beta'], set(), max_n=2)
+    labels = [membership.label(column) for column in membership.top_columns(10)]
+    assert labels == ['alpha', 'zeta', 'alpha zeta', 'beta', 'zeta alpha', 'zeta beta']
+
+
+def labelled_scores(builder, metric):
+    return {builder.nodes.labels[node_id]: score for node_id, score in builder.centrality_scores[metric].items()}
+
+
+def test_warm_started_update_matches_full_rebuild_scores(build_graph):
+    first = [f'alpha{i} beta{i % 4}' for i in range(20)]
+    second = [f'gamma{i} delta{i % 4}' for i in range(20)]
+    base = phrase_sources(20, 1, first) + phrase_sources(20, 2, second)
+    extra = phrase_sources(6, 3, first)
+    builder, initial = build_graph(base)
+    
+    quietly(builder.add_sources, extra)
+    full, _ = build_graph(base + extra)
+    
+    stats = builder.update_stats
+    assert stats['applied'] and stats['added_sources'] == 6 and stats['removed_sources'] == 0
+    assert stats['new_nodes'] == full.graph.number_of_nodes() - len(initial['nodes'])
+    assert stats['reused_nodes'] + stats['recomputed_nodes'] == builder.core_graph.number_of_nodes()
+    # The added sources only touch the first topic's components
+    assert stats['reused_nodes'] > 0 and stats['recomputed_nodes'] > 0
+    
+    for metric in ('pagerank', 'eigenvector'):
+        diagnostics = builder.centrality_diagnostics[metric]
+        assert diagnostics['warm_start'] and diagnostics['converged']
+    assert builder.centrality_diagnostics['pagerank']['iterations'] < full.centrality_diagnostics['pagerank']['iterations']
+    assert builder.centrality_diagnostics['betweenness']['recomputed_nodes'] == stats['recomputed_nodes']
+    
+    tolerances = {'pagerank': 1e-4, 'eigenvector': 1e-5, 'betweenness': 1e-12, 'closeness': 1e-9}
+    for metric, tolerance in tolerances.items():
+        assert labelled_scores(builder, metric) == pytest.approx(labelled_scores(full, metric), abs=tolerance)
+
+
+def test_unknown_sources_are_not_removed(build_graph):
+    sources = word_sources(10, 5)
+    builder, initial = build_graph(sources)
+    
+    result = quietly(builder.remove_sources, word_sources(1, 6))
+    assert result['metadata']['incremental_update']['removed_sources'] == 0
+    assert edge_weights(result) == edge_weights(initial)
+    assert len(builder.sources) == 10
+
+
+def test_streaming_counts_fall_back_to_a_rebuild(build_graph):
+    base = word_sources(20, 7)
+    extra = word_sources(5, 8)
+    builder, _ = build_graph(base, streaming_topk=True)
+    
+    added = quietly(builder.add_sources, extra)
+    _, full = build_graph(base + extra, streaming_topk=True)
+    assert added['metadata']['incremental_update'] == {'applied': False}
+    assert edge_weights(added) == edge_weights(full)
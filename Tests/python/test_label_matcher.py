@@ -0,0 +1,88 @@
+"""Tests for the Aho-Corasick label matcher used for co-occurrence scanning."""
+
+import random
+import re
+
+import pytest
+
+from conftest import kg
+
+
+@pytest.fixture(params=['pure_python', 'pyahocorasick'])
+def backend(request, monkeypatch):
+    """Run a test against the pure-Python automaton and, when installed, the C extension."""
+    if request.param == 'pyahocorasick':
+        pytest.importorskip('ahocorasick')
+    else:
+        monkeypatch.setattr(kg, 'AHOCORASICK_AVAILABLE', False)
+    return request.param
+
+
+def random_corpus(seed):
+    rng = random.Random(seed)
+    alphabet = 'abcde '
+    labels = [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))).strip() or 'a' for _ in range(80)]
+    labels += labels[:5]  # duplicate patterns map to several indices
+    texts = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 200))) for _ in range(30)]
+    return labels, texts
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_find_labels_matches_substring_scan(backend, seed):
+    labels, texts = random_corpus(seed)
+    matcher = kg.LabelMatcher(labels)
+    for text in texts:
+        assert matcher.find_labels(text) == {index for index, label in enumerate(labels) if label in text}
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_word_boundaries_match_regex_scan(backend, seed):
+    labels, texts = random_corpus(seed)
+    matcher = kg.LabelMatcher(labels, word_boundaries=True)
+    for text in texts:
+        expected = {
+            index for index, label in enumerate(labels)
+            if re.search(r'(?<!\w)' + re.escape(label) + r'(?!\w)', text)
+        }
+        assert matcher.find_labels(text) == expected
+
+
+def test_find_label_positions_reports_every_overlapping_occurrence(backend):
+    labels = ['neural network', 'network', 'work']
+    matcher = kg.LabelMatcher(labels)
+    text = 'a neural network and another network'
+    expected = sorted(
+        (match.start(), index)
+        for index, label in enumerate(labels)
+        for match in re.finditer(f'(?={re.escape(label)})', text)
+    )
+    assert sorted(matcher.find_label_positions(text)) == expected
+
+
+def test_empty_labels_are_always_present_but_have_no_position(backend):
+    matcher = kg.LabelMatcher(['', 'graph'])
+    assert matcher.find_labels('no match here') == {0}
+    assert matcher.find_label_positions('graph') == [(0, 1)]
+
+
+def test_cooccurrence_edges_match_substring_scan(build_graph):
+    sources = [
+        {'title': 'Graphs', 'content': 'sparse graph search with graph theory', 'source_type': 'web'},
+        {'title': 'Search', 'content': 'graph search engines and sparse graph theory', 'source_type': 'web'},
+        {'title': 'Theory', 'content': 'graph theory of search engines', 'source_type': 'web'}
+    ]
+    _, result = build_graph(sources, vectorized_fallback=False)
+    
+    labels = {node['id']: node['label'] for node in result['nodes']}
+    texts = [(source['content'] + ' ' + source['title']).lower() for source in sources]
+    expected = {}
+    for first in labels.values():
+        for second in labels.values():
+            count = sum(first in text and second in text for text in texts)
+            if first < second and count >= 2:
+                expected[frozenset((first, second))] = count
+    actual = {
+        frozenset((labels[edge['source_id']], labels[edge['target_id']])): edge['weight']
+        for edge in result['edges']
+    }
+    assert actual == expected
@@ -0,0 +1,105 @@
+"""Tests for the minimum spanning forest behind the minimal subgraph."""
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from conftest import kg, phrase_sources, quietly
+from test_graph_store import store_from_networkx
+
+
+def weighted_forest_of_blobs(seed, sizes=(30, 20, 12)):
+    """Return disjoint weighted random graphs plus one isolated node."""
+    rng = np.random.default_rng(seed)
+    graph = nx.disjoint_union_all([nx.connected_watts_strogatz_graph(size, 4, 0.3, seed=seed) for size in sizes])
+    graph.add_node(sum(sizes))
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = int(rng.integers(1, 20))
+    return graph
+
+
+def subgraph_builder(make_builder, graph, seed=0, **config):
+    """Return a builder whose minimal subgraph was found over graph with random scores."""
+    builder = make_builder(**config)
+    builder.graph = builder.core_graph = store_from_networkx(graph)
+    rng = np.random.default_rng(seed)
+    builder.centrality_scores = {
+        'pagerank': dict(zip(graph.nodes(), rng.random(graph.number_of_nodes()).tolist())),
+        'eigenvector': {}, 'betweenness': {}, 'closeness': {}
+    }
+    quietly(builder._find_minimal_subgraph)
+    return builder
+
+
+def reciprocal_cost_graph(graph):
+    costs = nx.Graph()
+    costs.add_nodes_from(graph.nodes())
+    costs.add_weighted_edges_from((u, v, 1.0 / (weight + 1e-6)) for u, v, weight in graph.edges(data='weight'))
+    return costs
+
+
+def intra_edges(subgraph):
+    return [(u, v, data['weight']) for u, v, data in subgraph.edges(data=True) if data['connection_type'] == 'intra_component']
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_spanning_forest_matches_networkx(make_builder, seed):
+    graph = weighted_forest_of_blobs(seed)
+    builder = subgraph_builder(make_builder, graph)
+    
+    forest = intra_edges(builder.minimal_subgraph)
+    reference = nx.minimum_spanning_tree(reciprocal_cost_graph(graph))
+    assert len(forest) == reference.number_of_edges() == graph.number_of_nodes() - nx.number_connected_components(graph)
+    assert sum(1.0 / (weight + 1e-6) for _, _, weight in forest) == pytest.approx(reference.size(weight='weight'))
+    # Tree edges carry the original co-occurrence weights and span every component
+    assert all(graph[u][v]['weight'] == weight for u, v, weight in forest)
+    spanned = nx.Graph([(u, v) for u, v, _ in forest])
+    spanned.add_nodes_from(graph.nodes())
+    assert {frozenset(c) for c in nx.connected_components(spanned)} == {frozenset(c) for c in nx.connected_components(graph)}
+
+
+def test_components_are_star_connected(make_builder):
+    graph = weighted_forest_of_blobs(0)
+    builder = subgraph_builder(make_builder, graph)
+    
+    connections = [(u, v) for u, v, data in builder.minimal_subgraph.edges(data=True) if data['connection_type'] == 'inter_component']
+    assert len(connections) == 2 * (nx.number_connected_components(graph) - 1)
+    # Every connection touches the hub, once in each direction per other component
+    (hub,) = set.intersection(*({u, v} for u, v in connections))
+    connectors = [v for u, v in connections if u == hub]
+    assert sorted(connectors) == sorted(u for u, v in connections if v == hub)
+    components = [nx.node_connected_component(graph, node) for node in connectors + [hub]]
+    assert len({frozenset(component) for component in components}) == nx.number_connected_components(graph)
+    assert builder.minimal_subgraph_components == 1
+    assert set(builder.minimal_subgraph.nodes()) == set(graph.nodes())
+
+
+def test_networkx_fallback_builds_the_same_forest(make_builder, monkeypatch):
+    graph = weighted_forest_of_blobs(1)
+    builder = subgraph_builder(make_builder, graph)
+    keep = np.ones(graph.number_of_nodes(), dtype=bool)
+    
+    csgraph_forest = builder._spanning_forest(keep)
+    monkeypatch.setattr(kg, 'SCIPY_AVAILABLE', False)
+    fallback_forest = builder._spanning_forest(keep)
+    
+    def cost(forest):
+        return sum(1.0 / (weight + 1e-6) for weight in forest[2])
+    assert len(fallback_forest[0]) == len(csgraph_forest[0])
+    assert cost(fallback_forest) == pytest.approx(cost(csgraph_forest))
+    # Restricting to a mask spans only the kept nodes
+    keep[:30] = False
+    tree_u, tree_v, _ = builder._spanning_forest(keep)
+    assert len(tree_u) == 20 + 12 - 2 and min(tree_u + tree_v) >= 30
+
+
+def test_built_graph_reports_the_spanning_forest(build_graph):
+    sources = phrase_sources(30, 4, [f'topic{i} area{i % 6}' for i in range(40)], per_source=5)
+    builder, result = build_graph(sources)
+    
+    assert result['metadata']['algorithms'][4] == 'hybrid_mst'
+    assert result['metadata']['minimal_connected_components'] == 1
+    core_edges = {frozenset((u, v)): weight for u, v, weight in builder.core_graph.edges()}
+    forest = intra_edges(builder.minimal_subgraph)
+    assert len(forest) == builder.core_graph.number_of_nodes() - builder.core_graph.number_connected_components()
+    assert all(core_edges[frozenset((u, v))] == weight for u, v, weight in forest)
@@ -0,0 +1,55 @@
+"""Tests for the interned, columnar node table."""
+
+from conftest import kg
+
+
+def node(label, node_type='concept', frequency=1, **extra):
+    return dict(label=label, type=node_type, frequency=frequency, importance=frequency / 10, **extra)
+
+
+def test_nodes_are_interned_by_type_and_label():
+    table = kg.NodeTable()
+    ids = table.add_nodes([node('graph'), node('Graph', 'entity'), node('graph', frequency=3)])
+    
+    assert ids.tolist() == [0, 1, 0]
+    assert len(table) == 2
+    assert table.lookup('graph', 'concept') == 0
+    assert table.lookup('Graph', 'entity') == 1
+    assert table.lookup('graph', 'entity') is None
+    # The later dictionary wins
+    assert table.frequency[0] == 3 and table.importance[0] == 0.3
+
+
+def test_attributes_are_columnar_and_grow_with_new_nodes():
+    table = kg.NodeTable()
+    table.add_nodes([node('graph', source_references=['A (web)'], aliases=['graphs'])])
+    table.add_nodes([node('search', 'entity', frequency=2)])
+    
+    assert table.labels == ['graph', 'search']
+    assert [table.node_type(node_id) for node_id in range(2)] == ['concept', 'entity']
+    assert table.frequency.tolist() == [1, 2]
+    assert table.topic_relevance.tolist() == [0.0, 0.0]
+    assert table.source_references == [['A (web)'], []]
+    assert table.aliases == [['graphs'], []]
+
+
+def test_string_ids_are_stable_and_typed():
+    table = kg.NodeTable()
+    table.add_nodes([node('graph'), node('graph', 'entity')])
+    other = kg.NodeTable()
+    other.add_nodes([node('unrelated'), node('graph')])
+    
+    assert table.string_id(0).startswith('concept_') and table.string_id(1).startswith('entity_')
+    assert table.string_id(0) == other.string_id(1)
+    assert len(table.string_id(0).split('_')[1]) == 16
+
+
+def test_graph_output_uses_string_ids_for_nodes_and_edges(build_graph):
+    sources = [{'title': f'Doc {i}', 'content': 'sparse graph search engine', 'source_type': 'web'} for i in range(3)]
+    builder, result = build_graph(sources, vectorized_fallback=False)
+    
+    ids = {item['id'] for item in result['nodes']}
+    assert len(ids) == len(result['nodes'])
+    assert all(edge['source_id'] in ids and edge['target_id'] in ids for edge in result['edges'])
+    graph_node = next(item for item in result['nodes'] if item['label'] == 'sparse graph')
+    assert graph_node['id'] == builder.nodes.string_id(builder.nodes.lookup('sparse graph', 'concept'))
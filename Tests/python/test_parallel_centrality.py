@@ -0,0 +1,67 @@
+"""Tests for process-pool centrality over the shared-memory CSR graph."""
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+from conftest import kg, phrase_sources, quietly
+
+PHRASES = [f'topic{i} area{i % 6}' for i in range(40)]
+
+
+def adjacency(seed=1):
+    graph = nx.gnp_random_graph(50, 0.1, seed=seed)
+    for index, (u, v) in enumerate(graph.edges()):
+        graph[u][v]['weight'] = 1 + index % 4
+    return csr_matrix(nx.to_scipy_sparse_array(graph, weight='weight', dtype=float))
+
+
+def test_shared_graph_round_trips_and_releases_blocks():
+    matrix = adjacency()
+    with kg.SharedCSRGraph(matrix) as shared:
+        attached, blocks = kg.SharedCSRGraph.attach(shared.descriptor)
+        assert (attached != matrix).nnz == 0
+        del attached
+        for block in blocks:
+            block.close()
+        descriptor = shared.descriptor
+    
+    with pytest.raises(FileNotFoundError):
+        kg.SharedCSRGraph.attach(descriptor)
+
+
+def test_tasks_match_the_single_process_functions():
+    matrix = adjacency()
+    sources = list(range(0, 50, 3))
+    with kg.SharedCSRGraph(matrix) as shared:
+        _, betweenness = kg._centrality_task(shared.descriptor, 'betweenness', sources)
+        _, closeness = kg._centrality_task(shared.descriptor, 'closeness', (np.array(sources), True))
+        _, (pagerank, _, eigenvector, _) = kg._centrality_task(shared.descriptor, 'spectral', None)
+        with pytest.raises(ValueError):
+            kg._centrality_task(shared.descriptor, 'degree', None)
+    
+    assert np.allclose(betweenness, kg._brandes_partial_betweenness(matrix, sources))
+    assert np.allclose(closeness, kg._closeness_partial_sums(matrix, np.array(sources), True))
+    assert np.allclose(pagerank, kg._sparse_pagerank(matrix)[0])
+    assert np.allclose(eigenvector, kg._sparse_eigenvector_centrality(matrix)[0])
+
+
+@pytest.mark.parametrize('config', [
+    {},
+    {'betweenness_exact_max_nodes': 10, 'betweenness_error': 0.3,
+     'closeness_exact_max_nodes': 10, 'closeness_error': 0.5},
+])
+def test_parallel_centrality_matches_single_process(make_builder, monkeypatch, config):
+    sources = phrase_sources(30, 9, PHRASES, per_source=5)
+    serial = make_builder(**config)
+    quietly(serial.build_graph_from_sources, sources)
+    parallel = make_builder(centrality_workers=2, **config)
+    # A failed pool would fall back to the single-process metrics
+    monkeypatch.setattr(parallel, '_calculate_betweenness_centrality', pytest.fail)
+    quietly(parallel.build_graph_from_sources, sources)
+    
+    assert parallel.centrality_diagnostics['betweenness'] == serial.centrality_diagnostics['betweenness']
+    assert parallel.centrality_diagnostics['closeness'] == serial.centrality_diagnostics['closeness']
+    for metric in ('pagerank', 'eigenvector', 'betweenness', 'closeness'):
+        assert parallel.centrality_scores[metric] == pytest.approx(serial.centrality_scores[metric], abs=1e-9)
@@ -0,0 +1,90 @@
+"""Tests for process-pool extraction and hash-seed independent candidate selection."""
+
+import json
+import os
+import subprocess
+import sys
+from collections import Counter
+
+import multiprocessing.spawn
+
+from conftest import edge_weights, kg, phrase_sources
+
+PHRASES = ['neural networks', 'graph theory', 'sparse matrices', 'search engines', 'token streams',
+           'deep learning', 'data analyses', 'vector spaces'] + [f'term{i}' for i in range(700)]
+
+GRAPH_SUMMARY_SCRIPT = """
+import contextlib, io, json, random, sys
+sys.path.insert(0, {glyph!r})
+with contextlib.redirect_stdout(io.StringIO()):
+    import knowledge_graph_generation as kg
+    rng = random.Random(3)
+    phrases = {phrases!r}
+    sources = [{{'title': f'T{{i}}', 'content': '. '.join(rng.sample(phrases, 6)), 'url': f'u{{i}}', 'source_type': 'web'}}
+               for i in range(60)]
+    builder = kg.KnowledgeGraphBuilder(cache_dir={cache!r}, build_config=kg.GraphBuildConfig(
+        enable_extraction_cache=False, vectorized_fallback=False, extraction_workers={workers}))
+    result = builder.build_graph_from_sources(sources)
+print(json.dumps([[node['label'], node['properties']['source_references']] for node in result['nodes']]))
+"""
+
+
+def graph_summary(tmp_path, hash_seed, workers):
+    script = GRAPH_SUMMARY_SCRIPT.format(
+        glyph=os.path.dirname(kg.__file__), phrases=PHRASES, cache=str(tmp_path / 'cache'), workers=workers
+    )
+    environment = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    output = subprocess.run(
+        [sys.executable, '-c', script], env=environment, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_node_selection_does_not_depend_on_the_hash_seed(tmp_path):
+    reference = graph_summary(tmp_path, 1, workers=1)
+    assert len(reference) == 500
+    assert graph_summary(tmp_path, 2, workers=1) == reference
+    assert graph_summary(tmp_path, 3, workers=2) == reference
+
+
+def test_parallel_extraction_matches_serial(build_graph):
+    sources = phrase_sources(40, 5, PHRASES, per_source=6)
+    _, serial = build_graph(sources, vectorized_fallback=False)
+    _, parallel = build_graph(sources, vectorized_fallback=False, extraction_workers=3)
+    assert [node['label'] for node in parallel['nodes']] == [node['label'] for node in serial['nodes']]
+    assert edge_weights(parallel) == edge_weights(serial)
+
+
+def test_embedded_interpreter_falls_back_to_serial(build_graph, monkeypatch):
+    sources = phrase_sources(20, 6, PHRASES, per_source=6)
+    _, serial = build_graph(sources, vectorized_fallback=False)
+    
+    monkeypatch.setattr(multiprocessing.spawn, 'get_executable', lambda: '/Applications/Glyph.app/Contents/MacOS/Glyph')
+    _, parallel = build_graph(sources, vectorized_fallback=False, extraction_workers=2, centrality_workers=2)
+    assert edge_weights(parallel) == edge_weights(serial)
+
+
+def test_most_common_breaks_ties_by_item():
+    counts = Counter({'zeta': 2, 'alpha': 2, 'beta': 3, 'gamma': 1})
+    assert kg._most_common(counts, 3) == [('beta', 3), ('alpha', 2), ('zeta', 2)]
+    
+    streaming = kg.SpaceSavingCounter(capacity=10)
+    for item in ['zeta', 'zeta', 'alpha', 'alpha', 'beta', 'beta', 'beta', 'gamma']:
+        streaming.add(item)
+    assert kg._most_common(streaming, 3) == [('beta', 3), ('alpha', 2), ('zeta', 2)]
+
+
+def test_size_balanced_chunks_cover_every_item_once_heaviest_first():
+    sizes = [100, 1, 1, 1, 20, 20, 2, 3, 30, 10]
+    chunks = kg._size_balanced_chunks(sizes, 3)
+    
+    assert sorted(index for chunk in chunks for index in chunk) == list(range(len(sizes)))
+    loads = [sum(sizes[index] for index in chunk) for chunk in chunks]
+    assert loads == sorted(loads, reverse=True)
+    assert max(loads) - min(loads) <= max(sizes)
+    assert [0] in chunks  # the largest document gets a chunk of its own
+
+
+def test_size_balanced_chunks_never_return_empty_chunks():
+    assert kg._size_balanced_chunks([5, 5], 8) == [[0], [1]]
+    assert kg._size_balanced_chunks([], 4) == []
@@ -0,0 +1,86 @@
+"""Tests for the local-push personalized PageRank topic scorer."""
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from conftest import kg, phrase_sources, quietly
+from test_graph_store import store_from_networkx
+
+
+def small_world(seed):
+    graph = nx.connected_watts_strogatz_graph(200, 6, 0.1, seed=seed)
+    rng = np.random.default_rng(seed)
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = int(rng.integers(1, 5))
+    return graph
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('tolerance', [1e-3, 1e-4, 1e-6])
+def test_push_error_is_bounded_by_tolerance_times_degree(seed, tolerance):
+    graph = small_world(seed)
+    seeds = {0: 1.0, 5: 0.5}
+    
+    estimate = store_from_networkx(graph).personalized_pagerank(seeds, alpha=0.15, tolerance=tolerance)
+    exact = nx.pagerank(graph, alpha=0.85, personalization=seeds, weight='weight', tol=1e-14, max_iter=10_000)
+    
+    for node, degree in graph.degree(weight='weight'):
+        error = exact[node] - estimate.get(node, 0.0)
+        assert -1e-12 <= error <= tolerance * degree
+
+
+def test_push_stays_local_with_a_coarse_tolerance():
+    graph = small_world(0)
+    store = store_from_networkx(graph)
+    
+    coarse = store.personalized_pagerank({0: 1.0}, tolerance=1e-3)
+    fine = store.personalized_pagerank({0: 1.0}, tolerance=1e-6)
+    assert len(coarse) < len(fine) == graph.number_of_nodes()
+    assert sum(fine.values()) == pytest.approx(1.0, abs=1e-2)
+
+
+def test_seeds_outside_the_graph_are_ignored():
+    graph = nx.Graph()
+    graph.add_weighted_edges_from([(1, 2, 1), (2, 3, 1)])
+    graph.add_node(4)
+    store = store_from_networkx(graph)
+    
+    assert store.personalized_pagerank({99: 1.0}) == {}
+    assert store.personalized_pagerank({1: 0.0}) == {}
+    # An isolated seed keeps the whole walk
+    assert store.personalized_pagerank({4: 2.0, 99: 1.0}) == {4: 1.0}
+
+
+def test_graph_relevance_scores_favour_the_topic_neighbourhood(make_builder, tmp_path):
+    first = [f'quantum topic{i} area{i % 4}' for i in range(15)]
+    second = [f'classical item{i} field{i % 4}' for i in range(15)]
+    sources = phrase_sources(20, 1, first) + phrase_sources(20, 2, second)
+    builder = quietly(
+        kg.KnowledgeGraphBuilder,
+        cache_dir=str(tmp_path / 'cache'),
+        topic_config=kg.TopicRelevanceConfig(relevance_scorer='graph'),
+        build_config=kg.GraphBuildConfig(enable_extraction_cache=False)
+    )
+    quietly(builder.build_graph_from_sources, sources)
+    
+    scores = quietly(builder._score_topic_relevance, 'quantum')
+    labels = {node_id: builder.nodes.labels[node_id] for node_id in builder.graph.nodes()}
+    assert set(scores) == set(labels)
+    assert all(0.0 <= score <= 1.0 for score in scores.values()) and max(scores.values()) == 1.0
+    
+    # Labels naming the topic are seeds; their co-occurring labels are reached by the walk
+    seeds = [score for node_id, score in scores.items() if 'quantum' in labels[node_id].split()]
+    neighbours = [score for node_id, score in scores.items() if labels[node_id].startswith('topic')]
+    off_topic = [score for node_id, score in scores.items() if 'classical' in labels[node_id]]
+    assert min(seeds) == 1.0
+    assert max(neighbours) > 0 and max(off_topic) == 0.0
+
+
+def test_auto_scorer_uses_the_graph_without_embeddings(make_builder, monkeypatch):
+    builder = make_builder()
+    monkeypatch.setattr(builder.topic_config, 'relevance_scorer', 'auto')
+    monkeypatch.setattr(builder, 'sentence_transformer', None)
+    monkeypatch.setattr(builder, '_calculate_graph_relevance_scores', lambda topic: {'graph': topic})
+    
+    assert quietly(builder._score_topic_relevance, 'quantum') == {'graph': 'quantum'}
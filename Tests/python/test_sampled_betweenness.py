@@ -0,0 +1,127 @@
+"""Tests for pivot-sampled betweenness centrality and its size-based switch."""
+
+import math
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+from conftest import kg, phrase_sources
+
+
+def weighted_graph(node_count=60, probability=0.08, seed=11):
+    graph = nx.gnp_random_graph(node_count, probability, seed=seed)
+    rng = np.random.default_rng(seed)
+    for u, v in graph.edges():
+        # Small integer weights produce many equal-length shortest paths
+        graph[u][v]['weight'] = int(rng.integers(1, 3))
+    return graph
+
+
+def adjacency(graph):
+    return csr_matrix(nx.to_scipy_sparse_array(graph, nodelist=list(graph.nodes()), weight='weight', dtype=float))
+
+
+def as_vector(scores, graph):
+    return np.array([scores[node] for node in graph.nodes()])
+
+
+def test_pivot_count_follows_the_hoeffding_bound():
+    expected = math.ceil(math.log(2 * 100_000 / 0.1) / (2 * 0.05 ** 2))
+    assert kg._betweenness_pivot_count(100_000, 0.05, 0.9) == expected
+    # Tighter targets need more pivots, and the count never exceeds the node count
+    assert kg._betweenness_pivot_count(100_000, 0.02, 0.9) > expected
+    assert kg._betweenness_pivot_count(100_000, 0.05, 0.99) > expected
+    assert kg._betweenness_pivot_count(500, 0.05, 0.9) == 500
+    assert kg._betweenness_pivot_count(1, 0.5, 1.0) == 1
+    # A loose error target still samples two pivots, so sources can be rescaled
+    assert kg._betweenness_pivot_count(100_000, 50.0, 0.5) == 2
+
+
+@pytest.mark.parametrize('settings', [
+    {'betweenness_error': 0.0}, {'betweenness_error': -0.1},
+    {'betweenness_confidence': 0.0}, {'betweenness_confidence': 1.0}
+])
+def test_config_rejects_invalid_error_targets(settings):
+    with pytest.raises(ValueError):
+        kg.GraphBuildConfig(**settings)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_all_sources_match_exact_networkx(seed):
+    graph = weighted_graph(seed=seed)
+    
+    totals = kg._brandes_partial_betweenness(adjacency(graph), list(range(graph.number_of_nodes())))
+    expected = as_vector(nx.betweenness_centrality(graph, weight='weight', normalized=True), graph)
+    
+    assert np.allclose(kg._rescale_betweenness(totals), expected)
+
+
+def test_partial_sums_add_up():
+    matrix = adjacency(weighted_graph())
+    sources = list(range(matrix.shape[0]))
+    
+    whole = kg._brandes_partial_betweenness(matrix, sources)
+    parts = sum(kg._brandes_partial_betweenness(matrix, chunk.tolist()) for chunk in np.array_split(sources, 5))
+    assert np.allclose(parts, whole)
+
+
+@pytest.mark.parametrize('pivots', [5, 20])
+def test_sampled_sources_match_networkx_seed(pivots):
+    graph = weighted_graph()
+    nodes = list(graph.nodes())
+    
+    # networkx draws pivots with random.Random(seed).sample over the node list
+    sources = random.Random(42).sample(nodes, pivots)
+    totals = kg._brandes_partial_betweenness(adjacency(graph), sources)
+    expected = nx.betweenness_centrality(graph, k=pivots, weight='weight', normalized=True, seed=42)
+    
+    assert np.allclose(kg._rescale_betweenness(totals, sources), as_vector(expected, graph))
+
+
+def test_single_pivot_rescales_to_finite_scores():
+    graph = weighted_graph()
+    source = random.Random(42).sample(list(graph.nodes()), 1)
+    
+    totals = kg._brandes_partial_betweenness(adjacency(graph), source)
+    scores = kg._rescale_betweenness(totals, source)
+    expected = nx.betweenness_centrality(graph, k=1, weight='weight', normalized=True, seed=42)
+    
+    assert np.isfinite(scores).all() and scores[source[0]] == 0.0
+    # networkx leaves the pivot itself at NaN; every other node agrees
+    others = [node for node in graph.nodes() if node != source[0]]
+    assert np.allclose(scores[others], [expected[node] for node in others])
+
+
+def test_loose_error_target_gives_finite_scores(build_graph):
+    sources = phrase_sources(30, 6, [f'topic{i} area{i % 6}' for i in range(40)], per_source=5)
+    builder, result = build_graph(sources, betweenness_exact_max_nodes=10, betweenness_error=50.0)
+    
+    assert builder.centrality_diagnostics['betweenness']['k'] == 2
+    assert all(math.isfinite(score) for score in builder.centrality_scores['betweenness'].values())
+    assert all(math.isfinite(float(node['properties']['betweenness'])) for node in result['nodes'])
+
+
+def test_builder_switches_to_sampling_above_threshold(build_graph):
+    sources = phrase_sources(30, 6, [f'topic{i} area{i % 6}' for i in range(40)], per_source=5)
+    exact, exact_result = build_graph(sources)
+    sampled, sampled_result = build_graph(sources, betweenness_exact_max_nodes=10, betweenness_error=0.3)
+    
+    node_count = sampled.core_graph.number_of_nodes()
+    pivots = kg._betweenness_pivot_count(node_count, 0.3, 0.9)
+    assert pivots < node_count
+    assert exact.centrality_diagnostics['betweenness'] == {'method': 'exact', 'k': node_count}
+    assert sampled.centrality_diagnostics['betweenness']['method'] == 'sampled'
+    assert sampled.centrality_diagnostics['betweenness']['k'] == pivots
+    assert f'betweenness (sampled, k={pivots})' in sampled_result['metadata']['algorithms']
+    assert 'betweenness (exact)' in exact_result['metadata']['algorithms']
+    
+    graph = exact.core_graph.to_networkx()
+    expected = nx.betweenness_centrality(graph, k=pivots, weight='weight', normalized=True, seed=42)
+    assert sampled.centrality_scores['betweenness'] == pytest.approx(expected)
+    # The estimate stays within the configured error of the exact scores
+    errors = [abs(sampled.centrality_scores['betweenness'][node] - score)
+              for node, score in exact.centrality_scores['betweenness'].items()]
+    assert max(errors) <= 0.3
@@ -0,0 +1,94 @@
+"""Tests for sampled closeness and harmonic centrality."""
+
+import math
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+from conftest import kg, phrase_sources
+
+
+def weighted_graph(node_count=70, probability=0.08, seed=5, connected=True):
+    graph = nx.gnp_random_graph(node_count, probability, seed=seed)
+    if connected:
+        graph = nx.convert_node_labels_to_integers(graph.subgraph(max(nx.connected_components(graph), key=len)))
+    rng = np.random.default_rng(seed)
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = float(rng.integers(1, 5))
+    return graph
+
+
+def adjacency(graph):
+    return csr_matrix(nx.to_scipy_sparse_array(graph, nodelist=list(graph.nodes()), weight='weight', dtype=float))
+
+
+def as_vector(scores, graph):
+    return np.array([scores[node] for node in graph.nodes()])
+
+
+def test_all_sources_match_networkx_closeness():
+    graph = weighted_graph()
+    assert nx.is_connected(graph)
+    
+    scores = kg._sampled_closeness(adjacency(graph), graph.number_of_nodes(), harmonic=False)
+    assert np.allclose(scores, as_vector(nx.closeness_centrality(graph, distance='weight'), graph))
+
+
+def test_all_sources_match_networkx_harmonic():
+    graph = weighted_graph(probability=0.03, connected=False)
+    assert not nx.is_connected(graph)
+    
+    scores = kg._sampled_closeness(adjacency(graph), graph.number_of_nodes(), harmonic=True)
+    assert np.allclose(scores, as_vector(nx.harmonic_centrality(graph, distance='weight'), graph))
+
+
+@pytest.mark.parametrize('harmonic', [False, True])
+def test_partial_sums_are_independent_of_blocking(harmonic):
+    matrix = adjacency(weighted_graph())
+    sources = np.arange(matrix.shape[0])
+    
+    whole = kg._closeness_partial_sums(matrix, sources, harmonic)
+    # A block budget of one row runs Dijkstra one source at a time
+    blocked = kg._closeness_partial_sums(matrix, sources, harmonic, max_block_bytes=1)
+    chunked = sum(kg._closeness_partial_sums(matrix, chunk, harmonic) for chunk in np.array_split(sources, 4))
+    assert np.allclose(blocked, whole) and np.allclose(chunked, whole)
+
+
+def test_sampled_estimates_track_exact_scores():
+    graph = weighted_graph(node_count=300, probability=0.03, seed=2)
+    matrix = adjacency(graph)
+    exact = kg._sampled_closeness(matrix, graph.number_of_nodes(), harmonic=False)
+    
+    estimates = kg._sampled_closeness(matrix, 60, harmonic=False)
+    assert np.max(np.abs(estimates - exact) / exact) < 0.2
+    assert np.corrcoef(estimates, exact)[0, 1] > 0.9
+
+
+def test_closeness_sources_are_a_seeded_sample():
+    sources = kg._closeness_sources(100, 10)
+    
+    assert len(set(sources.tolist())) == 10 and sources.max() < 100
+    assert np.array_equal(sources, kg._closeness_sources(100, 10))
+    assert kg._closeness_sources(5, 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_builder_samples_and_picks_the_measure(build_graph):
+    sources = phrase_sources(30, 8, [f'topic{i} area{i % 6}' for i in range(40)], per_source=5)
+    exact, exact_result = build_graph(sources)
+    sampled, sampled_result = build_graph(sources, closeness_exact_max_nodes=10, closeness_error=0.5)
+    
+    node_count = sampled.core_graph.number_of_nodes()
+    harmonic = sampled.core_graph.number_connected_components() != 1
+    measure = 'harmonic' if harmonic else 'closeness'
+    size = math.ceil(math.log(node_count) / 0.5 ** 2)
+    assert exact.centrality_diagnostics['closeness'] == {'method': 'exact', 'measure': measure, 'k': node_count}
+    assert sampled.centrality_diagnostics['closeness']['k'] == size < node_count
+    assert f'closeness (sampled, k={size})' in sampled_result['metadata']['algorithms']
+    
+    graph = exact.core_graph.to_networkx()
+    reference = nx.harmonic_centrality if harmonic else nx.closeness_centrality
+    assert exact.centrality_scores['closeness'] == pytest.approx(reference(graph, distance='weight'))
+    expected = kg._sampled_closeness(exact.core_graph.to_scipy(), size, harmonic)
+    assert list(sampled.centrality_scores['closeness'].values()) == pytest.approx(expected.tolist())
@@ -0,0 +1,59 @@
+"""Tests for bounded-memory Space-Saving top-k counting."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from conftest import edge_weights, kg, phrase_sources
+
+
+def zipf_stream(seed, length=5000, distinct=400):
+    rng = random.Random(seed)
+    weights = [1.0 / rank for rank in range(1, distinct + 1)]
+    return rng.choices([f'item{i}' for i in range(distinct)], weights=weights, k=length)
+
+
+@pytest.mark.parametrize('capacity', [20, 50, 200])
+def test_counts_stay_within_the_error_bound(capacity):
+    stream = zipf_stream(capacity)
+    exact = Counter(stream)
+    counter = kg.SpaceSavingCounter(capacity)
+    for item in stream:
+        counter.add(item)
+    
+    bound = counter.error_bound()
+    assert bound == len(stream) / capacity
+    assert counter.max_observed_error() <= bound
+    estimates = dict(counter.most_common(capacity))
+    assert len(estimates) <= capacity
+    for item, estimate in estimates.items():
+        assert exact[item] <= estimate <= exact[item] + bound
+    # Every item more frequent than the bound is monitored
+    assert {item for item, count in exact.items() if count > bound} <= set(estimates)
+
+
+def test_counts_are_exact_when_every_item_fits():
+    stream = zipf_stream(7, distinct=30)
+    counter = kg.SpaceSavingCounter(30)
+    for item in stream:
+        counter.add(item)
+    assert counter.most_common(30) == kg._most_common(Counter(stream), 30)
+    assert counter.max_observed_error() == 0
+
+
+def test_references_are_distinct_and_capped():
+    counter = kg.SpaceSavingCounter(10, max_references=2)
+    for title in ['a', 'a', 'b', 'c']:
+        counter.add('graph', {'title': title})
+    assert counter.references['graph'] == [{'title': 'a'}, {'title': 'b'}]
+
+
+def test_streaming_build_with_ample_capacity_matches_exact_counting(build_graph):
+    sources = phrase_sources(30, 2, [f'topic{i}' for i in range(60)], per_source=6)
+    _, exact = build_graph(sources, vectorized_fallback=False)
+    _, streaming = build_graph(sources, vectorized_fallback=False, streaming_topk=True, streaming_topk_error=0.0001)
+    
+    assert [node['label'] for node in streaming['nodes']] == [node['label'] for node in exact['nodes']]
+    assert edge_weights(streaming) == edge_weights(exact)
+    assert streaming['metadata']['heavy_hitters']['concept_max_observed_error'] == 0
@@ -0,0 +1,105 @@
+"""Tests for the sparse PageRank and eigenvector centrality engine."""
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+from conftest import kg, phrase_sources
+
+
+def weighted_graph(node_count=80, probability=0.06, seed=7, isolated=0):
+    graph = nx.gnp_random_graph(node_count, probability, seed=seed)
+    rng = np.random.default_rng(seed)
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = int(rng.integers(1, 6))
+    graph.add_nodes_from(range(node_count, node_count + isolated))
+    return graph
+
+
+def adjacency(graph):
+    return csr_matrix(nx.to_scipy_sparse_array(graph, nodelist=list(graph.nodes()), weight='weight', dtype=float))
+
+
+def as_vector(scores, graph):
+    return np.array([scores[node] for node in graph.nodes()])
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('isolated', [0, 3])
+def test_pagerank_matches_networkx(seed, isolated):
+    graph = weighted_graph(seed=seed, isolated=isolated)
+    
+    scores, diagnostics = kg._sparse_pagerank(adjacency(graph), tol=1e-10)
+    expected = as_vector(nx.pagerank(graph, weight='weight', tol=1e-10), graph)
+    
+    assert diagnostics['converged'] and diagnostics['method'] == 'power_iteration'
+    assert np.allclose(scores, expected, atol=1e-9)
+    assert scores.sum() == pytest.approx(1.0)
+
+
+def test_pagerank_warm_start_converges_faster():
+    graph = weighted_graph()
+    matrix = adjacency(graph)
+    
+    cold, cold_diagnostics = kg._sparse_pagerank(matrix, tol=1e-8)
+    warm, warm_diagnostics = kg._sparse_pagerank(matrix, tol=1e-8, initial=cold * 3)
+    
+    assert warm_diagnostics['iterations'] < cold_diagnostics['iterations']
+    assert np.allclose(warm, cold, atol=1e-7)
+
+
+def test_pagerank_reports_non_convergence():
+    scores, diagnostics = kg._sparse_pagerank(adjacency(weighted_graph()), max_iter=2, tol=1e-12)
+    
+    assert not diagnostics['converged'] and diagnostics['iterations'] == 2
+    assert len(scores) == 80
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_eigenvector_matches_networkx(seed):
+    graph = weighted_graph(probability=0.1, seed=seed)
+    graph = graph.subgraph(max(nx.connected_components(graph), key=len)).copy()
+    
+    scores, diagnostics = kg._sparse_eigenvector_centrality(adjacency(graph), tol=1e-10)
+    expected = as_vector(nx.eigenvector_centrality(graph, weight='weight', tol=1e-10), graph)
+    
+    assert diagnostics['converged'] and diagnostics['method'] == 'power_iteration'
+    assert np.allclose(scores, expected, atol=1e-7)
+    assert np.linalg.norm(scores) == pytest.approx(1.0)
+
+
+def test_eigenvector_falls_back_to_arpack():
+    graph = weighted_graph(probability=0.1)
+    graph = graph.subgraph(max(nx.connected_components(graph), key=len)).copy()
+    
+    scores, diagnostics = kg._sparse_eigenvector_centrality(adjacency(graph), max_iter=1, tol=1e-10)
+    expected = as_vector(nx.eigenvector_centrality_numpy(graph, weight='weight'), graph)
+    
+    assert diagnostics['method'] == 'arpack' and diagnostics['converged']
+    assert np.all(scores >= -1e-12)
+    assert np.allclose(scores, expected, atol=1e-6)
+
+
+def test_starting_vector_is_normalized_or_uniform():
+    assert kg._starting_vector(4, np.array([1.0, 1.0, 2.0, 4.0])).tolist() == [0.125, 0.125, 0.25, 0.5]
+    assert kg._starting_vector(2, None).tolist() == [0.5, 0.5]
+    # Wrong length or zero mass falls back to uniform
+    assert kg._starting_vector(2, np.array([1.0, 2.0, 3.0])).tolist() == [0.5, 0.5]
+    assert kg._starting_vector(2, np.zeros(2)).tolist() == [0.5, 0.5]
+
+
+def test_backends_agree_on_built_graph(build_graph):
+    sources = phrase_sources(30, 3, [f'topic{i} area{i % 6}' for i in range(40)], per_source=5)
+    sparse, result = build_graph(sources, centrality_backend='sparse')
+    dense, _ = build_graph(sources, centrality_backend='networkx')
+    
+    for metric in ('pagerank', 'eigenvector'):
+        nodes = sorted(dense.centrality_scores[metric])
+        assert sorted(sparse.centrality_scores[metric]) == nodes
+        assert np.allclose(
+            [sparse.centrality_scores[metric][node] for node in nodes],
+            [dense.centrality_scores[metric][node] for node in nodes],
+            atol=1e-5
+        )
+    assert result['metadata']['centrality_diagnostics']['pagerank']['converged']
@@ -0,0 +1,74 @@
+"""Tests for the size-targeted Steiner-tree minimal subgraph."""
+
+import networkx as nx
+import pytest
+from networkx.algorithms.approximation import steiner_tree
+
+from conftest import phrase_sources
+from test_minimal_subgraph import intra_edges, reciprocal_cost_graph, subgraph_builder, weighted_forest_of_blobs
+
+
+def top_terminals(builder, k):
+    scores = builder.centrality_scores['pagerank']
+    return sorted(scores, key=lambda node: -scores[node])[:k]
+
+
+def tree_cost(edges):
+    return sum(1.0 / (weight + 1e-6) for _, _, weight in edges)
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('k', [2, 5, 12])
+def test_steiner_tree_matches_networkx_mehlhorn(make_builder, seed, k):
+    # One connected blob, without the isolated node
+    graph = weighted_forest_of_blobs(seed, sizes=(150,)).subgraph(range(150)).copy()
+    builder = subgraph_builder(make_builder, graph, seed=seed, minimal_subgraph_mode='steiner', steiner_terminals=k)
+    terminals = top_terminals(builder, k)
+    
+    tree = intra_edges(builder.minimal_subgraph)
+    reference = steiner_tree(reciprocal_cost_graph(graph), terminals, weight='weight', method='mehlhorn')
+    assert tree_cost(tree) == pytest.approx(reference.size(weight='weight'))
+    
+    # A tree over the terminals whose leaves are all terminals
+    spanned = nx.Graph([(u, v) for u, v, _ in tree])
+    assert nx.is_tree(spanned) and set(terminals) <= set(spanned)
+    assert set(builder.minimal_subgraph.nodes()) == set(spanned)
+    assert all(node in terminals for node, degree in spanned.degree() if degree == 1)
+    assert all(graph[u][v]['weight'] == weight for u, v, weight in tree)
+
+
+def test_every_node_as_a_terminal_spans_the_component(make_builder):
+    graph = weighted_forest_of_blobs(2, sizes=(40,)).subgraph(range(40)).copy()
+    builder = subgraph_builder(make_builder, graph, minimal_subgraph_mode='steiner', steiner_terminals=1000)
+    
+    tree = intra_edges(builder.minimal_subgraph)
+    assert len(tree) == graph.number_of_nodes() - 1
+    # Mehlhorn's tree is within twice the optimum, which here is the spanning tree
+    minimum = nx.minimum_spanning_tree(reciprocal_cost_graph(graph)).size(weight='weight')
+    assert minimum <= tree_cost(tree) + 1e-9 <= 2 * minimum
+
+
+def test_terminals_in_other_components_are_star_connected(make_builder):
+    graph = weighted_forest_of_blobs(0)
+    builder = subgraph_builder(make_builder, graph, minimal_subgraph_mode='steiner', steiner_terminals=20)
+    terminals = top_terminals(builder, 20)
+    
+    components = {frozenset(nx.node_connected_component(graph, node)) for node in terminals}
+    assert set(terminals) <= set(builder.minimal_subgraph.nodes())
+    connections = [(u, v) for u, v, data in builder.minimal_subgraph.edges(data=True) if data['connection_type'] == 'inter_component']
+    assert len(connections) == 2 * (len(components) - 1)
+    assert builder.minimal_subgraph_components == 1
+    # Each component is joined through its highest-scoring terminal
+    connectors = {node for connection in connections for node in connection}
+    assert connectors == {next(node for node in terminals if node in component) for component in components}
+
+
+def test_built_graph_reports_the_steiner_tree(build_graph):
+    sources = phrase_sources(30, 4, [f'topic{i} area{i % 6}' for i in range(40)], per_source=5)
+    builder, result = build_graph(sources, minimal_subgraph_mode='steiner', steiner_terminals=8)
+    _, spanning = build_graph(sources)
+    
+    assert result['metadata']['algorithms'][4] == 'steiner_tree (k=8)'
+    assert 8 <= builder.minimal_subgraph.number_of_nodes() < builder.core_graph.number_of_nodes()
+    assert len(result['minimal_subgraph']['nodes']) == builder.minimal_subgraph.number_of_nodes()
+    assert len(result['minimal_subgraph']['edges']) < len(spanning['minimal_subgraph']['edges'])
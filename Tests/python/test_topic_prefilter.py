@@ -0,0 +1,91 @@
+"""Tests for topic-relevance filtering ahead of graph construction."""
+
+import pytest
+
+from conftest import kg, phrase_sources, quietly
+
+PHRASES = [f'quantum topic{i} area{i % 5}' for i in range(30)] + [f'classical item{i}' for i in range(20)]
+
+
+@pytest.fixture
+def topic_builder(tmp_path, monkeypatch):
+    """Return a factory for builders that score relevance by the keyword fallback."""
+    def make(**topic_config) -> 'kg.KnowledgeGraphBuilder':
+        builder = quietly(
+            kg.KnowledgeGraphBuilder,
+            cache_dir=str(tmp_path / 'cache'),
+            topic_config=kg.TopicRelevanceConfig(**topic_config),
+            build_config=kg.GraphBuildConfig(enable_extraction_cache=False)
+        )
+        # Sentence transformers are optional; the keyword scorer makes the scores deterministic
+        monkeypatch.setattr(builder, '_calculate_topic_relevance_scores', builder._calculate_context_relevance_scores)
+        return builder
+    return make
+
+
+def labelled_edges(result):
+    labels = {node['id']: node['label'] for node in result['nodes']}
+    return {frozenset((labels[edge['source_id']], labels[edge['target_id']])): edge['weight'] for edge in result['edges']}
+
+
+def test_candidates_are_filtered_before_construction(topic_builder, monkeypatch):
+    builder = topic_builder(relevance_threshold=0.5, filter_before_graph_construction=True)
+    built = []
+    build_structure = builder._build_graph_structure
+    monkeypatch.setattr(
+        builder, '_build_graph_structure',
+        lambda concepts, entities, sources: built.append(concepts + entities) or build_structure(concepts, entities, sources)
+    )
+    monkeypatch.setattr(builder, '_filter_nodes_by_topic_relevance', pytest.fail)
+    
+    result = quietly(builder.build_graph_from_sources, phrase_sources(30, 4, PHRASES, per_source=5), 'quantum')
+    
+    assert result['success'], result.get('error')
+    candidates = {node['label'] for node in built[0]}
+    assert candidates and all('quantum' in label.split() for label in candidates)
+    assert {node['label'] for node in result['nodes']} <= candidates
+    for node_id in builder.graph.nodes():
+        assert builder.nodes.topic_relevance[node_id] >= 0.5
+
+
+def test_prefiltered_graph_keeps_the_unfiltered_edge_weights(topic_builder, build_graph):
+    sources = phrase_sources(30, 4, PHRASES, per_source=5)
+    builder = topic_builder(relevance_threshold=0.5, filter_before_graph_construction=True)
+    
+    filtered = labelled_edges(quietly(builder.build_graph_from_sources, sources, 'quantum'))
+    _, unfiltered = build_graph(sources)
+    kept = {label for pair in filtered for label in pair}
+    
+    assert filtered
+    assert filtered == {pair: weight for pair, weight in labelled_edges(unfiltered).items() if pair <= kept}
+
+
+def test_prefilter_keeps_the_minimum_share_of_candidates(topic_builder):
+    builder = topic_builder(relevance_threshold=0.99, filter_before_graph_construction=True)
+    concepts = [dict(label=f'label{i}', type='concept', frequency=i, importance=0.1) for i in range(12)]
+    
+    kept, entities = quietly(builder._prefilter_candidates_by_topic, 'quantum', concepts, [])
+    
+    # Nothing reaches the threshold, so the ten highest-scoring candidates survive
+    assert [node['label'] for node in kept] == [f'label{i}' for i in range(2, 12)]
+    assert entities == []
+
+
+def test_split_by_relevance_applies_the_threshold(topic_builder):
+    builder = topic_builder(relevance_threshold=0.5)
+    scores = {node_id: node_id / 100 for node_id in range(100)}
+    
+    kept, removed = quietly(builder._split_by_relevance, scores, 100)
+    assert kept == list(range(50, 100)) and removed == list(range(50))
+    
+    # Only 50 of 600 pass, below the 10% minimum, so the top 60 are kept
+    kept, removed = quietly(builder._split_by_relevance, scores, 600)
+    assert kept == list(range(99, 39, -1)) and removed == list(range(39, -1, -1))
+
+
+def test_prefilter_is_off_without_a_topic(topic_builder, monkeypatch):
+    builder = topic_builder(filter_before_graph_construction=True)
+    monkeypatch.setattr(builder, '_prefilter_candidates_by_topic', pytest.fail)
+    
+    result = quietly(builder.build_graph_from_sources, phrase_sources(10, 5, PHRASES))
+    assert result['success'], result.get('error')
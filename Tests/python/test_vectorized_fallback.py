@@ -0,0 +1,60 @@
+"""Tests for corpus-level vectorized n-gram extraction in the non-NLTK fallback."""
+
+import random
+import re
+from collections import Counter
+
+from conftest import kg
+
+STOPWORDS = {'the', 'and', 'with', 'for'}
+
+
+def random_texts(seed, count=25):
+    rng = random.Random(seed)
+    words = ['graph', 'search', 'engine', 'the', 'and', 'vector', 'space', 'model', 'of', 'data', 'sparse',
+             'matrix', 'with', 'token', 'stream', 'Graph', 'engines', 'x1']
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(0, 30))) + rng.choice(['', '.', ', ok!']) for _ in range(count)]
+
+
+def per_source_phrases(text):
+    cleaned = re.sub(r'[^\w\s]', ' ', text.lower())
+    return set(kg._simple_concept_extraction(cleaned, STOPWORDS))
+
+
+def test_membership_matches_per_source_extraction():
+    texts = random_texts(0)
+    membership = kg._vectorized_ngram_membership(texts, STOPWORDS)
+    
+    assert [set(row) for row in membership.row_labels()] == [per_source_phrases(text) for text in texts]
+    expected = Counter(phrase for text in texts for phrase in per_source_phrases(text))
+    actual = {membership.label(column): int(count) for column, count in enumerate(membership.document_frequency)}
+    assert actual == dict(expected)
+
+
+def test_top_columns_rank_like_the_per_source_counter():
+    texts = random_texts(1)
+    membership = kg._vectorized_ngram_membership(texts, STOPWORDS)
+    counts = Counter(phrase for text in texts for phrase in per_source_phrases(text))
+    
+    top = [(membership.label(column), int(membership.document_frequency[column])) for column in membership.top_columns(15)]
+    assert top == kg._most_common(counts, 15)
+
+
+def test_canonicalized_membership_merges_plural_heads():
+    texts = ['sparse matrices and graphs', 'sparse matrix', 'graph search engines']
+    membership = kg._vectorized_ngram_membership(texts, STOPWORDS)
+    canonical, merged_into = membership.canonicalized(kg.ConceptCanonicalizer())
+    
+    rows = [set(row) for row in canonical.row_labels()]
+    assert 'sparse matrix' in rows[0] and 'sparse matrix' in rows[1]
+    assert 'graph' in rows[0] and 'graph search engine' in rows[2]
+    labels = [canonical.label(column) for column in range(canonical.matrix.shape[1])]
+    assert labels.count('sparse matrix') == 1
+    assert len(merged_into) == membership.matrix.shape[1]
+
+
+def test_empty_corpus_has_no_columns():
+    membership = kg._vectorized_ngram_membership(['', 'the and'], STOPWORDS)
+    assert membership.matrix.shape == (2, 0)
+    assert membership.row_labels() == [[], []]
+    assert len(membership.top_columns(5)) == 0